@@ -1,3 +1 @@
 """Actions package meant to store buisness/application logic related code"""
-
-from .datawork_import import datawork_import
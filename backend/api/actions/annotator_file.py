@@ -0,0 +1,231 @@
+"""Annotator file payload, assembled with a fixed number of queries"""
+from typing import Iterable, Optional
+
+from django.db.models import QuerySet, Q, F, Count, Exists, OuterRef, Subquery
+from django.shortcuts import get_object_or_404
+
+from backend.api.models import (
+    AnnotationCampaign,
+    AnnotationCampaignFile,
+    AnnotationComment,
+    AnnotationFileRange,
+    AnnotationResult,
+    AnnotationTask,
+    DatasetFile,
+    SpectrogramConfiguration,
+    SpectrogramTileGap,
+    SpectrogramTileManifest,
+)
+from backend.api.serializers import (
+    AnnotationCommentSerializer,
+    AnnotationResultSerializer,
+    DatasetFileSerializer,
+    SpectrogramConfigurationSerializer,
+)
+
+
+def _merge_bounds(bounds: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge overlapping or adjacent inclusive bounds"""
+    merged: list[tuple[int, int]] = []
+    for first, last in sorted(bounds):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+class AnnotatorFilePayload:
+    """Data needed by an annotator to annotate a file of a campaign"""
+
+    def __init__(self, campaign_id: int, file_id: int, user):
+        self.campaign: AnnotationCampaign = get_object_or_404(
+            AnnotationCampaign, pk=campaign_id
+        )
+        self.file: DatasetFile = get_object_or_404(
+            DatasetFile.objects.select_related(
+                "dataset", "dataset__audio_metadatum"
+            ).annotate(
+                is_submitted=Exists(
+                    AnnotationTask.objects.filter(
+                        annotation_campaign_id=campaign_id,
+                        dataset_file_id=OuterRef("pk"),
+                        annotator_id=user.id,
+                        status=AnnotationTask.Status.FINISHED,
+                    )
+                ),
+                campaign_index=Subquery(
+                    AnnotationCampaignFile.objects.filter(
+                        annotation_campaign_id=campaign_id,
+                        dataset_file_id=OuterRef("pk"),
+                    ).values("index")[:1]
+                ),
+            ),
+            pk=file_id,
+        )
+        self.user = user
+        self.file_ranges: QuerySet[
+            AnnotationFileRange
+        ] = AnnotationFileRange.objects.filter(
+            annotation_campaign_id=campaign_id,
+            annotator_id=user.id,
+        )
+        self.bounds: list[tuple[int, int]] = [
+            (file_range.first_file_id, file_range.last_file_id)
+            for file_range in self.file_ranges
+        ]
+        self.index_bounds: list[tuple[int, int]] = _merge_bounds(
+            (file_range.first_file_index, file_range.last_file_index)
+            for file_range in self.file_ranges
+        )
+
+    @property
+    def is_assigned(self) -> bool:
+        """Check the file is in one of the annotator ranges of an active campaign"""
+        return self.campaign.archive is None and any(
+            first <= self.file.id <= last for first, last in self.bounds
+        )
+
+    def get_results(self) -> list[dict]:
+        """User and detectors results on the file"""
+        results = (
+            AnnotationResult.objects.select_related(
+                "label",
+                "confidence_indicator",
+                "detector_configuration",
+                "detector_configuration__detector",
+                "acoustic_features",
+            )
+            .prefetch_related("comments", "validations")
+            .filter(
+                annotation_campaign_id=self.campaign.id,
+                dataset_file_id=self.file.id,
+            )
+            .filter(Q(annotator_id=self.user.id) | Q(annotator__isnull=True))
+        )
+        return AnnotationResultSerializer(results, many=True).data
+
+    def get_task_comments(self) -> list[dict]:
+        """User comments on the file itself"""
+        comments = AnnotationComment.objects.filter(
+            annotation_campaign_id=self.campaign.id,
+            dataset_file_id=self.file.id,
+            annotation_result__isnull=True,
+            author_id=self.user.id,
+        )
+        return AnnotationCommentSerializer(comments, many=True).data
+
+    def get_spectrogram_configurations(self) -> list[dict]:
+        """Spectrogram configurations of the campaign, with the tiles manifest of the file"""
+        configurations = (
+            SpectrogramConfiguration.objects.filter(
+                annotation_campaigns__id=self.campaign.id
+            )
+            .select_related(
+                "dataset",
+                "window_type",
+                "linear_frequency_scale",
+                "multi_linear_frequency_scale",
+            )
+            .prefetch_related("multi_linear_frequency_scale__inner_scales")
+            .annotate(
+                tile_manifest_id=F("tile_manifest__id"),
+                # Only the missing tiles of the file are fetched
+                file_missing_ranges=Subquery(
+                    SpectrogramTileGap.objects.filter(
+                        manifest__spectrogram_configuration_id=OuterRef("id"),
+                        dataset_file_id=self.file.id,
+                    ).values("missing_ranges")[:1]
+                ),
+            )
+        )
+        data = SpectrogramConfigurationSerializer(configurations, many=True).data
+        for configuration, configuration_data in zip(configurations, data):
+            configuration_data["tile_manifest"] = (
+                {
+                    "missing_tiles": SpectrogramTileManifest.get_file_missing_tiles(
+                        configuration,
+                        self.file.filename,
+                        configuration.file_missing_ranges,
+                    ),
+                }
+                if configuration.tile_manifest_id is not None
+                else None
+            )
+        return data
+
+    def get_navigation(self, filtered_files: QuerySet[DatasetFile]) -> dict:
+        """Position of the file among the annotator files, and its neighbours in the filtered ones"""
+        index: Optional[int] = self.file.campaign_index
+        if index is None:
+            index = AnnotationCampaignFile.get_index(self.campaign.id, self.file.id)
+        if index is None:
+            # The file doesn't belong to the campaign datasets
+            return {}
+
+        # Ranges are made of consecutive positions in the campaign files
+        total_tasks = sum(last - first + 1 for first, last in self.index_bounds)
+        current_task_index = sum(
+            min(last, index - 1) - first + 1
+            for first, last in self.index_bounds
+            if first < index
+        )
+
+        before_filter = Q(start__lt=self.file.start) | Q(
+            start=self.file.start, id__lt=self.file.id
+        )
+        counts = filtered_files.aggregate(
+            total_tasks_in_filter=Count("id", distinct=True),
+            current_task_index_in_filter=Count(
+                "id", distinct=True, filter=before_filter
+            ),
+        )
+
+        # Only ids are needed, the filter related data is not fetched
+        positions = (
+            filtered_files.select_related(None)
+            .prefetch_related(None)
+            .filter(campaign_positions__annotation_campaign_id=self.campaign.id)
+        )
+        previous_file_id: Optional[int] = (
+            positions.filter(campaign_positions__index__lt=index)
+            .order_by("-campaign_positions__index")
+            .values_list("id", flat=True)
+            .first()
+        )
+        next_file_id: Optional[int] = (
+            positions.filter(campaign_positions__index__gt=index)
+            .order_by("campaign_positions__index")
+            .values_list("id", flat=True)
+            .first()
+        )
+        return {
+            **counts,
+            "total_tasks": total_tasks,
+            "current_task_index": current_task_index,
+            "previous_file_id": previous_file_id,
+            "next_file_id": next_file_id,
+        }
+
+    def get_data(self, filtered_files: QuerySet[DatasetFile]) -> dict:
+        """Get all data for annotator"""
+        is_assigned = self.is_assigned
+        data = {
+            "current_task_index_in_filter": 0,
+            "total_tasks_in_filter": 0,
+            "current_task_index": 0,
+            "total_tasks": 0,
+            "is_submitted": self.file.is_submitted,
+            "file": DatasetFileSerializer(self.file).data,
+            "results": [],
+            "task_comments": [],
+            "spectrogram_configurations": self.get_spectrogram_configurations(),
+            "previous_file_id": None,
+            "next_file_id": None,
+            "is_assigned": is_assigned,
+        }
+        if is_assigned:
+            data.update(self.get_navigation(filtered_files))
+            data["results"] = self.get_results()
+            data["task_comments"] = self.get_task_comments()
+        return data
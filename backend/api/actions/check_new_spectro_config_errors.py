@@ -1,110 +1,167 @@
 """Check for new spectro configs on all datasets present in CSV"""
-# pylint: disable=duplicate-code
-import csv
-import os
 import re
+from collections import defaultdict
+from typing import Optional
 
-from django.conf import settings
+from django.db import transaction
 
+from backend.api.actions.datawork_catalogue import (
+    get_datasets_catalogue,
+    get_spectro_config_folder,
+    get_spectro_fingerprint,
+    get_spectro_metadata,
+)
 from backend.api.models import (
     Dataset,
     SpectrogramConfiguration,
     WindowType,
 )
 
+SPECTRO_CONFIG_FIELDS = [
+    "nfft",
+    "window_size",
+    "overlap",
+    "zoom_level",
+    "spectro_normalization",
+    "data_normalization",
+    "hp_filter_min_freq",
+    "colormap",
+    "dynamic_min",
+    "dynamic_max",
+    "window_type",
+    "frequency_resolution",
+    "temporal_resolution",
+    "spectro_duration",
+    "audio_file_dataset_overlap",
+]
 
-def check_new_spectro_config_errors():
-    """Check for new spectro configs on all datasets present in CSV"""
-    # pylint: disable=too-many-locals
-    try:
-        check_error = []
-        csv_dataset_names = []
-        # Check for new datasets
-        with open(
-            settings.DATASET_IMPORT_FOLDER / settings.DATASET_FILE, encoding="utf-8"
-        ) as csvfile:
-            new_dataset: dict
-            for new_dataset in csv.DictReader(csvfile):
-                new_dataset[
-                    "name"
-                ] = f"{new_dataset['dataset']} ({new_dataset['spectro_duration']}_{new_dataset['dataset_sr']})"
-                dname = new_dataset["name"]
-                csv_dataset_names.append(dname)
 
-        # Check for new spectro configs on all datasets present in CSV
-        datasets_to_check: list[Dataset] = Dataset.objects.filter(
-            name__in=csv_dataset_names
+def _get_spectro_name(spectro: dict) -> str:
+    name = f"{spectro['nfft']}_{spectro['window_size']}_{spectro['overlap']}"
+    if (
+        "custom_frequency_scale" in spectro
+        and spectro["custom_frequency_scale"]
+        and spectro["custom_frequency_scale"] != "linear"
+    ):
+        name = f"{name}_{spectro['custom_frequency_scale']}"
+    return name
+
+
+def _get_changed_datasets(
+    force: bool,
+) -> tuple[list[tuple[Dataset, list[dict]]], list[FileNotFoundError]]:
+    """Datasets present in CSV which spectrogram folders changed since their last sync,
+    with their metadata.csv rows"""
+    csv_dataset_names = [
+        f"{dataset['dataset']} ({dataset['spectro_duration']}_{dataset['dataset_sr']})"
+        for dataset in get_datasets_catalogue()
+    ]
+    changed_datasets = []
+    errors = []
+    for dataset in Dataset.objects.filter(name__in=csv_dataset_names):
+        conf_folder_path = get_spectro_config_folder(
+            dataset.dataset_path, dataset.dataset_conf or ""
         )
+        try:
+            fingerprint = get_spectro_fingerprint(conf_folder_path)
+            if not force and fingerprint == dataset.spectro_configs_fingerprint:
+                continue
+            spectros = get_spectro_metadata(conf_folder_path)
+        except FileNotFoundError as error:
+            # Other datasets are still synced
+            errors.append(error)
+            continue
+        dataset.spectro_configs_fingerprint = fingerprint
+        changed_datasets.append((dataset, spectros))
+    return changed_datasets, errors
 
-        for dataset in datasets_to_check:
-            dataset_spectros = []
-            dataset_folder = dataset.dataset_path.split("datawork/dataset/")[1]
-            conf_folder = dataset.dataset_conf or ""
-            conf_folder_path = (
-                settings.DATASET_IMPORT_FOLDER
-                / dataset_folder
-                / settings.DATASET_SPECTRO_FOLDER
-                / conf_folder
-            )
 
-            # Search all sub folder, each sub folder have one metadata.csv
-            for one_spectro_folder in os.scandir(conf_folder_path):
-                if one_spectro_folder.is_dir():
-                    spectro_csv_path = f"{one_spectro_folder.path}/metadata.csv"
-                    with open(spectro_csv_path, encoding="utf-8") as csvfile:
-                        spectro: dict
-                        for spectro in csv.DictReader(csvfile):
-                            name = f"{spectro['nfft']}_{spectro['window_size']}_{spectro['overlap']}"
-                            if (
-                                "custom_frequency_scale" in spectro
-                                and spectro["custom_frequency_scale"]
-                                and spectro["custom_frequency_scale"] != "linear"
-                            ):
-                                name = f"{name}_{spectro['custom_frequency_scale']}"
+def sync_spectro_configs(
+    force: bool = False,
+) -> tuple[list[Dataset], list[FileNotFoundError]]:
+    """Create or update the spectro configs of the datasets present in CSV from their metadata.csv.
+    Only datasets which spectrogram folders changed since their last sync are processed, unless forced.
+    Returns the synced datasets and the errors of the datasets which folders can't be read"""
+    changed_datasets, errors = _get_changed_datasets(force)
+    if not changed_datasets:
+        return [], errors
 
-                            window_type = WindowType.objects.filter(
-                                name=spectro["window_type"]
-                            ).first()
-                            spectro["window_type"] = window_type
+    window_types = {
+        window_type.name: window_type
+        for window_type in WindowType.objects.filter(
+            name__in={
+                spectro.get("window_type")
+                for _, spectros in changed_datasets
+                for spectro in spectros
+            }
+        )
+    }
+    existing_configurations: dict[
+        tuple[int, str], list[SpectrogramConfiguration]
+    ] = defaultdict(list)
+    for configuration in SpectrogramConfiguration.objects.filter(
+        dataset__in=[dataset for dataset, _ in changed_datasets]
+    ):
+        existing_configurations[(configuration.dataset_id, configuration.name)].append(
+            configuration
+        )
 
-                            spectro_needed = {
-                                key: value
-                                for (key, value) in spectro.items()
-                                if key
-                                in [
-                                    "nfft",
-                                    "window_size",
-                                    "overlap",
-                                    "zoom_level",
-                                    "spectro_normalization",
-                                    "data_normalization",
-                                    "hp_filter_min_freq",
-                                    "colormap",
-                                    "dynamic_min",
-                                    "dynamic_max",
-                                    "window_type",
-                                    "frequency_resolution",
-                                    "temporal_resolution",
-                                    "spectro_duration",
-                                    "audio_file_dataset_overlap",
-                                ]
-                            }
-                            dataset_spectros.append(
-                                SpectrogramConfiguration.objects.update_or_create(
-                                    name=name, defaults=spectro_needed, dataset=dataset
-                                )[0]
-                            )
+    updated_configurations: list[SpectrogramConfiguration] = []
+    created_configurations: list[SpectrogramConfiguration] = []
+    for dataset, spectros in changed_datasets:
+        for spectro in spectros:
+            name = _get_spectro_name(spectro)
+            values = {
+                key: value
+                for (key, value) in spectro.items()
+                if key in SPECTRO_CONFIG_FIELDS
+            }
+            values["window_type"] = window_types.get(spectro["window_type"])
+            configurations = existing_configurations.get((dataset.id, name))
+            if configurations is None:
+                configuration = SpectrogramConfiguration(
+                    name=name, dataset=dataset, **values
+                )
+                created_configurations.append(configuration)
+                existing_configurations[(dataset.id, name)] = [configuration]
+                continue
+            for configuration in configurations:
+                for key, value in values.items():
+                    setattr(configuration, key, value)
+                if configuration.id is not None:
+                    updated_configurations.append(configuration)
 
-    except FileNotFoundError as error:
-        regex = "dataset/(.*)/processed"
-        buggy_dataset = re.findall(regex, str(error))
-        buggy_dataset = buggy_dataset[0] if buggy_dataset else "FAILED NAME DETECTION"
-        check_error = {
-            "error_lines": [
-                "Successful import. Reload (F5) this page to see it.",
-                f"But an another dataset config spectro ({buggy_dataset}) can't be updated :",
-                f"{error}",
-            ]
-        }
+    with transaction.atomic():
+        SpectrogramConfiguration.objects.bulk_update(
+            updated_configurations, SPECTRO_CONFIG_FIELDS
+        )
+        SpectrogramConfiguration.objects.bulk_create(created_configurations)
+        Dataset.objects.bulk_update(
+            [dataset for dataset, _ in changed_datasets],
+            ["spectro_configs_fingerprint"],
+        )
+    return [dataset for dataset, _ in changed_datasets], errors
+
+
+def check_new_spectro_config_errors():
+    """Check for new spectro configs on all datasets present in CSV"""
+    error: Optional[FileNotFoundError] = None
+    try:
+        _, errors = sync_spectro_configs()
+        if errors:
+            error = errors[0]
+    except FileNotFoundError as csv_error:
+        error = csv_error
+    if error is None:
+        return []
 
-    return check_error
+    regex = "dataset/(.*)/processed"
+    buggy_dataset = re.findall(regex, str(error))
+    buggy_dataset = buggy_dataset[0] if buggy_dataset else "FAILED NAME DETECTION"
+    return {
+        "error_lines": [
+            "Successful import. Reload (F5) this page to see it.",
+            f"But an another dataset config spectro ({buggy_dataset}) can't be updated :",
+            f"{error}",
+        ]
+    }
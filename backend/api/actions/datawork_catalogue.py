@@ -0,0 +1,88 @@
+"""Cached reader of the datawork catalogue: datasets.csv and the spectrograms metadata"""
+import csv
+import hashlib
+import os
+from pathlib import Path
+from threading import Lock
+
+from django.conf import settings
+
+# Parsed files, with the modification time and size they were read at
+_CSV_CACHE: dict[str, tuple[tuple[int, int], list[dict]]] = {}
+_FOLDERS_CACHE: dict[str, tuple[int, list[str]]] = {}
+_CACHE_LOCK = Lock()
+
+
+def _get_signature(path: Path) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_csv(path: Path) -> list[dict]:
+    """Rows of a CSV file, parsed again only when the file modification time or size changes.
+    Rows are copied, callers can update them"""
+    key = os.fspath(path)
+    signature = _get_signature(path)
+    with _CACHE_LOCK:
+        cached = _CSV_CACHE.get(key)
+    if cached is None or cached[0] != signature:
+        with open(path, encoding="utf-8") as csvfile:
+            cached = (signature, list(csv.DictReader(csvfile)))
+        with _CACHE_LOCK:
+            _CSV_CACHE[key] = cached
+    return [dict(row) for row in cached[1]]
+
+
+def get_datasets_catalogue() -> list[dict]:
+    """Rows of datasets.csv, named after their dataset"""
+    rows = read_csv(settings.DATASET_IMPORT_FOLDER / settings.DATASET_FILE)
+    for row in rows:
+        row["name"] = row["dataset"]
+    return rows
+
+
+def get_spectro_config_folder(dataset_path: str, conf_folder: str) -> Path:
+    """Folder of the spectrogram configurations of a dataset, from its exported path"""
+    dataset_folder = dataset_path.split("datawork/dataset/")[1]
+    return (
+        settings.DATASET_IMPORT_FOLDER
+        / dataset_folder
+        / settings.DATASET_SPECTRO_FOLDER
+        / conf_folder
+    )
+
+
+def get_spectro_folders(conf_folder_path: Path) -> list[str]:
+    """Names of the spectrogram folders of a dataset configuration,
+    listed again only when the configuration folder changes"""
+    key = os.fspath(conf_folder_path)
+    modified_at = os.stat(conf_folder_path).st_mtime_ns
+    with _CACHE_LOCK:
+        cached = _FOLDERS_CACHE.get(key)
+    if cached is None or cached[0] != modified_at:
+        cached = (
+            modified_at,
+            [entry.name for entry in os.scandir(conf_folder_path) if entry.is_dir()],
+        )
+        with _CACHE_LOCK:
+            _FOLDERS_CACHE[key] = cached
+    return list(cached[1])
+
+
+def get_spectro_metadata(conf_folder_path: Path) -> list[dict]:
+    """metadata.csv rows of all spectrogram folders of a dataset configuration"""
+    return [
+        spectro
+        for folder in get_spectro_folders(conf_folder_path)
+        for spectro in read_csv(conf_folder_path / folder / "metadata.csv")
+    ]
+
+
+def get_spectro_fingerprint(conf_folder_path: Path) -> str:
+    """Fingerprint of the spectrogram folders of a dataset configuration,
+    it changes when a folder is added or removed, or when a metadata.csv changes"""
+    fingerprint = hashlib.sha256()
+    for folder in sorted(get_spectro_folders(conf_folder_path)):
+        modified_at, size = _get_signature(conf_folder_path / folder / "metadata.csv")
+        fingerprint.update(f"{folder}:{modified_at}:{size};".encode())
+    return fingerprint.hexdigest()
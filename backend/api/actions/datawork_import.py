@@ -1,66 +1,103 @@
 """Python file for datawork_import function that imports datasets from datawork"""
 
 import csv
-import os
 from ast import literal_eval
 from datetime import timedelta
-from typing import Optional
+from itertools import islice
+from threading import Lock
+from typing import Optional, Callable, Iterable, Iterator
 
 from django.conf import settings
 from django.db import transaction
 from django.utils.dateparse import parse_datetime
 
+from backend.api.actions.datawork_catalogue import (
+    get_datasets_catalogue,
+    get_spectro_config_folder,
+    get_spectro_metadata,
+)
 from backend.api.actions.frequency_scales import get_frequency_scales
 from backend.api.models import (
+    AnnotationCampaignFile,
+    AnnotationCampaignProgress,
     Dataset,
     AudioMetadatum,
     DatasetFile,
     SpectrogramConfiguration,
+    SpectrogramTileManifest,
     WindowType,
     MultiLinearScale,
     LinearScale,
+    clear_dataset_files_indexes,
 )
 from backend.api.models.metadata import FileSubtype
 
-
-@transaction.atomic
-def datawork_import(*, wanted_datasets, importer):
-    """This function will import Datasets from datawork folder with importer user as owner"""
-    # TODO : break up this process to remove code smell and in order to help with unit testing
-    # pylint: disable=too-many-locals, duplicate-code
-    current_dataset_names = Dataset.objects.values_list("name", flat=True)
-    wanted_dataset_names = [dataset["name"] for dataset in wanted_datasets]
-    csv_dataset_names = []
-    new_datasets = []
-
-    # Check for new datasets
-    with open(
-        settings.DATASET_IMPORT_FOLDER / settings.DATASET_FILE, encoding="utf-8"
-    ) as csvfile:
-        dataset: dict
-        for dataset in csv.DictReader(csvfile):
-            dataset["name"] = dataset["dataset"]
-            csv_dataset_names.append(dataset["name"])
-            if (
-                dataset["name"] in wanted_dataset_names
-                and dataset["name"] not in current_dataset_names
-            ):
-                new_datasets.append(dataset)
-
-    created_datasets = []
-    for dataset in new_datasets:
-        # Create dataset metadata
-        conf_folder = f"{dataset['spectro_duration']}_{dataset['dataset_sr']}"
-
-        # Audio
-        audio_folder = (
-            settings.DATASET_IMPORT_FOLDER
-            / dataset["path"]
-            / settings.DATASET_FILES_FOLDER
+FILE_SUBTYPE_LOCK = Lock()
+
+
+def get_datasets_to_import(wanted_dataset_names: list[str]) -> list[dict]:
+    """Get datasets.csv rows of the wanted datasets which are not imported yet"""
+    current_dataset_names = set(Dataset.objects.values_list("name", flat=True))
+    return [
+        dataset
+        for dataset in get_datasets_catalogue()
+        if dataset["name"] in wanted_dataset_names
+        and dataset["name"] not in current_dataset_names
+    ]
+
+
+def _read_dataset_files(
+    timestamps: Iterable[dict], dataset: Dataset, conf_folder: str, duration: timedelta
+) -> Iterator[DatasetFile]:
+    """Lazily build dataset files from timestamp.csv rows"""
+    timestamp_data: dict
+    for timestamp_data in timestamps:
+        start = parse_datetime(timestamp_data["timestamp"])
+        yield DatasetFile(
+            dataset=dataset,
+            filename=timestamp_data["filename"],
+            filepath=settings.DATASET_FILES_FOLDER
             / conf_folder
+            / timestamp_data["filename"],
+            size=0,
+            start=start,
+            end=start + duration,
         )
-        with open(audio_folder / "metadata.csv", encoding="utf-8") as csvfile:
-            audio_raw = list(csv.DictReader(csvfile))[0]
+
+
+def import_dataset(
+    dataset: dict,
+    importer,
+    on_files_imported: Optional[Callable[[int], None]] = None,
+    on_dataset_created: Optional[Callable[[Dataset], None]] = None,
+) -> Dataset:
+    """Import a single dataset described by its datasets.csv row,
+    on_files_imported is called with the number of files inserted so far,
+    on_dataset_created is called as soon as the dataset exists, before its files are imported"""
+    # TODO : break up this process to remove code smell and in order to help with unit testing
+    # pylint: disable=too-many-locals
+    # Create dataset metadata
+    conf_folder = f"{dataset['spectro_duration']}_{dataset['dataset_sr']}"
+
+    # Audio
+    audio_folder = (
+        settings.DATASET_IMPORT_FOLDER
+        / dataset["path"]
+        / settings.DATASET_FILES_FOLDER
+        / conf_folder
+    )
+    with open(audio_folder / "metadata.csv", encoding="utf-8") as csvfile:
+        audio_raw = list(csv.DictReader(csvfile))[0]
+    file_subtypes = []
+    for subtype in literal_eval(audio_raw["sample_bits"]):
+        # FileSubtype name is not unique, datasets may be imported concurrently
+        with FILE_SUBTYPE_LOCK:
+            file_subtypes.append(FileSubtype.objects.get_or_create(name=subtype)[0])
+
+    dataset_path = settings.DATASET_EXPORT_PATH / dataset["path"]
+    dataset_path = dataset_path.as_posix()
+    # The dataset is never created without its metadata, or the other way around
+    with transaction.atomic():
         audio_metadatum = AudioMetadatum.objects.create(
             channel_count=audio_raw["channel_count"],
             dataset_sr=audio_raw["dataset_sr"],
@@ -73,12 +110,8 @@ def datawork_import(*, wanted_datasets, importer):
             if "audio_file_dataset_duration" in audio_raw
             else None,
         )
-        for subtype in literal_eval(audio_raw["sample_bits"]):
-            file_subtype, _ = FileSubtype.objects.get_or_create(name=subtype)
-            audio_metadatum.files_subtypes.add(file_subtype)
+        audio_metadatum.files_subtypes.add(*file_subtypes)
 
-        dataset_path = settings.DATASET_EXPORT_PATH / dataset["path"]
-        dataset_path = dataset_path.as_posix()
         # Create dataset
         curr_dataset = Dataset.objects.create(
             name=dataset["name"],
@@ -91,112 +124,101 @@ def datawork_import(*, wanted_datasets, importer):
             audio_metadatum=audio_metadatum,
             owner=importer,
         )
-        created_datasets.append(curr_dataset.id)
-
-        # Add Spectro Config
-        dataset_folder = dataset_path.split("datawork/dataset/")[1]
-
-        conf_folder_path = (
-            settings.DATASET_IMPORT_FOLDER
-            / dataset_folder
-            / settings.DATASET_SPECTRO_FOLDER
-            / conf_folder
+    if on_dataset_created is not None:
+        on_dataset_created(curr_dataset)
+
+    # Add Spectro Config
+    conf_folder_path = get_spectro_config_folder(dataset_path, conf_folder)
+
+    spectro: dict
+    for spectro in get_spectro_metadata(conf_folder_path):
+        name = f"{spectro['nfft']}_{spectro['window_size']}_{spectro['overlap']}"
+
+        is_instrument_normalization = spectro["data_normalization"] == "instrument"
+        is_zscore_normalization = spectro["data_normalization"] == "zscore"
+
+        custom_frequency_scale: (
+            Optional[LinearScale],
+            Optional[MultiLinearScale],
+        ) = (None, None)
+        if "custom_frequency_scale" in spectro:
+            custom_frequency_scale = get_frequency_scales(
+                spectro["custom_frequency_scale"],
+                int(audio_metadatum.dataset_sr),
+            )
+            if spectro["custom_frequency_scale"]:
+                name = f"{name}_{spectro['custom_frequency_scale']}"
+        new_spectro = SpectrogramConfiguration.objects.update_or_create(
+            name=name,
+            dataset=curr_dataset,
+            nfft=spectro["nfft"],
+            window_size=spectro["window_size"],
+            overlap=spectro["overlap"],
+            zoom_level=spectro["zoom_level"],
+            spectro_normalization=spectro["spectro_normalization"],
+            data_normalization=spectro["data_normalization"],
+            hp_filter_min_freq=spectro["hp_filter_min_freq"],
+            colormap=spectro["colormap"],
+            dynamic_min=spectro["dynamic_min"],
+            dynamic_max=spectro["dynamic_max"],
+            window_type=WindowType.objects.get_or_create(name=spectro["window_type"])[
+                0
+            ],
+            frequency_resolution=spectro["frequency_resolution"],
+            temporal_resolution=spectro["temporal_resolution"]
+            if "temporal_resolution" in spectro
+            else None,
+            spectro_duration=spectro["spectro_duration"]
+            if "spectro_duration" in spectro
+            else None,
+            audio_file_dataset_overlap=spectro["audio_file_dataset_overlap"]
+            if "audio_file_dataset_overlap" in spectro
+            else None,
+            zscore_duration=spectro["zscore_duration"]
+            if is_zscore_normalization
+            else None,
+            sensitivity_dB=spectro["sensitivity_dB"]
+            if is_instrument_normalization and "sensitivity_dB" in spectro
+            else None,
+            peak_voltage=spectro["peak_voltage"]
+            if is_instrument_normalization and "peak_voltage" in spectro
+            else None,
+            gain_dB=spectro["gain_dB"]
+            if is_instrument_normalization and "gain_dB" in spectro
+            else None,
+            linear_frequency_scale=custom_frequency_scale[0],
+            multi_linear_frequency_scale=custom_frequency_scale[1],
+        )[0]
+        new_spectro.save()
+
+    # Create dataset_files, timestamp.csv is streamed and inserted by bounded batches
+    with open(audio_folder / "timestamp.csv", encoding="utf-8") as csvfile:
+        dataset_files = _read_dataset_files(
+            csv.DictReader(csvfile),
+            dataset=curr_dataset,
+            conf_folder=conf_folder,
+            duration=timedelta(seconds=float(audio_raw["audio_file_dataset_duration"])),
         )
-
-        # Search all sub folder, each sub folder have one metadata.csv
-        for one_spectro_folder in os.scandir(conf_folder_path):
-            if one_spectro_folder.is_dir():
-                spectro_csv_path = f"{one_spectro_folder.path}/metadata.csv"
-            else:
-                continue
-
-            with open(spectro_csv_path, encoding="utf-8") as csvfile:
-                spectro: dict
-                for spectro in csv.DictReader(csvfile):
-                    name = f"{spectro['nfft']}_{spectro['window_size']}_{spectro['overlap']}"
-
-                    is_instrument_normalization = (
-                        spectro["data_normalization"] == "instrument"
-                    )
-                    is_zscore_normalization = spectro["data_normalization"] == "zscore"
-
-                    custom_frequency_scale: (
-                        Optional[LinearScale],
-                        Optional[MultiLinearScale],
-                    ) = (None, None)
-                    if "custom_frequency_scale" in spectro:
-                        custom_frequency_scale = get_frequency_scales(
-                            spectro["custom_frequency_scale"],
-                            int(audio_metadatum.dataset_sr),
-                        )
-                        if spectro["custom_frequency_scale"]:
-                            name = f"{name}_{spectro['custom_frequency_scale']}"
-                    new_spectro = SpectrogramConfiguration.objects.update_or_create(
-                        name=name,
-                        dataset=curr_dataset,
-                        nfft=spectro["nfft"],
-                        window_size=spectro["window_size"],
-                        overlap=spectro["overlap"],
-                        zoom_level=spectro["zoom_level"],
-                        spectro_normalization=spectro["spectro_normalization"],
-                        data_normalization=spectro["data_normalization"],
-                        hp_filter_min_freq=spectro["hp_filter_min_freq"],
-                        colormap=spectro["colormap"],
-                        dynamic_min=spectro["dynamic_min"],
-                        dynamic_max=spectro["dynamic_max"],
-                        window_type=WindowType.objects.get_or_create(
-                            name=spectro["window_type"]
-                        )[0],
-                        frequency_resolution=spectro["frequency_resolution"],
-                        temporal_resolution=spectro["temporal_resolution"]
-                        if "temporal_resolution" in spectro
-                        else None,
-                        spectro_duration=spectro["spectro_duration"]
-                        if "spectro_duration" in spectro
-                        else None,
-                        audio_file_dataset_overlap=spectro["audio_file_dataset_overlap"]
-                        if "audio_file_dataset_overlap" in spectro
-                        else None,
-                        zscore_duration=spectro["zscore_duration"]
-                        if is_zscore_normalization
-                        else None,
-                        sensitivity_dB=spectro["sensitivity_dB"]
-                        if is_instrument_normalization and "sensitivity_dB" in spectro
-                        else None,
-                        peak_voltage=spectro["peak_voltage"]
-                        if is_instrument_normalization and "peak_voltage" in spectro
-                        else None,
-                        gain_dB=spectro["gain_dB"]
-                        if is_instrument_normalization and "gain_dB" in spectro
-                        else None,
-                        linear_frequency_scale=custom_frequency_scale[0],
-                        multi_linear_frequency_scale=custom_frequency_scale[1],
-                    )[0]
-                    new_spectro.save()
-
-        dataset_files = []
-        # Create dataset_files
-        with open(audio_folder / "timestamp.csv", encoding="utf-8") as csvfile:
-            timestamp_data: dict
-            for timestamp_data in csv.DictReader(csvfile):
-                start = parse_datetime(timestamp_data["timestamp"])
-                dataset_files.append(
-                    DatasetFile(
-                        dataset=curr_dataset,
-                        filename=timestamp_data["filename"],
-                        filepath=settings.DATASET_FILES_FOLDER
-                        / conf_folder
-                        / timestamp_data["filename"],
-                        size=0,
-                        start=start,
-                        end=(
-                            start
-                            + timedelta(
-                                seconds=float(audio_raw["audio_file_dataset_duration"])
-                            )
-                        ),
-                    )
-                )
-        curr_dataset.files.bulk_create(dataset_files)
-
-    return Dataset.objects.filter(id__in=created_datasets)
+        imported_count = 0
+        while batch := list(
+            islice(dataset_files, settings.DATASET_IMPORT_FILES_BATCH_SIZE)
+        ):
+            DatasetFile.objects.bulk_create(batch)
+            imported_count += len(batch)
+            if on_files_imported is not None:
+                on_files_imported(imported_count)
+
+    # List missing spectrogram tiles, so that gaps are known before annotation
+    for configuration in curr_dataset.spectro_configs.all():
+        SpectrogramTileManifest.build(
+            configuration,
+            curr_dataset.files.values_list("id", "filename").iterator(),
+            conf_folder_path / configuration.name / "image",
+        )
+    clear_dataset_files_indexes(curr_dataset.id)
+    # The dataset may have been linked to campaigns while its files were imported
+    campaign_ids = list(curr_dataset.annotation_campaigns.values_list("id", flat=True))
+    AnnotationCampaignProgress.refresh_files_count(campaign_ids)
+    for campaign_id in campaign_ids:
+        AnnotationCampaignFile.refresh(campaign_id)
+    return curr_dataset
@@ -0,0 +1,226 @@
+"""Background processing of datawork import jobs, without any external broker"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction, connection
+from django.db.models import Q, Sum
+from django.utils import timezone
+from sentry_sdk import capture_exception
+
+from backend.api.actions.check_new_spectro_config_errors import (
+    check_new_spectro_config_errors,
+)
+from backend.api.actions.datawork_import import get_datasets_to_import, import_dataset
+from backend.api.models import (
+    AudioMetadatum,
+    Dataset,
+    DatasetImportJob,
+    DatasetImportJobDataset,
+    SpectrogramTileManifest,
+)
+
+
+@lru_cache(maxsize=None)
+def _get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=settings.DATASET_IMPORT_WORKERS,
+        thread_name_prefix="datawork_import",
+    )
+
+
+@transaction.atomic
+def create_import_job(*, wanted_datasets, importer) -> DatasetImportJob:
+    """Create a pending import job for the wanted datasets which are not imported yet"""
+    new_datasets = get_datasets_to_import(
+        [dataset["name"] for dataset in wanted_datasets]
+    )
+    job = DatasetImportJob.objects.create(owner=importer)
+    DatasetImportJobDataset.objects.bulk_create(
+        [
+            DatasetImportJobDataset(job=job, name=dataset["name"], csv_data=dataset)
+            for dataset in new_datasets
+        ]
+    )
+    return job
+
+
+def submit_import_job(job: DatasetImportJob):
+    """Run the job in a local worker thread once the current transaction is committed"""
+    transaction.on_commit(lambda: _get_executor().submit(_run_in_worker, job.id))
+
+
+def _run_in_worker(job_id: int):
+    try:
+        run_import_job(job_id)
+    except Exception as error:  # pylint: disable=broad-except
+        capture_exception(error)
+        DatasetImportJob.objects.filter(id=job_id).update(
+            status=DatasetImportJob.Status.FAILURE,
+            finished_at=timezone.now(),
+            errors={"error_lines": [str(error)]},
+        )
+    finally:
+        # Worker threads have their own connection
+        connection.close()
+
+
+def run_import_job(job_id: int) -> Optional[DatasetImportJob]:
+    """Process a pending import job, returns None if the job is not pending anymore"""
+    with transaction.atomic():
+        job: Optional[DatasetImportJob] = (
+            DatasetImportJob.objects.select_for_update(skip_locked=True)
+            .filter(id=job_id, status=DatasetImportJob.Status.PENDING)
+            .select_related("owner")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = DatasetImportJob.Status.RUNNING
+        job.started_at = timezone.now()
+        job.heartbeat_at = job.started_at
+        job.save()
+
+    job_datasets = list(job.datasets.filter(status=DatasetImportJob.Status.PENDING))
+    workers = min(settings.DATASET_IMPORT_DATASET_WORKERS, len(job_datasets))
+    if workers > 1:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"datawork_import_job_{job.id}"
+        ) as executor:
+            # Consume results so that unexpected errors are raised here
+            list(
+                executor.map(
+                    _import_job_dataset_in_worker, job_datasets, repeat(job.owner)
+                )
+            )
+    else:
+        for job_dataset in job_datasets:
+            _import_job_dataset(job_dataset, job.owner)
+
+    errors = check_new_spectro_config_errors()
+    job.errors = errors or None
+    job.status = (
+        DatasetImportJob.Status.FAILURE
+        if errors
+        or job.datasets.filter(status=DatasetImportJob.Status.FAILURE).exists()
+        else DatasetImportJob.Status.SUCCESS
+    )
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def _import_job_dataset_in_worker(job_dataset: DatasetImportJobDataset, importer):
+    try:
+        _import_job_dataset(job_dataset, importer)
+    finally:
+        # Worker threads have their own connection
+        connection.close()
+
+
+def _beat(job_id: int):
+    """Report the job is still running"""
+    DatasetImportJob.objects.filter(id=job_id).update(heartbeat_at=timezone.now())
+
+
+def _import_job_dataset(job_dataset: DatasetImportJobDataset, importer):
+    """Import a dataset of a job, files progress is committed as it goes"""
+    job_dataset.status = DatasetImportJob.Status.RUNNING
+    job_dataset.save(update_fields=["status"])
+    _beat(job_dataset.job_id)
+
+    # The dataset may have been imported since the job creation
+    if Dataset.objects.filter(name=job_dataset.name).exists():
+        _fail_job_dataset(job_dataset, "This dataset is already imported")
+        return
+
+    def on_dataset_created(dataset: Dataset):
+        # Committed right away so that a partial import can be cleaned after a crash
+        job_dataset.dataset = dataset
+        job_dataset.save(update_fields=["dataset"])
+        _beat(job_dataset.job_id)
+
+    def on_files_imported(count: int):
+        DatasetImportJobDataset.objects.filter(id=job_dataset.id).update(
+            imported_files_count=count
+        )
+        _beat(job_dataset.job_id)
+
+    try:
+        dataset = import_dataset(
+            job_dataset.csv_data,
+            importer,
+            on_files_imported=on_files_imported,
+            on_dataset_created=on_dataset_created,
+        )
+    except KeyError as error:
+        capture_exception(error)
+        _fail_job_dataset(
+            job_dataset,
+            f"One of the import CSV is missing the following column : {error}",
+        )
+        return
+    except Exception as error:  # pylint: disable=broad-except
+        capture_exception(error)
+        _fail_job_dataset(job_dataset, str(error))
+        return
+
+    job_dataset.status = DatasetImportJob.Status.SUCCESS
+    # Gaps are reported so that they are known before the dataset is annotated
+    job_dataset.missing_tiles_count = (
+        SpectrogramTileManifest.objects.filter(
+            spectrogram_configuration__dataset=dataset
+        ).aggregate(count=Sum("missing_tiles_count"))["count"]
+        or 0
+    )
+    job_dataset.save(update_fields=["status", "missing_tiles_count"])
+
+
+def _fail_job_dataset(job_dataset: DatasetImportJobDataset, error: str):
+    """Report the error of a job dataset and remove what it partially imported"""
+    _clean_job_dataset(job_dataset)
+    job_dataset.status = DatasetImportJob.Status.FAILURE
+    job_dataset.error = error
+    job_dataset.save(update_fields=["status", "error", "dataset"])
+
+
+def _clean_job_dataset(job_dataset: DatasetImportJobDataset):
+    """Remove the dataset partially imported by the job, never a dataset imported by other means"""
+    dataset = Dataset.objects.filter(id=job_dataset.dataset_id).first()
+    job_dataset.dataset = None
+    if dataset is None:
+        return
+    audio_metadatum_id = dataset.audio_metadatum_id
+    dataset.delete()
+    AudioMetadatum.objects.filter(id=audio_metadatum_id).delete()
+
+
+@transaction.atomic
+def restart_running_import_jobs() -> int:
+    """Set back to pending the jobs left running by a stopped worker,
+    the datasets they were importing are removed to be imported again.
+    Only jobs without progress for DATASET_IMPORT_JOB_STALE_DELAY are restarted,
+    jobs locked by another restart are skipped."""
+    jobs = list(
+        DatasetImportJob.objects.select_for_update(skip_locked=True)
+        .filter(status=DatasetImportJob.Status.RUNNING)
+        .filter(
+            Q(heartbeat_at__isnull=True)
+            | Q(
+                heartbeat_at__lt=timezone.now()
+                - settings.DATASET_IMPORT_JOB_STALE_DELAY
+            )
+        )
+    )
+    for job_dataset in DatasetImportJobDataset.objects.filter(
+        job__in=jobs, status=DatasetImportJob.Status.RUNNING
+    ):
+        _clean_job_dataset(job_dataset)
+        job_dataset.status = DatasetImportJob.Status.PENDING
+        job_dataset.imported_files_count = 0
+        job_dataset.save(update_fields=["status", "imported_files_count", "dataset"])
+    return DatasetImportJob.objects.filter(id__in=[job.id for job in jobs]).update(
+        status=DatasetImportJob.Status.PENDING
+    )
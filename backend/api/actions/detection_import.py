@@ -0,0 +1,244 @@
+"""Bulk importation of detections as annotation results"""
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from backend.api.models import (
+    AnnotationCampaign,
+    AnnotationCampaignFile,
+    AnnotationResult,
+    ConfidenceIndicator,
+    ConfidenceIndicatorSet,
+    ConfidenceIndicatorSetIndicator,
+    DatasetFileInterval,
+    Detector,
+    DetectorConfiguration,
+    Label,
+)
+from backend.api.models.annotation.result import AnnotationResultType
+
+IMPORT_BATCH_SIZE = 1000
+
+
+def to_seconds(delta: timedelta) -> float:
+    """Format seconds timedelta as float"""
+    return delta.seconds + delta.microseconds / 1000000
+
+
+def map_detection_rows(
+    rows: Iterable[dict], dataset_name, detectors_map: dict, campaign_id
+) -> Iterator[dict]:
+    """Map detection CSV rows of the selected detectors to import data"""
+    for row in rows:
+        annotator = row["annotator"] if "annotator" in row else None
+        if annotator not in detectors_map:
+            continue
+        detector_map = detectors_map[annotator] if annotator else None
+        confidence_level = (
+            row["confidence_indicator_level"]
+            if "confidence_indicator_level" in row
+            else None
+        )
+        detector = annotator
+        if detector_map and "detector" in detector_map and detector_map["detector"]:
+            detector = detector_map["detector"]
+        yield {
+            "is_box": row["is_box"],
+            "dataset": dataset_name,
+            "detector": detector,
+            "detector_config": detector_map["configuration"]
+            if detector_map and "configuration" in detector_map
+            else None,
+            "start_datetime": row["start_datetime"],
+            "end_datetime": row["end_datetime"],
+            "min_frequency": row["start_frequency"],
+            "max_frequency": row["end_frequency"]
+            if row["end_frequency"] != ""
+            else None,
+            "label": row["annotation"],
+            "confidence_indicator": {
+                "label": row["confidence_indicator_label"],
+                "level": confidence_level.split("/")[0],
+            }
+            if "confidence_indicator_label" in row
+            and row["confidence_indicator_label"]
+            and confidence_level
+            else None,
+            "annotation_campaign": campaign_id,
+        }
+
+
+class DetectionImporter:
+    """Resolve detectors, labels and confidence indicators once per distinct value
+    and insert the results by batches"""
+
+    def __init__(self, campaign: AnnotationCampaign):
+        self.campaign = campaign
+        self._detector_configurations: dict[tuple[str, str], DetectorConfiguration] = {}
+        self._labels: dict[str, Label] = {}
+        self._confidence_indicators: dict[tuple, ConfidenceIndicator] = {}
+        self._campaign_label_ids: Optional[set[int]] = None
+
+    def get_detector_configuration(
+        self, detector_name: str, configuration: str
+    ) -> DetectorConfiguration:
+        """Get or create detector configuration"""
+        key = (detector_name, configuration)
+        if key not in self._detector_configurations:
+            detector, _ = Detector.objects.get_or_create(name=detector_name)
+            (
+                self._detector_configurations[key],
+                _,
+            ) = DetectorConfiguration.objects.get_or_create(
+                detector=detector,
+                configuration=configuration,
+            )
+        return self._detector_configurations[key]
+
+    def get_label(self, name: str) -> Label:
+        """Get or create label and add it to the campaign label set"""
+        if name not in self._labels:
+            label, _ = Label.objects.get_or_create(name=name)
+            if self._campaign_label_ids is None:
+                self._campaign_label_ids = set(
+                    self.campaign.label_set.labels.values_list("id", flat=True)
+                )
+            if label.id not in self._campaign_label_ids:
+                self.campaign.label_set.labels.add(label)
+                self._campaign_label_ids.add(label.id)
+            self._labels[name] = label
+        return self._labels[name]
+
+    def get_confidence_set(self, name, index=0) -> ConfidenceIndicatorSet:
+        """Recover appropriate confidence set based on the campaign name"""
+        real_name = name if index == 0 else f"{name} ({index})"
+        if ConfidenceIndicatorSet.objects.filter(name=real_name).exists():
+            return self.get_confidence_set(name, index + 1)
+        return ConfidenceIndicatorSet.objects.create(name=real_name)
+
+    def get_confidence_indicator(
+        self, data: Optional[dict]
+    ) -> Optional[ConfidenceIndicator]:
+        """Get or create confidence indicator in the campaign confidence set"""
+        if data is None:
+            return None
+        key = (data.get("label"), data.get("level"), data.get("is_default") or False)
+        if key not in self._confidence_indicators:
+            if self.campaign.confidence_indicator_set is None:
+                self.campaign.confidence_indicator_set = self.get_confidence_set(
+                    name=f"{self.campaign.name} confidence set"
+                )
+                self.campaign.save()
+            confidence_indicator, _ = ConfidenceIndicator.objects.get_or_create(
+                label=key[0],
+                level=key[1],
+            )
+            ConfidenceIndicatorSetIndicator.objects.get_or_create(
+                confidence_indicator=confidence_indicator,
+                confidence_indicator_set=self.campaign.confidence_indicator_set,
+                is_default=key[2],
+            )
+            self._confidence_indicators[key] = confidence_indicator
+        return self._confidence_indicators[key]
+
+    def get_results(self, detection: dict) -> list[AnnotationResult]:
+        """Build the results of a validated detection, one for each of its files"""
+        # pylint: disable=too-many-locals
+        is_box: bool = detection["is_box"]
+        files: list[DatasetFileInterval] = detection["files"]
+        common = {
+            "annotation_campaign": self.campaign,
+            "detector_configuration": self.get_detector_configuration(
+                detection["detector"], detection["detector_config"]
+            ),
+            "label": self.get_label(str(detection["label"])),
+            "confidence_indicator": self.get_confidence_indicator(
+                detection.get("confidence_indicator")
+            ),
+        }
+
+        if not is_box and len(files) == 1:
+            return [
+                AnnotationResult(
+                    **common,
+                    dataset_file_id=files[0].id,
+                    type=AnnotationResultType.WEAK,
+                )
+            ]
+
+        results = []
+        start: datetime = detection["start_datetime"]
+        end: datetime = detection["end_datetime"]
+        max_frequency = detection["dataset"].audio_metadatum.dataset_sr / 2
+        start_frequency = (
+            detection["min_frequency"] if "min_frequency" in detection and is_box else 0
+        )
+        end_frequency = (
+            detection["max_frequency"]
+            if "max_frequency" in detection and is_box
+            else max_frequency
+        )
+        for file in files:
+            file_duration = to_seconds(file.end - file.start)
+            start_time = 0 if start < file.start else to_seconds(start - file.start)
+            end_time = file_duration if end > file.end else to_seconds(end - file.start)
+
+            if (
+                start_time == 0
+                and end_time == file_duration
+                and start_frequency == 0
+                and end_frequency == max_frequency
+            ):
+                results.append(
+                    AnnotationResult(
+                        **common,
+                        dataset_file_id=file.id,
+                        type=AnnotationResultType.WEAK,
+                    )
+                )
+            elif start_time == end_time and (
+                start_frequency == end_frequency
+                or detection.get("max_frequency") is None
+            ):
+                results.append(
+                    AnnotationResult(
+                        **common,
+                        dataset_file_id=file.id,
+                        start_frequency=start_frequency,
+                        end_frequency=None,
+                        start_time=start_time,
+                        end_time=None,
+                        type=AnnotationResultType.POINT,
+                    )
+                )
+            else:
+                results.append(
+                    AnnotationResult(
+                        **common,
+                        dataset_file_id=file.id,
+                        start_frequency=start_frequency,
+                        end_frequency=end_frequency,
+                        start_time=start_time,
+                        end_time=end_time,
+                        type=AnnotationResultType.BOX,
+                    )
+                )
+        return results
+
+    def import_detections(
+        self, detections: Iterable[dict], batch_size: int = IMPORT_BATCH_SIZE
+    ) -> list[int]:
+        """Insert the results of validated detections by batches, returns their ids"""
+        results = (
+            result for detection in detections for result in self.get_results(detection)
+        )
+        ids = []
+        while batch := list(islice(results, batch_size)):
+            ids += [result.id for result in self.save_results(batch)]
+        return ids
+
+    def save_results(self, results: list[AnnotationResult]) -> list[AnnotationResult]:
+        """Insert results, bulk creation skips signals so campaign files states are updated here"""
+        results = AnnotationResult.objects.bulk_create(results)
+        AnnotationCampaignFile.add_detections(self.campaign.id, results)
+        return results
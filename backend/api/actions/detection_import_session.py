@@ -0,0 +1,213 @@
+"""Background processing of detection imports by committed chunks, without any external broker"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Optional
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction, connection
+from django.db.models import Q
+from django.utils import timezone
+from sentry_sdk import capture_exception
+
+from backend.api.actions.detection_import import IMPORT_BATCH_SIZE, map_detection_rows
+from backend.api.models import (
+    AnnotationCampaign,
+    DetectionImport,
+    DetectionImportRow,
+)
+from backend.api.serializers import AnnotationResultImportListSerializer
+from backend.utils.uploads import read_csv_upload
+
+
+@lru_cache(maxsize=None)
+def _get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=settings.DETECTION_IMPORT_WORKERS,
+        thread_name_prefix="detection_import",
+    )
+
+
+@transaction.atomic
+def create_detection_import(
+    *,
+    file: UploadedFile,
+    campaign: AnnotationCampaign,
+    owner,
+    dataset_name: str,
+    detectors_map: dict,
+    force: bool = False,
+) -> DetectionImport:
+    """Store the rows of the uploaded CSV in a pending detection import"""
+    detection_import = DetectionImport.objects.create(
+        owner=owner,
+        annotation_campaign=campaign,
+        dataset_name=dataset_name,
+        detectors_map=detectors_map,
+        force=force,
+        has_confidence_set=campaign.confidence_indicator_set_id is not None,
+    )
+    detections = map_detection_rows(
+        read_csv_upload(file),
+        dataset_name=dataset_name,
+        detectors_map=detectors_map,
+        campaign_id=campaign.id,
+    )
+    rows_count = 0
+    while batch := list(islice(detections, IMPORT_BATCH_SIZE)):
+        DetectionImportRow.objects.bulk_create(
+            DetectionImportRow(
+                detection_import=detection_import, index=rows_count + index, data=data
+            )
+            for index, data in enumerate(batch)
+        )
+        rows_count += len(batch)
+    detection_import.rows_count = rows_count
+    detection_import.save(update_fields=["rows_count"])
+    return detection_import
+
+
+def submit_detection_import(detection_import: DetectionImport):
+    """Run the import in a local worker thread once the current transaction is committed"""
+    transaction.on_commit(
+        lambda: _get_executor().submit(_run_in_worker, detection_import.id)
+    )
+
+
+def resume_detection_import(detection_import: DetectionImport) -> bool:
+    """Resume a failed import from its last committed chunk"""
+    if not DetectionImport.objects.filter(
+        id=detection_import.id, status=DetectionImport.Status.FAILURE
+    ).update(status=DetectionImport.Status.PENDING, error=None, finished_at=None):
+        return False
+    submit_detection_import(detection_import)
+    return True
+
+
+def _run_in_worker(detection_import_id: int):
+    try:
+        run_detection_import(detection_import_id)
+    except Exception as error:  # pylint: disable=broad-except
+        capture_exception(error)
+        DetectionImport.objects.filter(id=detection_import_id).update(
+            status=DetectionImport.Status.FAILURE,
+            finished_at=timezone.now(),
+            error=str(error),
+        )
+    finally:
+        # Worker threads have their own connection
+        connection.close()
+
+
+def run_detection_import(detection_import_id: int) -> Optional[DetectionImport]:
+    """Process a pending import, returns None if the import is not pending anymore"""
+    with transaction.atomic():
+        detection_import: Optional[DetectionImport] = (
+            DetectionImport.objects.select_for_update(skip_locked=True)
+            .filter(id=detection_import_id, status=DetectionImport.Status.PENDING)
+            .select_related("annotation_campaign")
+            .first()
+        )
+        if detection_import is None:
+            return None
+        detection_import.status = DetectionImport.Status.RUNNING
+        detection_import.started_at = timezone.now()
+        detection_import.heartbeat_at = detection_import.started_at
+        detection_import.save()
+
+    while _import_next_chunk(detection_import):
+        pass
+
+    # Only rejected rows are kept, with their errors
+    detection_import.rows.filter(errors__isnull=True).delete()
+    detection_import.status = DetectionImport.Status.SUCCESS
+    detection_import.finished_at = timezone.now()
+    detection_import.save(update_fields=["status", "finished_at"])
+    return detection_import
+
+
+@transaction.atomic
+def restart_running_detection_imports() -> int:
+    """Set back to pending the imports left running by a stopped worker.
+    Only imports without progress for DETECTION_IMPORT_STALE_DELAY are restarted,
+    imports locked by a running chunk are skipped."""
+    return DetectionImport.objects.filter(
+        id__in=list(
+            DetectionImport.objects.select_for_update(skip_locked=True)
+            .filter(status=DetectionImport.Status.RUNNING)
+            .filter(
+                Q(heartbeat_at__isnull=True)
+                | Q(
+                    heartbeat_at__lt=timezone.now()
+                    - settings.DETECTION_IMPORT_STALE_DELAY
+                )
+            )
+            .values_list("id", flat=True)
+        )
+    ).update(status=DetectionImport.Status.PENDING)
+
+
+def _import_next_chunk(detection_import: DetectionImport) -> bool:
+    """Import the next rows, results and progress are committed together
+    so that a resumed import never inserts a row twice"""
+    with transaction.atomic():
+        # The chunk is claimed on the locked import: concurrent runners of the same import
+        # wait for each other and continue from the committed progress
+        (
+            detection_import.processed_rows_count,
+            detection_import.rejected_rows_count,
+            detection_import.imported_results_count,
+        ) = (
+            DetectionImport.objects.select_for_update()
+            .filter(id=detection_import.id)
+            .values_list(
+                "processed_rows_count",
+                "rejected_rows_count",
+                "imported_results_count",
+            )
+            .get()
+        )
+        rows: list[DetectionImportRow] = list(
+            detection_import.rows.filter(
+                index__gte=detection_import.processed_rows_count
+            )[: settings.DETECTION_IMPORT_CHUNK_SIZE]
+        )
+        if not rows:
+            return False
+
+        context = {
+            "campaign": detection_import.annotation_campaign,
+            "force": detection_import.force,
+            "has_confidence_set": detection_import.has_confidence_set,
+        }
+        serializer = AnnotationResultImportListSerializer(
+            data=[row.data for row in rows], context=context
+        )
+        rejected_rows = []
+        if not serializer.is_valid():
+            for row, errors in zip(rows, serializer.errors):
+                if errors:
+                    row.errors = errors
+                    rejected_rows.append(row)
+            DetectionImportRow.objects.bulk_update(rejected_rows, ["errors"])
+            serializer = AnnotationResultImportListSerializer(
+                data=[row.data for row in rows if row.errors is None],
+                context=context,
+            )
+            serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        detection_import.processed_rows_count += len(rows)
+        detection_import.rejected_rows_count += len(rejected_rows)
+        detection_import.imported_results_count += serializer.instance.count()
+        detection_import.heartbeat_at = timezone.now()
+        detection_import.save(
+            update_fields=[
+                "processed_rows_count",
+                "rejected_rows_count",
+                "imported_results_count",
+                "heartbeat_at",
+            ]
+        )
+    return True
@@ -0,0 +1,200 @@
+"""Bulk assignment of annotation file ranges within a campaign"""
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from backend.api.models import (
+    AnnotationCampaign,
+    AnnotationCampaignAnnotatorFile,
+    AnnotationCampaignProgress,
+    AnnotationFileRange,
+    AnnotationTask,
+)
+
+
+class RangeBounds(NamedTuple):
+    """Inclusive file indexes of a range, with the ids of the existing ranges it replaces"""
+
+    first_file_index: int
+    last_file_index: int
+    range_ids: frozenset[int]
+
+
+def merge_ranges(ranges: list[RangeBounds]) -> list[RangeBounds]:
+    """Merge overlapping and sibling ranges"""
+    merged: list[RangeBounds] = []
+    for bounds in sorted(ranges):
+        if merged and bounds.first_file_index <= merged[-1].last_file_index + 1:
+            previous = merged.pop()
+            bounds = RangeBounds(
+                previous.first_file_index,
+                max(previous.last_file_index, bounds.last_file_index),
+                previous.range_ids | bounds.range_ids,
+            )
+        merged.append(bounds)
+    return merged
+
+
+class FileRangeAssignment:
+    """
+    Replace all the file ranges of a campaign.
+    Connected ranges of an annotator are merged in memory, file ids are resolved with a single query
+    and ranges are written with bulk operations.
+    """
+
+    def __init__(self, campaign: AnnotationCampaign):
+        self.campaign = campaign
+        self.existing_ranges: dict[int, AnnotationFileRange] = {
+            file_range.id: file_range
+            for file_range in AnnotationFileRange.objects.filter(
+                annotation_campaign_id=campaign.id
+            )
+        }
+        self.existing_bounds: dict[tuple[int, int, int], int] = {
+            (
+                file_range.annotator_id,
+                file_range.first_file_index,
+                file_range.last_file_index,
+            ): file_range.id
+            for file_range in self.existing_ranges.values()
+        }
+
+    def _get_existing_id(self, data: dict) -> Optional[int]:
+        """Recover the existing range updated by the given data"""
+        if data.get("id") in self.existing_ranges:
+            return data["id"]
+        return self.existing_bounds.get(
+            (data["annotator"].id, data["first_file_index"], data["last_file_index"])
+        )
+
+    def get_ranges(self, validated_data: list[dict]) -> dict[int, list[RangeBounds]]:
+        """Get the merged ranges of each annotator"""
+        # The last data given for an existing range takes precedence
+        updated: dict[int, dict] = {}
+        created: list[dict] = []
+        for data in validated_data:
+            existing_id = self._get_existing_id(data)
+            if existing_id is None:
+                created.append(data)
+            else:
+                updated[existing_id] = data
+
+        ranges: dict[int, list[RangeBounds]] = defaultdict(list)
+        for existing_id, data in [*updated.items(), *((None, d) for d in created)]:
+            ranges[data["annotator"].id].append(
+                RangeBounds(
+                    data["first_file_index"],
+                    data["last_file_index"],
+                    frozenset() if existing_id is None else frozenset([existing_id]),
+                )
+            )
+        return {
+            annotator_id: merge_ranges(annotator_ranges)
+            for annotator_id, annotator_ranges in ranges.items()
+        }
+
+    @transaction.atomic
+    def assign(self, validated_data: list[dict]) -> list[AnnotationFileRange]:
+        """Save the given ranges, the other ones of the campaign are deleted"""
+        ranges = self.get_ranges(validated_data)
+        file_ids = self.campaign.get_file_ids(
+            index
+            for annotator_ranges in ranges.values()
+            for bounds in annotator_ranges
+            for index in (bounds.first_file_index, bounds.last_file_index)
+        )
+
+        kept_ids = set()
+        updated_ranges: list[AnnotationFileRange] = []
+        created_ranges: list[AnnotationFileRange] = []
+        changed_annotators = set()
+        for annotator_id, annotator_ranges in ranges.items():
+            for bounds in annotator_ranges:
+                reused_ids = bounds.range_ids - kept_ids
+                file_range = (
+                    self.existing_ranges[min(reused_ids)]
+                    if reused_ids
+                    else AnnotationFileRange(annotation_campaign_id=self.campaign.id)
+                )
+                values = {
+                    "annotator_id": annotator_id,
+                    "first_file_index": bounds.first_file_index,
+                    "last_file_index": bounds.last_file_index,
+                    "first_file_id": file_ids[bounds.first_file_index],
+                    "last_file_id": file_ids[bounds.last_file_index],
+                    "files_count": bounds.last_file_index - bounds.first_file_index + 1,
+                }
+                if file_range.id is None:
+                    created_ranges.append(file_range)
+                else:
+                    kept_ids.add(file_range.id)
+                    if all(
+                        getattr(file_range, field) == value
+                        for field, value in values.items()
+                    ):
+                        continue
+                    changed_annotators.add(file_range.annotator_id)
+                    updated_ranges.append(file_range)
+                changed_annotators.add(annotator_id)
+                for field, value in values.items():
+                    setattr(file_range, field, value)
+
+        deleted_ids = self.existing_ranges.keys() - kept_ids
+        changed_annotators |= {
+            self.existing_ranges[range_id].annotator_id for range_id in deleted_ids
+        }
+        AnnotationFileRange.objects.filter(id__in=deleted_ids).delete()
+        AnnotationFileRange.objects.bulk_update(
+            updated_ranges,
+            [
+                "annotator",
+                "first_file_index",
+                "last_file_index",
+                "first_file_id",
+                "last_file_id",
+                "files_count",
+            ],
+        )
+        AnnotationFileRange.objects.bulk_create(created_ranges)
+        self.clean_tasks(changed_annotators)
+
+        # Bulk operations skip signals
+        AnnotationCampaignProgress.refresh(self.campaign.id)
+        return sorted(
+            [
+                file_range
+                for file_range in self.existing_ranges.values()
+                if file_range.id in kept_ids
+            ]
+            + created_ranges,
+            key=lambda file_range: file_range.first_file_index,
+        )
+
+    def clean_tasks(self, annotator_ids: set[int]):
+        """
+        Remove tasks of files which are not in the annotators ranges anymore.
+        Tasks are deleted in bulk, the progress counters are recomputed afterwards.
+        """
+        if not annotator_ids:
+            return
+        out_of_ranges = ~Exists(
+            AnnotationFileRange.objects.filter(
+                annotation_campaign_id=self.campaign.id,
+                annotator_id=OuterRef("annotator_id"),
+                first_file_id__lte=OuterRef("dataset_file_id"),
+                last_file_id__gte=OuterRef("dataset_file_id"),
+            )
+        )
+        AnnotationCampaignAnnotatorFile.objects.filter(
+            out_of_ranges,
+            annotation_campaign_id=self.campaign.id,
+            annotator_id__in=annotator_ids,
+            is_submitted=True,
+        ).update(is_submitted=False)
+        AnnotationTask.objects.filter(
+            out_of_ranges,
+            annotation_campaign_id=self.campaign.id,
+            annotator_id__in=annotator_ids,
+        ).delete()
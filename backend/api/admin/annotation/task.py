@@ -36,3 +36,7 @@ class AnnotationTaskAdmin(admin.ModelAdmin):
     )
     search_fields = ("dataset_file__filename",)
     list_filter = ("status", "annotation_campaign", "annotator")
+
+    def delete_queryset(self, request, queryset):
+        """Campaigns progress is updated once for the deleted tasks"""
+        AnnotationTask.delete_tasks(queryset)
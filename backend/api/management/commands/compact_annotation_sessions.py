@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core import management
+
+from backend.api.models import AnnotationSession
+
+
+class Command(management.BaseCommand):
+    help = "Clear the output of old annotation sessions, only the latest sessions of each task keep it"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=settings.ANNOTATION_SESSION_OUTPUT_RETENTION,
+            help="Number of latest sessions keeping their output for each task "
+            "(default: ANNOTATION_SESSION_OUTPUT_RETENTION setting)",
+        )
+
+    def handle(self, *args, **options):
+        if options["keep"] is None or options["keep"] < 1:
+            raise management.CommandError("--keep should be a positive number")
+        cleared_count = AnnotationSession.compact(options["keep"])
+        print(f" > Cleared {cleared_count} sessions output")
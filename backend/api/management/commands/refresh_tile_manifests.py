@@ -0,0 +1,51 @@
+from django.core import management
+
+from backend.api.actions.datawork_catalogue import get_spectro_config_folder
+from backend.api.models import SpectrogramConfiguration, SpectrogramTileManifest
+
+
+class Command(management.BaseCommand):
+    help = "List again the missing spectrogram tiles of the configurations which image folder changed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dataset",
+            nargs="+",
+            help="Names of the datasets to refresh (default: all datasets)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Process all configurations, even those which image folder didn't change",
+        )
+
+    def handle(self, *args, **options):
+        configurations = SpectrogramConfiguration.objects.select_related("dataset")
+        if options["dataset"]:
+            configurations = configurations.filter(dataset__name__in=options["dataset"])
+        refreshed_count = 0
+        for configuration in configurations:
+            dataset = configuration.dataset
+            try:
+                image_folder = (
+                    get_spectro_config_folder(
+                        dataset.dataset_path, dataset.dataset_conf or ""
+                    )
+                    / configuration.name
+                    / "image"
+                )
+            except IndexError:
+                # The dataset was not imported from datawork
+                print(f" > {dataset.name} - {configuration.name}: unknown folder")
+                continue
+            manifest = SpectrogramTileManifest.refresh(
+                configuration, image_folder, force=options["force"]
+            )
+            if manifest is None:
+                continue
+            refreshed_count += 1
+            print(
+                f" > {dataset.name} - {configuration.name}: "
+                f"{manifest.missing_tiles_count} missing tiles"
+            )
+        print(f" > Refreshed {refreshed_count} tile manifests")
@@ -0,0 +1,33 @@
+from django.core import management
+
+from backend.api.actions.datawork_import_job import (
+    restart_running_import_jobs,
+    run_import_job,
+)
+from backend.api.models import DatasetImportJob
+
+
+class Command(management.BaseCommand):
+    help = "Process pending datawork import jobs (eg: jobs left pending by a server restart)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--restart-running",
+            action="store_true",
+            help="Also restart jobs left running by a stopped server, "
+            "without progress for DATASET_IMPORT_JOB_STALE_DELAY: "
+            "their partially imported datasets are removed",
+        )
+
+    def handle(self, *args, **options):
+        if options["restart_running"]:
+            restart_running_import_jobs()
+        for job_id in (
+            DatasetImportJob.objects.filter(status=DatasetImportJob.Status.PENDING)
+            .order_by("created_at")
+            .values_list("id", flat=True)
+        ):
+            job = run_import_job(job_id)
+            if job is None:
+                continue
+            print(f" > Import job {job.id}: {job.get_status_display()}")
@@ -0,0 +1,37 @@
+from django.core import management
+
+from backend.api.actions.detection_import_session import (
+    restart_running_detection_imports,
+    run_detection_import,
+)
+from backend.api.models import DetectionImport
+
+
+class Command(management.BaseCommand):
+    help = "Process pending detection imports (eg: imports left pending by a server restart)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--restart-running",
+            action="store_true",
+            help="Also resume imports left running by a stopped server, "
+            "without progress for DETECTION_IMPORT_STALE_DELAY",
+        )
+
+    def handle(self, *args, **options):
+        if options["restart_running"]:
+            restart_running_detection_imports()
+        for detection_import_id in (
+            DetectionImport.objects.filter(status=DetectionImport.Status.PENDING)
+            .order_by("created_at")
+            .values_list("id", flat=True)
+        ):
+            detection_import = run_detection_import(detection_import_id)
+            if detection_import is None:
+                continue
+            print(
+                f" > Detection import {detection_import.id}: "
+                f"{detection_import.get_status_display()} "
+                f"({detection_import.imported_results_count} results, "
+                f"{detection_import.rejected_rows_count} rejected rows)"
+            )
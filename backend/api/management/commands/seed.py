@@ -27,6 +27,8 @@ from backend.api.models import (
     SpectrogramConfiguration,
     AnnotationFileRange,
     ConfidenceIndicatorSetIndicator,
+    AnnotationCampaignProgress,
+    AnnotationCampaignAnnotatorFile,
 )
 from backend.aplose.models import AploseUser
 from backend.aplose.models.user import ExpertiseLevel
@@ -397,6 +399,7 @@ class Command(management.BaseCommand):
                     )
                 )
             AnnotationFileRange.objects.bulk_create(file_ranges)
+            AnnotationCampaignProgress.refresh(campaign.id)
 
     def _create_annotation_results(self):
         print(" ###### _create_annotation_results ######")
@@ -433,6 +436,7 @@ class Command(management.BaseCommand):
                         dataset_file_id=task.dataset_file_id,
                         annotator_id=task.annotator_id,
                     )
+        AnnotationCampaignAnnotatorFile.refresh(campaign.id)
 
     def _create_comments(self):
         print(" ###### _create_comments ######")
@@ -0,0 +1,24 @@
+from django.core import management
+
+from backend.api.actions.check_new_spectro_config_errors import sync_spectro_configs
+
+
+class Command(management.BaseCommand):
+    help = "Update the spectrogram configurations of the datasets present in datasets.csv from their metadata.csv"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Process all datasets, even those which spectrogram folders didn't change",
+        )
+
+    def handle(self, *args, **options):
+        datasets, errors = sync_spectro_configs(force=options["force"])
+        print(f" > Synced spectrogram configurations of {len(datasets)} datasets")
+        for error in errors:
+            print(f" > {error}")
+        if errors:
+            raise management.CommandError(
+                f"Spectrogram configurations of {len(errors)} datasets can't be updated"
+            )
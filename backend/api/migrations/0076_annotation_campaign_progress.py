@@ -0,0 +1,162 @@
+# Generated by Django 3.2.25 on 2026-10-18 01:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Sum, Count
+
+
+def fill_progress(apps, schema_editor):
+    campaign_model = apps.get_model("api", "AnnotationCampaign")
+    file_range_model = apps.get_model("api", "AnnotationFileRange")
+    task_model = apps.get_model("api", "AnnotationTask")
+    campaign_progress_model = apps.get_model("api", "AnnotationCampaignProgress")
+    annotator_progress_model = apps.get_model(
+        "api", "AnnotationCampaignAnnotatorProgress"
+    )
+
+    dataset_file_model = apps.get_model("api", "DatasetFile")
+    campaign_progress_model.objects.bulk_create(
+        [
+            campaign_progress_model(
+                annotation_campaign_id=campaign_id,
+                files_count=dataset_file_model.objects.filter(
+                    dataset__annotation_campaigns__id=campaign_id
+                ).count(),
+                assigned_files_count=file_range_model.objects.filter(
+                    annotation_campaign_id=campaign_id
+                ).aggregate(total=Sum("files_count"))["total"]
+                or 0,
+                finished_tasks_count=task_model.objects.filter(
+                    annotation_campaign_id=campaign_id, status="F"
+                ).count(),
+            )
+            for campaign_id in campaign_model.objects.values_list("id", flat=True)
+        ]
+    )
+
+    counters = {}
+    for campaign_id, annotator_id, total in (
+        # Models default ordering would be added to the GROUP BY
+        file_range_model.objects.order_by()
+        .values("annotation_campaign_id", "annotator_id")
+        .annotate(total=Sum("files_count"))
+        .values_list("annotation_campaign_id", "annotator_id", "total")
+    ):
+        counters[(campaign_id, annotator_id)] = {"assigned_files_count": total}
+    for campaign_id, annotator_id, total in (
+        task_model.objects.filter(status="F")
+        .order_by()
+        .values("annotation_campaign_id", "annotator_id")
+        .annotate(total=Count("id"))
+        .values_list("annotation_campaign_id", "annotator_id", "total")
+    ):
+        counters.setdefault((campaign_id, annotator_id), {})[
+            "finished_tasks_count"
+        ] = total
+    annotator_progress_model.objects.bulk_create(
+        [
+            annotator_progress_model(
+                annotation_campaign_id=campaign_id,
+                annotator_id=annotator_id,
+                **values,
+            )
+            for (campaign_id, annotator_id), values in counters.items()
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0075_dataset_related_channel_configuration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnnotationCampaignProgress",
+            fields=[
+                (
+                    "assigned_files_count",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Number of files in the annotation file ranges",
+                    ),
+                ),
+                (
+                    "finished_tasks_count",
+                    models.IntegerField(
+                        default=0, help_text="Number of finished annotation tasks"
+                    ),
+                ),
+                (
+                    "annotation_campaign",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="progress_counter",
+                        serialize=False,
+                        to="api.annotationcampaign",
+                    ),
+                ),
+                (
+                    "files_count",
+                    models.IntegerField(
+                        default=0, help_text="Number of files in the campaign datasets"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "annotation_campaign_progress",
+            },
+        ),
+        migrations.CreateModel(
+            name="AnnotationCampaignAnnotatorProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "assigned_files_count",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Number of files in the annotation file ranges",
+                    ),
+                ),
+                (
+                    "finished_tasks_count",
+                    models.IntegerField(
+                        default=0, help_text="Number of finished annotation tasks"
+                    ),
+                ),
+                (
+                    "annotation_campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="annotator_progress_counters",
+                        to="api.annotationcampaign",
+                    ),
+                ),
+                (
+                    "annotator",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="annotation_progress_counters",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "annotation_campaign_annotator_progress",
+                "unique_together": {("annotation_campaign", "annotator")},
+            },
+        ),
+        migrations.RunPython(fill_progress, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,124 @@
+# Generated by Django 3.2.25 on 2026-10-18 01:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0076_annotation_campaign_progress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DatasetImportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "status",
+                    models.TextField(
+                        choices=[
+                            ("P", "Pending"),
+                            ("R", "Running"),
+                            ("S", "Success"),
+                            ("F", "Failure"),
+                        ],
+                        default="P",
+                    ),
+                ),
+                (
+                    "errors",
+                    models.JSONField(
+                        blank=True,
+                        help_text="Errors which are not related to a dataset",
+                        null=True,
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "dataset_import_jobs",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DatasetImportJobDataset",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                (
+                    "csv_data",
+                    models.JSONField(help_text="Dataset row from datasets.csv"),
+                ),
+                (
+                    "status",
+                    models.TextField(
+                        choices=[
+                            ("P", "Pending"),
+                            ("R", "Running"),
+                            ("S", "Success"),
+                            ("F", "Failure"),
+                        ],
+                        default="P",
+                    ),
+                ),
+                ("imported_files_count", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True, null=True)),
+                (
+                    "dataset",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="api.dataset",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="datasets",
+                        to="api.datasetimportjob",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "dataset_import_job_datasets",
+                "ordering": ["name"],
+            },
+        ),
+    ]
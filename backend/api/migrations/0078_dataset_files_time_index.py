@@ -0,0 +1,20 @@
+# Generated by Django 3.2.25 on 2026-10-18 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0077_dataset_import_job"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="datasetfile",
+            index=models.Index(
+                fields=["dataset", "start", "end"],
+                name="dataset_fil_dataset_7c91f9_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,137 @@
+# Generated by Django 3.2.25 on 2026-10-18 01:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0078_dataset_files_time_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DetectionImport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "status",
+                    models.TextField(
+                        choices=[
+                            ("P", "Pending"),
+                            ("R", "Running"),
+                            ("S", "Success"),
+                            ("F", "Failure"),
+                        ],
+                        default="P",
+                    ),
+                ),
+                ("dataset_name", models.CharField(max_length=255)),
+                (
+                    "detectors_map",
+                    models.JSONField(
+                        help_text="Detectors and configurations of the imported CSV annotators"
+                    ),
+                ),
+                (
+                    "force",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Ignore detections which don't belong to any file of the dataset",
+                    ),
+                ),
+                ("rows_count", models.PositiveIntegerField(default=0)),
+                (
+                    "processed_rows_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of rows already processed, including rejected ones",
+                    ),
+                ),
+                ("rejected_rows_count", models.PositiveIntegerField(default=0)),
+                ("imported_results_count", models.PositiveIntegerField(default=0)),
+                (
+                    "error",
+                    models.TextField(
+                        blank=True,
+                        help_text="Unexpected error which stopped the import",
+                        null=True,
+                    ),
+                ),
+                (
+                    "annotation_campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="detection_imports",
+                        to="api.annotationcampaign",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "detection_imports",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DetectionImportRow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "index",
+                    models.PositiveIntegerField(
+                        help_text="Index of the row in the CSV"
+                    ),
+                ),
+                ("data", models.JSONField()),
+                ("errors", models.JSONField(blank=True, null=True)),
+                (
+                    "detection_import",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rows",
+                        to="api.detectionimport",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "detection_import_rows",
+                "ordering": ["index"],
+                "unique_together": {("detection_import", "index")},
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 3.2.25 on 2026-10-18 02:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_campaign_files(apps, schema_editor):
+    campaign_model = apps.get_model("api", "AnnotationCampaign")
+    campaign_file_model = apps.get_model("api", "AnnotationCampaignFile")
+    dataset_file_model = apps.get_model("api", "DatasetFile")
+    for campaign_id in campaign_model.objects.values_list("id", flat=True):
+        campaign_file_model.objects.bulk_create(
+            (
+                campaign_file_model(
+                    annotation_campaign_id=campaign_id,
+                    dataset_file_id=file_id,
+                    index=index,
+                )
+                for index, file_id in enumerate(
+                    dataset_file_model.objects.filter(
+                        dataset__annotation_campaigns__id=campaign_id
+                    )
+                    .order_by("start", "id")
+                    .values_list("id", flat=True)
+                    .iterator()
+                )
+            ),
+            batch_size=5000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0079_detection_import"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnnotationCampaignFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveIntegerField()),
+                (
+                    "annotation_campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sorted_files",
+                        to="api.annotationcampaign",
+                    ),
+                ),
+                (
+                    "dataset_file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="campaign_positions",
+                        to="api.datasetfile",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "annotation_campaign_files",
+                "ordering": ["annotation_campaign", "index"],
+                "unique_together": {
+                    ("annotation_campaign", "dataset_file"),
+                    ("annotation_campaign", "index"),
+                },
+            },
+        ),
+        migrations.RunPython(
+            fill_campaign_files, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 3.2.25 on 2026-10-18 02:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def outdate_files_states(apps, schema_editor):
+    # States are computed when the campaign files are listed for the first time
+    progress_model = apps.get_model("api", "AnnotationCampaignProgress")
+    progress_model.objects.update(files_states_outdated=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0080_campaign_files_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="annotationcampaignfile",
+            name="detections_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of detectors results on the file"
+            ),
+        ),
+        migrations.AddField(
+            model_name="annotationcampaignprogress",
+            name="files_states_outdated",
+            field=models.BooleanField(
+                default=False,
+                help_text="Files states of the annotators must be recomputed (see AnnotationCampaignAnnotatorFile)",
+            ),
+        ),
+        migrations.CreateModel(
+            name="AnnotationCampaignAnnotatorFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("is_submitted", models.BooleanField(default=False)),
+                (
+                    "results_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of results of the annotator on the file",
+                    ),
+                ),
+                (
+                    "annotation_campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="annotator_files",
+                        to="api.annotationcampaign",
+                    ),
+                ),
+                (
+                    "annotator",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="annotation_campaign_files",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "dataset_file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="annotator_states",
+                        to="api.datasetfile",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "annotation_campaign_annotator_files",
+                "unique_together": {
+                    ("annotation_campaign", "annotator", "dataset_file")
+                },
+            },
+        ),
+        migrations.RunPython(
+            outdate_files_states, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-18 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0081_campaign_annotator_files"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="annotationfilerange",
+            index=models.Index(
+                fields=[
+                    "annotation_campaign",
+                    "annotator",
+                    "first_file_id",
+                    "last_file_id",
+                ],
+                name="api_annotat_annotat_634dde_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-18 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0082_file_range_bounds_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="annotationsession",
+            name="session_output",
+            field=models.JSONField(
+                blank=True,
+                help_text="Submitted results and comments, cleared on old sessions to limit storage",
+                null=True,
+            ),
+        ),
+    ]
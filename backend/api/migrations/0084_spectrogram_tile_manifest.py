@@ -0,0 +1,61 @@
+# Generated by Django 3.2.25 on 2026-10-18 02:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0083_session_output_retention"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SpectrogramTileManifest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("files_count", models.PositiveIntegerField(default=0)),
+                (
+                    "tiles_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of expected tiles"
+                    ),
+                ),
+                ("missing_tiles_count", models.PositiveIntegerField(default=0)),
+                (
+                    "missing_tiles",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Missing tiles by tile name: '*' when the file has no tile at all, else the list of missing tiles filenames",
+                    ),
+                ),
+                (
+                    "spectrogram_configuration",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tile_manifest",
+                        to="api.spectrogramconfiguration",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "spectrogram_tile_manifests",
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0084_spectrogram_tile_manifest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dataset",
+            name="spectro_configs_fingerprint",
+            field=models.CharField(
+                blank=True,
+                help_text="Fingerprint of the spectrogram folders the configurations were last synced from",
+                max_length=64,
+                null=True,
+            ),
+        ),
+    ]
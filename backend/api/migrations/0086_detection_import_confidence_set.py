@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0085_dataset_spectro_configs_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="detectionimport",
+            name="has_confidence_set",
+            field=models.BooleanField(
+                default=False,
+                help_text="The campaign had a confidence set when the import was created, all chunks validate the rows against this state",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0086_detection_import_confidence_set"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="datasetimportjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last progress of the running job, it is considered stopped when it gets old",
+                null=True,
+            ),
+        ),
+    ]
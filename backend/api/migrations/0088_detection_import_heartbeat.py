@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0087_dataset_import_job_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="detectionimport",
+            name="heartbeat_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last progress of the running import, it is considered stopped when it gets old",
+                null=True,
+            ),
+        ),
+    ]
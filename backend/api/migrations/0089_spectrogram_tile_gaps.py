@@ -0,0 +1,125 @@
+# Generated by Django 3.2.25 on 2026-10-18 04:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_tile_gaps(apps, schema_editor):
+    manifest_model = apps.get_model("api", "SpectrogramTileManifest")
+    gap_model = apps.get_model("api", "SpectrogramTileGap")
+    dataset_file_model = apps.get_model("api", "DatasetFile")
+    for manifest in manifest_model.objects.select_related("spectrogram_configuration"):
+        configuration = manifest.spectrogram_configuration
+
+        def get_gaps():
+            for file_id, filename in (
+                dataset_file_model.objects.filter(dataset_id=configuration.dataset_id)
+                .values_list("id", "filename")
+                .iterator()
+            ):
+                tile_name = filename.split(".")[0]
+                missing = manifest.missing_tiles.get(tile_name)
+                if not missing:
+                    continue
+                tiles = [
+                    f"{tile_name}_{2**zoom_power}_{zoom_tile}.png"
+                    for zoom_power in range(0, configuration.zoom_level + 1)
+                    for zoom_tile in range(0, 2**zoom_power)
+                ]
+                ranges = []
+                for index, tile in enumerate(tiles):
+                    if missing != "*" and tile not in missing:
+                        continue
+                    if ranges and ranges[-1][1] == index - 1:
+                        ranges[-1][1] = index
+                    else:
+                        ranges.append([index, index])
+                if ranges:
+                    yield gap_model(
+                        manifest_id=manifest.id,
+                        dataset_file_id=file_id,
+                        missing_tiles_count=sum(
+                            last - first + 1 for first, last in ranges
+                        ),
+                        missing_ranges=ranges,
+                    )
+
+        gap_model.objects.bulk_create(get_gaps(), batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0088_detection_import_heartbeat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="datasetimportjobdataset",
+            name="missing_tiles_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Spectrogram tiles of the imported files not found on disk",
+            ),
+        ),
+        migrations.AddField(
+            model_name="spectrogramtilemanifest",
+            name="image_folder_modified_at",
+            field=models.BigIntegerField(
+                blank=True,
+                help_text="Modification time of the image folder when it was read, in nanoseconds",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="SpectrogramTileGap",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("missing_tiles_count", models.PositiveIntegerField()),
+                (
+                    "missing_ranges",
+                    models.JSONField(
+                        help_text="Ranges [first, last] of the missing tiles indexes in the zoom tiles of the file"
+                    ),
+                ),
+                (
+                    "dataset_file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tile_gaps",
+                        to="api.datasetfile",
+                    ),
+                ),
+                (
+                    "manifest",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="gaps",
+                        to="api.spectrogramtilemanifest",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "spectrogram_tile_gaps",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="spectrogramtilegap",
+            constraint=models.UniqueConstraint(
+                fields=("manifest", "dataset_file"), name="spectrogram_tile_gap_unicity"
+            ),
+        ),
+        migrations.RunPython(fill_tile_gaps, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="spectrogramtilemanifest",
+            name="missing_tiles",
+        ),
+    ]
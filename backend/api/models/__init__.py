@@ -4,6 +4,11 @@ from backend.api.models.datasets import (
     DatasetType,
     Dataset,
     DatasetFile,
+    DatasetFileInterval,
+    DatasetFilesIndex,
+    clear_dataset_files_indexes,
+    DatasetImportJob,
+    DatasetImportJobDataset,
 )
 from backend.api.models.metadata import (
     AudioMetadatum,
@@ -4,6 +4,7 @@ from .campaign import (
     AnnotationCampaignArchive,
     AnnotationCampaignUsage,
 )
+from .campaign_file import AnnotationCampaignFile, AnnotationCampaignAnnotatorFile
 from .confidence import (
     ConfidenceIndicator,
     ConfidenceIndicatorSet,
@@ -13,10 +14,18 @@ from .detector import (
     Detector,
     DetectorConfiguration,
 )
+from .detection_import import (
+    DetectionImport,
+    DetectionImportRow,
+)
 from .label import (
     Label,
     LabelSet,
 )
+from .progress import (
+    AnnotationCampaignProgress,
+    AnnotationCampaignAnnotatorProgress,
+)
 from .result import (
     AnnotationResult,
     AnnotationResultValidation,
@@ -1,5 +1,5 @@
 """Campaign related models"""
-from typing import Optional
+from typing import Iterable, Optional
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -109,6 +109,21 @@ class AnnotationCampaign(models.Model):
             dataset_id__in=self.datasets.values_list("id", flat=True)
         ).order_by("start", "id")
 
+    def get_file_ids(self, indexes: Iterable[int]) -> dict[int, int]:
+        """Get the ids of the files at the given positions in the sorted files"""
+        indexes = set(indexes)
+        file_ids = dict(
+            self.sorted_files.filter(index__in=indexes).values_list(
+                "index", "dataset_file_id"
+            )
+        )
+        # Positions which are not indexed yet
+        for index in indexes - file_ids.keys():
+            file_ids[index] = self.get_sorted_files().values_list("id", flat=True)[
+                index
+            ]
+        return file_ids
+
 
 @receiver(
     signal=signals.m2m_changed,
@@ -0,0 +1,282 @@
+"""Campaign files ordering and state models"""
+from collections import Counter, defaultdict
+from itertools import islice
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import signals, Count, F, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.dispatch import receiver
+
+from .campaign import AnnotationCampaign
+from .progress import AnnotationCampaignProgress
+from .result import AnnotationResult
+from .tasks import AnnotationTask, tasks_deleted
+from ..datasets import DatasetFile
+
+INDEX_BATCH_SIZE = 5000
+
+
+class AnnotationCampaignFile(models.Model):
+    """
+    Position of a dataset file in the sorted files of a campaign (see AnnotationCampaign.get_sorted_files).
+    The index matches the file ranges first_file_index and last_file_index, so that moving through
+    the files of an annotator only needs keyed lookups on (annotation_campaign, index).
+    """
+
+    class Meta:
+        db_table = "annotation_campaign_files"
+        ordering = ["annotation_campaign", "index"]
+        unique_together = (
+            ("annotation_campaign", "index"),
+            ("annotation_campaign", "dataset_file"),
+        )
+
+    annotation_campaign = models.ForeignKey(
+        AnnotationCampaign, on_delete=models.CASCADE, related_name="sorted_files"
+    )
+    dataset_file = models.ForeignKey(
+        DatasetFile, on_delete=models.CASCADE, related_name="campaign_positions"
+    )
+    index = models.PositiveIntegerField()
+    detections_count = models.PositiveIntegerField(
+        default=0, help_text="Number of detectors results on the file"
+    )
+
+    @staticmethod
+    @transaction.atomic
+    def refresh(campaign_id: int):
+        """Recompute the position and the detections count of all files of the given campaign"""
+        AnnotationCampaignFile.objects.filter(
+            annotation_campaign_id=campaign_id
+        ).delete()
+        detections_counts = dict(
+            AnnotationResult.objects.filter(
+                annotation_campaign_id=campaign_id,
+                detector_configuration__isnull=False,
+            )
+            .values("dataset_file_id")
+            .annotate(total=Count("id"))
+            .values_list("dataset_file_id", "total")
+        )
+        file_ids = (
+            DatasetFile.objects.filter(dataset__annotation_campaigns__id=campaign_id)
+            .order_by("start", "id")
+            .values_list("id", flat=True)
+            .iterator(chunk_size=INDEX_BATCH_SIZE)
+        )
+        index = 0
+        while batch := list(islice(file_ids, INDEX_BATCH_SIZE)):
+            AnnotationCampaignFile.objects.bulk_create(
+                AnnotationCampaignFile(
+                    annotation_campaign_id=campaign_id,
+                    dataset_file_id=file_id,
+                    index=index + batch_index,
+                    detections_count=detections_counts.get(file_id, 0),
+                )
+                for batch_index, file_id in enumerate(batch)
+            )
+            index += len(batch)
+
+    @staticmethod
+    def get_index(campaign_id: int, file_id: int) -> Optional[int]:
+        """Get the position of the file in the campaign, index the campaign files if it was never done"""
+        positions = AnnotationCampaignFile.objects.filter(
+            annotation_campaign_id=campaign_id
+        )
+        index = (
+            positions.filter(dataset_file_id=file_id)
+            .values_list("index", flat=True)
+            .first()
+        )
+        if index is None and not positions.exists():
+            AnnotationCampaignFile.refresh(campaign_id)
+            index = (
+                positions.filter(dataset_file_id=file_id)
+                .values_list("index", flat=True)
+                .first()
+            )
+        return index
+
+    @staticmethod
+    def add_detections(campaign_id: int, results: Iterable[AnnotationResult]):
+        """Count new detectors results, to use after they are bulk created"""
+        counts = Counter(
+            result.dataset_file_id
+            for result in results
+            if result.detector_configuration_id is not None
+        )
+        files_by_count: dict[int, list[int]] = defaultdict(list)
+        for file_id, count in counts.items():
+            files_by_count[count].append(file_id)
+        for count, file_ids in files_by_count.items():
+            AnnotationCampaignFile.objects.filter(
+                annotation_campaign_id=campaign_id, dataset_file_id__in=file_ids
+            ).update(detections_count=F("detections_count") + count)
+
+
+class AnnotationCampaignAnnotatorFile(models.Model):
+    """
+    Materialized state of a file for an annotator within a campaign.
+    It avoids aggregating tasks and results each time the annotator files are listed.
+    Detectors results are shared by all annotators, they are counted on AnnotationCampaignFile.
+    """
+
+    class Meta:
+        db_table = "annotation_campaign_annotator_files"
+        unique_together = (("annotation_campaign", "annotator", "dataset_file"),)
+
+    annotation_campaign = models.ForeignKey(
+        AnnotationCampaign, on_delete=models.CASCADE, related_name="annotator_files"
+    )
+    annotator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="annotation_campaign_files",
+    )
+    dataset_file = models.ForeignKey(
+        DatasetFile, on_delete=models.CASCADE, related_name="annotator_states"
+    )
+    is_submitted = models.BooleanField(default=False)
+    results_count = models.PositiveIntegerField(
+        default=0, help_text="Number of results of the annotator on the file"
+    )
+
+    @staticmethod
+    @transaction.atomic
+    def refresh(campaign_id: int):
+        """Recompute the state of all files of the given campaign, to use after bulk operations"""
+        AnnotationCampaignFile.refresh(campaign_id)
+        AnnotationCampaignAnnotatorFile.objects.filter(
+            annotation_campaign_id=campaign_id
+        ).delete()
+        results_counts = dict(
+            (
+                (annotator_id, file_id),
+                total,
+            )
+            for annotator_id, file_id, total in AnnotationResult.objects.filter(
+                annotation_campaign_id=campaign_id, annotator__isnull=False
+            )
+            .values("annotator_id", "dataset_file_id")
+            .annotate(total=Count("id"))
+            .values_list("annotator_id", "dataset_file_id", "total")
+        )
+        submitted = set(
+            AnnotationTask.objects.filter(
+                annotation_campaign_id=campaign_id,
+                status=AnnotationTask.Status.FINISHED,
+            ).values_list("annotator_id", "dataset_file_id")
+        )
+        AnnotationCampaignAnnotatorFile.objects.bulk_create(
+            (
+                AnnotationCampaignAnnotatorFile(
+                    annotation_campaign_id=campaign_id,
+                    annotator_id=annotator_id,
+                    dataset_file_id=file_id,
+                    is_submitted=(annotator_id, file_id) in submitted,
+                    results_count=results_counts.get((annotator_id, file_id), 0),
+                )
+                for annotator_id, file_id in set(results_counts) | submitted
+            ),
+            batch_size=INDEX_BATCH_SIZE,
+        )
+        AnnotationCampaignProgress.objects.filter(
+            annotation_campaign_id=campaign_id
+        ).update(files_states_outdated=False)
+
+    @staticmethod
+    def refresh_if_outdated(campaign_id: int):
+        """Recompute the campaign files states if they were never computed, eg: loaded from fixtures"""
+        if AnnotationCampaignProgress.objects.filter(
+            annotation_campaign_id=campaign_id, files_states_outdated=True
+        ).exists():
+            AnnotationCampaignAnnotatorFile.refresh(campaign_id)
+
+    @staticmethod
+    def refresh_results_count(campaign_id: int, annotator_id: int, file_id: int):
+        """Recompute the results counts of a file, to use after the annotator results are updated"""
+        results = AnnotationResult.objects.filter(
+            annotation_campaign_id=campaign_id, dataset_file_id=file_id
+        )
+        AnnotationCampaignAnnotatorFile.objects.update_or_create(
+            annotation_campaign_id=campaign_id,
+            annotator_id=annotator_id,
+            dataset_file_id=file_id,
+            defaults={
+                "results_count": results.filter(annotator_id=annotator_id).count()
+            },
+        )
+        # Annotators can update detectors results
+        AnnotationCampaignFile.objects.filter(
+            annotation_campaign_id=campaign_id, dataset_file_id=file_id
+        ).update(
+            detections_count=results.filter(
+                detector_configuration__isnull=False
+            ).count()
+        )
+
+    @staticmethod
+    def annotate_files(
+        files: QuerySet[DatasetFile], campaign_id: int, annotator_id: int
+    ) -> QuerySet[DatasetFile]:
+        """Annotate files with their is_submitted and results_count for the annotator"""
+        states = AnnotationCampaignAnnotatorFile.objects.filter(
+            annotation_campaign_id=campaign_id,
+            annotator_id=annotator_id,
+            dataset_file_id=OuterRef("pk"),
+        )
+        detections = AnnotationCampaignFile.objects.filter(
+            annotation_campaign_id=campaign_id,
+            dataset_file_id=OuterRef("pk"),
+        )
+        return files.annotate(
+            is_submitted=Coalesce(
+                Subquery(states.values("is_submitted")[:1]), Value(False)
+            ),
+            results_count=Coalesce(Subquery(states.values("results_count")[:1]), 0)
+            + Coalesce(Subquery(detections.values("detections_count")[:1]), 0),
+        )
+
+
+@receiver(signal=signals.m2m_changed, sender=AnnotationCampaign.datasets.through)
+def update_campaign_files_index(sender, **kwargs):
+    """Recompute the campaign files positions when its datasets change"""
+    # pylint: disable=unused-argument
+    if kwargs.get("action") not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not kwargs.get("reverse"):
+        AnnotationCampaignFile.refresh(kwargs["instance"].id)
+    else:
+        for campaign_id in kwargs.get("pk_set") or []:
+            AnnotationCampaignFile.refresh(campaign_id)
+
+
+@receiver(signal=signals.post_save, sender=AnnotationTask)
+def update_state_on_task_save(sender, instance: AnnotationTask, **kwargs):
+    """Keep the file submitted state of the annotator"""
+    # pylint: disable=unused-argument
+    if kwargs.get("raw"):
+        return
+    AnnotationCampaignAnnotatorFile.objects.update_or_create(
+        annotation_campaign_id=instance.annotation_campaign_id,
+        annotator_id=instance.annotator_id,
+        dataset_file_id=instance.dataset_file_id,
+        defaults={"is_submitted": instance.status == AnnotationTask.Status.FINISHED},
+    )
+
+
+@receiver(signal=tasks_deleted, sender=AnnotationTask)
+def update_state_on_tasks_delete(sender, tasks: list[tuple], **kwargs):
+    """Unsubmit the files of deleted tasks, once per annotator"""
+    # pylint: disable=unused-argument
+    files = defaultdict(list)
+    for campaign_id, annotator_id, file_id, _ in tasks:
+        files[(campaign_id, annotator_id)].append(file_id)
+    for (campaign_id, annotator_id), file_ids in files.items():
+        AnnotationCampaignAnnotatorFile.objects.filter(
+            annotation_campaign_id=campaign_id,
+            annotator_id=annotator_id,
+            dataset_file_id__in=file_ids,
+        ).update(is_submitted=False)
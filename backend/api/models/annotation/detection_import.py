@@ -0,0 +1,84 @@
+"""Detection import sessions models"""
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .campaign import AnnotationCampaign
+
+
+class DetectionImport(models.Model):
+    # pylint: disable=duplicate-code
+    """
+    Import of a detections CSV into a campaign, processed in background by committed chunks.
+    Rows are stored on upload so that an interrupted import can be resumed where it stopped.
+    """
+
+    class Status(models.TextChoices):
+        """Status of a detection import"""
+
+        PENDING = ("P", "Pending")
+        RUNNING = ("R", "Running")
+        SUCCESS = ("S", "Success")
+        FAILURE = ("F", "Failure")
+
+    class Meta:
+        db_table = "detection_imports"
+        ordering = ["-created_at"]
+
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    status = models.TextField(choices=Status.choices, default=Status.PENDING)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    annotation_campaign = models.ForeignKey(
+        AnnotationCampaign, on_delete=models.CASCADE, related_name="detection_imports"
+    )
+    dataset_name = models.CharField(max_length=255)
+    detectors_map = models.JSONField(
+        help_text="Detectors and configurations of the imported CSV annotators"
+    )
+    force = models.BooleanField(
+        default=False,
+        help_text="Ignore detections which don't belong to any file of the dataset",
+    )
+    has_confidence_set = models.BooleanField(
+        default=False,
+        help_text="The campaign had a confidence set when the import was created, "
+        "all chunks validate the rows against this state",
+    )
+
+    rows_count = models.PositiveIntegerField(default=0)
+    processed_rows_count = models.PositiveIntegerField(
+        default=0, help_text="Number of rows already processed, including rejected ones"
+    )
+    rejected_rows_count = models.PositiveIntegerField(default=0)
+    imported_results_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(
+        null=True, blank=True, help_text="Unexpected error which stopped the import"
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last progress of the running import, it is considered stopped when it gets old",
+    )
+
+    @property
+    def remaining_rows_count(self) -> int:
+        """Number of rows which are not processed yet"""
+        return self.rows_count - self.processed_rows_count
+
+
+class DetectionImportRow(models.Model):
+    """Uploaded row of a detection import, kept with its errors when rejected"""
+
+    class Meta:
+        db_table = "detection_import_rows"
+        ordering = ["index"]
+        unique_together = (("detection_import", "index"),)
+
+    detection_import = models.ForeignKey(
+        DetectionImport, on_delete=models.CASCADE, related_name="rows"
+    )
+    index = models.PositiveIntegerField(help_text="Index of the row in the CSV")
+    data = models.JSONField()
+    errors = models.JSONField(null=True, blank=True)
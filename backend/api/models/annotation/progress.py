@@ -0,0 +1,253 @@
+"""Campaign progress counters models"""
+from collections import Counter
+from typing import Optional
+
+from django.conf import settings
+from django.db import models, transaction, IntegrityError
+from django.db.models import signals, F, Sum, Count
+from django.dispatch import receiver
+
+from .campaign import AnnotationCampaign
+from .tasks import AnnotationTask, AnnotationFileRange, tasks_deleted
+from ..datasets import DatasetFile
+
+
+class AnnotationProgressCounter(models.Model):
+    """Common progress counters"""
+
+    class Meta:
+        abstract = True
+
+    assigned_files_count = models.IntegerField(
+        default=0, help_text="Number of files in the annotation file ranges"
+    )
+    finished_tasks_count = models.IntegerField(
+        default=0, help_text="Number of finished annotation tasks"
+    )
+
+
+class AnnotationCampaignProgress(AnnotationProgressCounter):
+    """
+    Materialized progress of a campaign, kept up to date when tasks and file ranges change.
+    It avoids counting tasks and files each time campaigns are listed.
+    """
+
+    class Meta:
+        db_table = "annotation_campaign_progress"
+
+    annotation_campaign = models.OneToOneField(
+        AnnotationCampaign,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="progress_counter",
+    )
+    files_count = models.IntegerField(
+        default=0, help_text="Number of files in the campaign datasets"
+    )
+    files_states_outdated = models.BooleanField(
+        default=False,
+        help_text="Files states of the annotators must be recomputed (see AnnotationCampaignAnnotatorFile)",
+    )
+
+    @staticmethod
+    def refresh(campaign_id: int):
+        """Recompute all counters of the given campaign, to use after bulk operations"""
+        campaign_files = DatasetFile.objects.filter(
+            dataset__annotation_campaigns__id=campaign_id
+        )
+        ranges = AnnotationFileRange.objects.filter(annotation_campaign_id=campaign_id)
+        finished_tasks = AnnotationTask.objects.filter(
+            annotation_campaign_id=campaign_id,
+            status=AnnotationTask.Status.FINISHED,
+        )
+        AnnotationCampaignProgress.objects.update_or_create(
+            annotation_campaign_id=campaign_id,
+            defaults={
+                "files_count": campaign_files.count(),
+                "assigned_files_count": ranges.aggregate(total=Sum("files_count"))[
+                    "total"
+                ]
+                or 0,
+                "finished_tasks_count": finished_tasks.count(),
+            },
+        )
+
+        assigned = dict(
+            ranges.order_by()
+            .values("annotator_id")
+            .annotate(total=Sum("files_count"))
+            .values_list("annotator_id", "total")
+        )
+        finished = dict(
+            finished_tasks.order_by()
+            .values("annotator_id")
+            .annotate(total=Count("id"))
+            .values_list("annotator_id", "total")
+        )
+        AnnotationCampaignAnnotatorProgress.objects.filter(
+            annotation_campaign_id=campaign_id
+        ).delete()
+        AnnotationCampaignAnnotatorProgress.objects.bulk_create(
+            [
+                AnnotationCampaignAnnotatorProgress(
+                    annotation_campaign_id=campaign_id,
+                    annotator_id=annotator_id,
+                    assigned_files_count=assigned.get(annotator_id, 0),
+                    finished_tasks_count=finished.get(annotator_id, 0),
+                )
+                for annotator_id in set(assigned) | set(finished)
+            ]
+        )
+
+    @staticmethod
+    def refresh_files_count(campaign_ids: list[int]):
+        """Recompute the number of files of the given campaigns"""
+        for campaign_id in campaign_ids:
+            AnnotationCampaignProgress.objects.update_or_create(
+                annotation_campaign_id=campaign_id,
+                defaults={
+                    "files_count": DatasetFile.objects.filter(
+                        dataset__annotation_campaigns__id=campaign_id
+                    ).count()
+                },
+            )
+
+
+class AnnotationCampaignAnnotatorProgress(AnnotationProgressCounter):
+    """Materialized progress of an annotator within a campaign"""
+
+    class Meta:
+        db_table = "annotation_campaign_annotator_progress"
+        unique_together = (("annotation_campaign", "annotator"),)
+
+    annotation_campaign = models.ForeignKey(
+        AnnotationCampaign,
+        on_delete=models.CASCADE,
+        related_name="annotator_progress_counters",
+    )
+    annotator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="annotation_progress_counters",
+    )
+
+
+def _increment(model, lookup: dict, **deltas: int):
+    """Add the given deltas to the counters found with lookup, create them if they don't exist yet"""
+    if not any(deltas.values()):
+        return
+    if model.objects.filter(**lookup).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    ):
+        return
+    if not any(delta > 0 for delta in deltas.values()):
+        # Counters are being removed with their campaign
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+
+
+def update_progress(
+    campaign_id: int,
+    annotator_id: int,
+    assigned_files_count: int = 0,
+    finished_tasks_count: int = 0,
+):
+    """Apply counters changes on both campaign and annotator progress"""
+    deltas = {
+        "assigned_files_count": assigned_files_count,
+        "finished_tasks_count": finished_tasks_count,
+    }
+    _increment(
+        AnnotationCampaignProgress, {"annotation_campaign_id": campaign_id}, **deltas
+    )
+    _increment(
+        AnnotationCampaignAnnotatorProgress,
+        {"annotation_campaign_id": campaign_id, "annotator_id": annotator_id},
+        **deltas,
+    )
+
+
+@receiver(signal=signals.post_save, sender=AnnotationCampaign)
+def create_campaign_progress(sender, instance: AnnotationCampaign, **kwargs):
+    """Create campaign progress with the campaign"""
+    # pylint: disable=unused-argument
+    if kwargs.get("created"):
+        AnnotationCampaignProgress.objects.get_or_create(
+            annotation_campaign_id=instance.id,
+            # Related data loaded from fixtures don't send usual signals
+            defaults={"files_states_outdated": bool(kwargs.get("raw"))},
+        )
+
+
+@receiver(signal=signals.m2m_changed, sender=AnnotationCampaign.datasets.through)
+def update_campaign_files_count(sender, **kwargs):
+    """Update campaign files count when its datasets change"""
+    # pylint: disable=unused-argument
+    if kwargs.get("action") not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not kwargs.get("reverse"):
+        AnnotationCampaignProgress.refresh_files_count([kwargs["instance"].id])
+    elif kwargs.get("pk_set"):
+        AnnotationCampaignProgress.refresh_files_count(list(kwargs["pk_set"]))
+
+
+@receiver(signal=signals.post_save, sender=AnnotationTask)
+def update_progress_on_task_save(sender, instance: AnnotationTask, **kwargs):
+    """Count task status changes"""
+    # pylint: disable=unused-argument, protected-access
+    previous_status: Optional[str] = (
+        None if kwargs.get("created") else instance._loaded_status
+    )
+    was_finished = previous_status == AnnotationTask.Status.FINISHED
+    is_finished = instance.status == AnnotationTask.Status.FINISHED
+    instance._loaded_status = instance.status
+    update_progress(
+        instance.annotation_campaign_id,
+        instance.annotator_id,
+        finished_tasks_count=int(is_finished) - int(was_finished),
+    )
+
+
+@receiver(signal=tasks_deleted, sender=AnnotationTask)
+def update_progress_on_tasks_delete(sender, tasks: list[tuple], **kwargs):
+    """Uncount deleted finished tasks, once per annotator"""
+    # pylint: disable=unused-argument
+    finished = Counter(
+        (campaign_id, annotator_id)
+        for campaign_id, annotator_id, _, status in tasks
+        if status == AnnotationTask.Status.FINISHED
+    )
+    for (campaign_id, annotator_id), count in finished.items():
+        update_progress(campaign_id, annotator_id, finished_tasks_count=-count)
+
+
+@receiver(signal=signals.post_save, sender=AnnotationFileRange)
+def update_progress_on_range_save(sender, instance: AnnotationFileRange, **kwargs):
+    """Count file range changes"""
+    # pylint: disable=unused-argument, protected-access
+    key = (instance.annotation_campaign_id, instance.annotator_id)
+    files_count = instance.files_count
+    previous = None if kwargs.get("created") else instance._loaded_progress
+    if previous is not None and previous[:2] == key:
+        files_count -= previous[2]
+    elif previous is not None:
+        update_progress(*previous[:2], assigned_files_count=-previous[2])
+    update_progress(*key, assigned_files_count=files_count)
+    instance._loaded_progress = (*key, instance.files_count)
+
+
+@receiver(signal=signals.post_delete, sender=AnnotationFileRange)
+def update_progress_on_range_delete(sender, instance: AnnotationFileRange, **kwargs):
+    """Uncount deleted file ranges"""
+    # pylint: disable=unused-argument
+    update_progress(
+        instance.annotation_campaign_id,
+        instance.annotator_id,
+        assigned_files_count=-instance.files_count,
+    )
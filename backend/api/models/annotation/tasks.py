@@ -1,13 +1,19 @@
 """Annotation task related models"""
+from typing import Iterable, Optional
 
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import QuerySet, Q, Subquery, Exists, OuterRef, Func, F
+from django.dispatch import Signal
 
 from .campaign import AnnotationCampaign
 from ..datasets import DatasetFile
 
+# Sent by AnnotationTask.delete_tasks with the deleted tasks values
+# (see AnnotationTask.DELETED_TASK_FIELDS), to update materialized states in bulk
+tasks_deleted = Signal()
+
 
 class AnnotationTask(models.Model):
     """
@@ -40,6 +46,46 @@ class AnnotationTask(models.Model):
         "DatasetFile", on_delete=models.CASCADE, related_name="annotation_tasks"
     )
 
+    # Stored status, used to update campaign progress on save
+    _loaded_status: Optional[str] = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # pylint: disable=protected-access
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    DELETED_TASK_FIELDS = (
+        "annotation_campaign_id",
+        "annotator_id",
+        "dataset_file_id",
+        "status",
+    )
+
+    def delete(self, using=None, keep_parents=False):
+        # Single deletions update materialized states the same way as bulk ones
+        return AnnotationTask.delete_tasks(AnnotationTask.objects.filter(id=self.id))
+
+    @staticmethod
+    def delete_tasks(tasks: QuerySet["AnnotationTask"]) -> tuple[int, dict[str, int]]:
+        """
+        Delete the given tasks without per-row signals,
+        materialized states are updated once for all of them (see tasks_deleted)
+        """
+        deleted = list(
+            tasks.order_by().values_list("id", *AnnotationTask.DELETED_TASK_FIELDS)
+        )
+        if not deleted:
+            return 0, {}
+        result = AnnotationTask.objects.filter(
+            id__in=[values[0] for values in deleted]
+        ).delete()
+        tasks_deleted.send(
+            sender=AnnotationTask, tasks=[values[1:] for values in deleted]
+        )
+        return result
+
 
 class AnnotationFileRange(models.Model):
     """Gives a range of files to annotate by an annotator within a campaign"""
@@ -55,6 +101,16 @@ class AnnotationFileRange(models.Model):
         #          "annotator",
         #      ),
         #  )
+        indexes = [
+            models.Index(
+                fields=[
+                    "annotation_campaign",
+                    "annotator",
+                    "first_file_id",
+                    "last_file_id",
+                ]
+            )
+        ]
 
     first_file_index = models.PositiveIntegerField(validators=[MinValueValidator(0)])
     last_file_index = models.PositiveIntegerField(validators=[MinValueValidator(0)])
@@ -72,22 +128,38 @@ class AnnotationFileRange(models.Model):
         related_name="annotation_file_ranges",
     )
 
+    # Stored campaign, annotator and files count, used to update campaign progress on save
+    _loaded_progress: Optional[tuple[int, int, int]] = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # pylint: disable=protected-access
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_progress = (
+            instance.__dict__.get("annotation_campaign_id"),
+            instance.__dict__.get("annotator_id"),
+            instance.__dict__.get("files_count") or 0,
+        )
+        return instance
+
     def save(self, *args, **kwargs):
         self.files_count = self.last_file_index - self.first_file_index + 1
-        files = DatasetFile.objects.filter(
-            dataset_id__in=self.annotation_campaign.datasets.values_list(
-                "id", flat=True
-            )
+        file_ids = self.annotation_campaign.get_file_ids(
+            [self.first_file_index, self.last_file_index]
         )
-        new_first_file_id = files[self.first_file_index].id
-        new_last_file_id = files[self.last_file_index].id
+        new_first_file_id = file_ids[self.first_file_index]
+        new_last_file_id = file_ids[self.last_file_index]
 
         # When updating: remove tasks not related anymore
         if self.first_file_id is not None and self.last_file_id is not None:
-            self._get_tasks().filter(
-                Q(dataset_file_id__gt=new_last_file_id)
-                | Q(dataset_file_id__lt=new_first_file_id)
-            ).filter(other_range_exist=False).delete()
+            AnnotationTask.delete_tasks(
+                self._get_tasks()
+                .filter(
+                    Q(dataset_file_id__gt=new_last_file_id)
+                    | Q(dataset_file_id__lt=new_first_file_id)
+                )
+                .filter(other_range_exist=False)
+            )
 
         self.first_file_id = new_first_file_id
         self.last_file_id = new_last_file_id
@@ -116,7 +188,7 @@ class AnnotationFileRange(models.Model):
         )
 
     def delete(self, using=None, keep_parents=False):
-        self._get_tasks().filter(other_range_exist=False).delete()
+        AnnotationTask.delete_tasks(self._get_tasks().filter(other_range_exist=False))
         return super().delete(using, keep_parents)
 
     def get_files(self) -> QuerySet[DatasetFile]:
@@ -129,83 +201,17 @@ class AnnotationFileRange(models.Model):
         )
 
     @staticmethod
-    def get_connected_ranges(data):
-        """Recover connected ranges"""
-        return (
-            AnnotationFileRange.objects.filter(
-                annotator_id=data.annotator,
-                annotation_campaign_id=data.annotation_campaign,
-            )
-            .exclude(id=data.id)
-            .filter(
-                # get bigger
-                Q(
-                    first_file_index__lte=data.first_file_index,
-                    last_file_index__gte=data.last_file_index,
-                )
-                # get littler
-                | Q(
-                    first_file_index__gte=data.first_file_index,
-                    last_file_index__lte=data.last_file_index,
-                )
-                # get mixted
-                | Q(
-                    first_file_index__lte=data.first_file_index,
-                    last_file_index__gte=data.first_file_index,
-                    last_file_index__lte=data.last_file_index,
-                )
-                | Q(
-                    first_file_index__gte=data.first_file_index,
-                    first_file_index__lte=data.last_file_index,
-                    last_file_index__gte=data.last_file_index,
-                )
-                # get siblings
-                | Q(first_file_index=data.last_file_index + 1)
-                | Q(last_file_index=data.first_file_index - 1)
-            )
-        )
-
-    @staticmethod
-    def clean_connected_ranges(data: list[dict]):
-        """Clean connected ranges to limit the number of different items"""
-        ids = [file_range["id"] for file_range in data]
-        return_ids = []
-        for range_id in ids:
-            queryset = AnnotationFileRange.objects.filter(id=range_id)
-            if not queryset.exists():
-                continue
-            item = queryset.first()
-            connected_ranges = AnnotationFileRange.get_connected_ranges(item)
-            if connected_ranges.exists():
-                # update connected
-                min_first_index = min(
-                    connected_ranges.order_by("first_file_index")
-                    .first()
-                    .first_file_index,
-                    item.first_file_index,
-                )
-                max_last_index = max(
-                    connected_ranges.order_by("-last_file_index")
-                    .first()
-                    .last_file_index,
-                    item.last_file_index,
-                )
-                instance = connected_ranges.order_by("id").first()
-                duplicates = AnnotationFileRange.objects.filter(
-                    annotator_id=instance.annotator_id,
-                    annotation_campaign_id=instance.annotation_campaign,
-                    first_file_index=min_first_index,
-                    last_file_index=max_last_index,
-                )
-                if duplicates.exists():
-                    instance = duplicates.first()
-                else:
-                    instance.first_file_index = min_first_index
-                    instance.last_file_index = max_last_index
-                    instance.save()
-                return_ids.append(instance.id)
-                connected_ranges.exclude(id=instance.id).delete()
-        return AnnotationFileRange.objects.filter(id__in=return_ids)
+    def is_file_assigned(
+        campaign_id: int, annotator_id: int, file: DatasetFile
+    ) -> bool:
+        """Check the file is in one of the annotator ranges, without loading the ranges files"""
+        return AnnotationFileRange.objects.filter(
+            annotation_campaign_id=campaign_id,
+            annotation_campaign__datasets__id=file.dataset_id,
+            annotator_id=annotator_id,
+            first_file_id__lte=file.id,
+            last_file_id__gte=file.id,
+        ).exists()
 
     @staticmethod
     def get_finished_task_count_query() -> Subquery:
@@ -235,8 +241,33 @@ class AnnotationSession(models.Model):
 
     start = models.DateTimeField()
     end = models.DateTimeField()
-    session_output = models.JSONField()
+    session_output = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Submitted results and comments, cleared on old sessions to limit storage",
+    )
 
     annotation_task = models.ForeignKey(
         AnnotationTask, on_delete=models.CASCADE, related_name="sessions"
     )
+
+    @staticmethod
+    def compact(retention: int, task_ids: Optional[Iterable[int]] = None) -> int:
+        """Clear the output of the sessions older than the latest ones of their task, return the cleared count"""
+        sessions = AnnotationSession.objects.filter(session_output__isnull=False)
+        if task_ids is not None:
+            sessions = sessions.filter(annotation_task_id__in=task_ids)
+        newer_sessions_count = (
+            AnnotationSession.objects.filter(
+                annotation_task_id=OuterRef("annotation_task_id"),
+                id__gt=OuterRef("id"),
+            )
+            .annotate(count=Func(F("id"), function="Count"))
+            .values("count")
+        )
+        outdated_sessions = sessions.annotate(
+            newer_sessions_count=Subquery(newer_sessions_count)
+        ).filter(newer_sessions_count__gte=retention)
+        return AnnotationSession.objects.filter(
+            id__in=outdated_sessions.values("id")
+        ).update(session_output=None)
@@ -1,8 +1,15 @@
 """Dataset-related models"""
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from datetime import datetime
+from itertools import accumulate
+from threading import Lock
+from typing import Iterable, NamedTuple, Optional, Sequence
 
 from django.conf import settings
 from django.db import models
+from django.db.models import signals, Count, Max
+from django.dispatch import receiver
 from django.utils import timezone
 from metadatax.models import ChannelConfiguration
 
@@ -51,6 +58,12 @@ class Dataset(models.Model):
         blank=True,
         help_text="Specific configuration folder used for this dataset",
     )
+    spectro_configs_fingerprint = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text="Fingerprint of the spectrogram folders the configurations were last synced from",
+    )
     status = models.IntegerField()
     files_type = models.CharField(max_length=255)
     start_date = models.DateField(null=True, blank=True)
@@ -72,20 +85,11 @@ class Dataset(models.Model):
 
     def get_files(self, start: datetime, end: datetime):
         """Get dataset files from absolute start and ends"""
-        dataset_files_start = self.files.filter(
-            start__lte=start,
-            end__gte=start,
-        )
-        dataset_files_while = self.files.filter(
-            start__gt=start,
-            end__lt=end,
-        )
-        dataset_files_end = self.files.filter(
-            start__lte=end,
-            end__gte=end,
-        )
-        result = dataset_files_start | dataset_files_while | dataset_files_end
-        return result.order_by("start")
+        return self.files.filter(start__lte=end, end__gte=start).order_by("start")
+
+    def get_files_index(self) -> "DatasetFilesIndex":
+        """Get the cached time index of the dataset files"""
+        return get_dataset_files_index(self.id)
 
 
 class DatasetFile(models.Model):
@@ -102,6 +106,7 @@ class DatasetFile(models.Model):
     class Meta:
         db_table = "dataset_files"
         ordering = ("start", "id")
+        indexes = [models.Index(fields=["dataset", "start", "end"])]
 
     def __str__(self):
         return str(self.filename)
@@ -120,3 +125,177 @@ class DatasetFile(models.Model):
         # Pylint can't follow foreign keys when using string identifiers instead of model
         # pylint: disable=no-member
         return self.dataset.audio_metadatum.dataset_sr
+
+
+class DatasetFileInterval(NamedTuple):
+    """Dataset file bounds"""
+
+    id: int
+    start: datetime
+    end: datetime
+
+
+class DatasetFilesIndex:
+    """Dataset files sorted by start, to find the files of time intervals without querying"""
+
+    def __init__(self, files: Iterable[tuple[int, datetime, datetime]]):
+        self.files = [DatasetFileInterval(*file) for file in files]
+        self.starts = [file.start for file in self.files]
+        # Files can overlap, the running max of ends keeps a sorted search possible
+        self.max_ends = list(accumulate((file.end for file in self.files), max))
+        self.version = (
+            len(self.files),
+            max((file.id for file in self.files), default=None),
+        )
+
+    @classmethod
+    def for_dataset(cls, dataset_id: int) -> "DatasetFilesIndex":
+        """Load the index of the given dataset in one query"""
+        return cls(
+            DatasetFile.objects.filter(dataset_id=dataset_id)
+            .order_by("start", "id")
+            .values_list("id", "start", "end")
+        )
+
+    @staticmethod
+    def get_version(dataset_id: int) -> tuple[int, Optional[int]]:
+        """Files count and last file id of the dataset, changed by files imports and deletions"""
+        aggregate = DatasetFile.objects.filter(dataset_id=dataset_id).aggregate(
+            count=Count("id"), last_id=Max("id")
+        )
+        return aggregate["count"], aggregate["last_id"]
+
+    def get_files(self, start: datetime, end: datetime) -> list[DatasetFileInterval]:
+        """Get files overlapping the interval, as Dataset.get_files does"""
+        first = bisect_left(self.max_ends, start)
+        last = bisect_right(self.starts, end)
+        return [file for file in self.files[first:last] if file.end >= start]
+
+    def get_files_batch(
+        self, intervals: Sequence[tuple[datetime, datetime]]
+    ) -> list[list[DatasetFileInterval]]:
+        """Get files overlapping each interval, intervals are swept by start"""
+        results: list[list[DatasetFileInterval]] = [[] for _ in intervals]
+        first = 0
+        for index in sorted(range(len(intervals)), key=lambda i: intervals[i][0]):
+            start, end = intervals[index]
+            # Intervals are sorted by start: the first candidate can only move forward
+            while first < len(self.files) and self.max_ends[first] < start:
+                first += 1
+            last = bisect_right(self.starts, end, lo=first)
+            results[index] = [
+                file for file in self.files[first:last] if file.end >= start
+            ]
+        return results
+
+
+# Files indexes of the process by dataset id, least recently used first
+_FILES_INDEXES: "OrderedDict[int, DatasetFilesIndex]" = OrderedDict()
+_FILES_INDEXES_LOCK = Lock()
+
+
+def get_dataset_files_index(dataset_id: int) -> DatasetFilesIndex:
+    """
+    Get the files index of a dataset.
+    Cached indexes are checked against the dataset version, so that files imported or deleted
+    by other processes are taken into account. The cache is bounded by its total number of files.
+    """
+    version = DatasetFilesIndex.get_version(dataset_id)
+    with _FILES_INDEXES_LOCK:
+        index = _FILES_INDEXES.get(dataset_id)
+        if index is not None and index.version == version:
+            _FILES_INDEXES.move_to_end(dataset_id)
+            return index
+
+    index = DatasetFilesIndex.for_dataset(dataset_id)
+    with _FILES_INDEXES_LOCK:
+        _FILES_INDEXES.pop(dataset_id, None)
+        if len(index.files) > settings.DATASET_FILES_INDEX_CACHE_SIZE:
+            return index
+        _FILES_INDEXES[dataset_id] = index
+        cached_count = sum(len(cached.files) for cached in _FILES_INDEXES.values())
+        while cached_count > settings.DATASET_FILES_INDEX_CACHE_SIZE:
+            cached_count -= len(_FILES_INDEXES.popitem(last=False)[1].files)
+    return index
+
+
+def clear_dataset_files_indexes(dataset_id: Optional[int] = None):
+    """Invalidate cached files indexes, to call after dataset files bulk operations"""
+    with _FILES_INDEXES_LOCK:
+        if dataset_id is None:
+            _FILES_INDEXES.clear()
+        else:
+            _FILES_INDEXES.pop(dataset_id, None)
+
+
+@receiver(signal=signals.post_save, sender=DatasetFile)
+def clear_files_index_on_file_save(sender, instance: DatasetFile, **kwargs):
+    """Updated files keep the dataset version"""
+    # pylint: disable=unused-argument
+    clear_dataset_files_indexes(instance.dataset_id)
+
+
+@receiver(signal=signals.post_delete, sender=Dataset)
+def clear_files_index_on_dataset_delete(sender, instance: Dataset, **kwargs):
+    """Free the index of deleted datasets"""
+    # pylint: disable=unused-argument
+    clear_dataset_files_indexes(instance.id)
+
+
+class DatasetImportJob(models.Model):
+    """
+    Background import of datasets from datawork.
+    The import is processed by a local worker, progress is reported for each dataset.
+    """
+
+    class Status(models.TextChoices):
+        """Status of an import job or of one of its datasets"""
+
+        PENDING = ("P", "Pending")
+        RUNNING = ("R", "Running")
+        SUCCESS = ("S", "Success")
+        FAILURE = ("F", "Failure")
+
+    class Meta:
+        db_table = "dataset_import_jobs"
+        ordering = ["-created_at"]
+
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    status = models.TextField(choices=Status.choices, default=Status.PENDING)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    errors = models.JSONField(
+        null=True, blank=True, help_text="Errors which are not related to a dataset"
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Last progress of the running job, it is considered stopped when it gets old",
+    )
+
+
+class DatasetImportJobDataset(models.Model):
+    """Progress of the import of one dataset within an import job"""
+
+    class Meta:
+        db_table = "dataset_import_job_datasets"
+        ordering = ["name"]
+
+    job = models.ForeignKey(
+        DatasetImportJob, on_delete=models.CASCADE, related_name="datasets"
+    )
+    name = models.CharField(max_length=255)
+    csv_data = models.JSONField(help_text="Dataset row from datasets.csv")
+    status = models.TextField(
+        choices=DatasetImportJob.Status.choices,
+        default=DatasetImportJob.Status.PENDING,
+    )
+    imported_files_count = models.PositiveIntegerField(default=0)
+    missing_tiles_count = models.PositiveIntegerField(
+        default=0, help_text="Spectrogram tiles of the imported files not found on disk"
+    )
+    error = models.TextField(null=True, blank=True)
+    dataset = models.ForeignKey(
+        Dataset, on_delete=models.SET_NULL, null=True, blank=True
+    )
@@ -1,3 +1,4 @@
 """ Models for Spectrograms """
 from .configuration import SpectrogramConfiguration, WindowType
 from .scales import LinearScale, MultiLinearScale
+from .tile_manifest import SpectrogramTileManifest, SpectrogramTileGap
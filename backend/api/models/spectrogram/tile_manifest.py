@@ -0,0 +1,187 @@
+"""Spectrogram tiles manifest model"""
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from ..datasets import DatasetFile
+from .configuration import SpectrogramConfiguration
+
+
+class SpectrogramTileManifest(models.Model):
+    """
+    Tiles of a spectrogram configuration found on disk when its dataset is imported.
+    Only missing tiles are stored, so that clients request the existing tiles without relying on 404s.
+    """
+
+    class Meta:
+        db_table = "spectrogram_tile_manifests"
+
+    spectrogram_configuration = models.OneToOneField(
+        SpectrogramConfiguration,
+        on_delete=models.CASCADE,
+        related_name="tile_manifest",
+    )
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    files_count = models.PositiveIntegerField(default=0)
+    tiles_count = models.PositiveIntegerField(
+        default=0, help_text="Number of expected tiles"
+    )
+    missing_tiles_count = models.PositiveIntegerField(default=0)
+    image_folder_modified_at = models.BigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Modification time of the image folder when it was read, in nanoseconds",
+    )
+
+    @staticmethod
+    def get_tile_name(filename: str) -> str:
+        """Tiles filenames prefix of a dataset file"""
+        return filename.split(".")[0]
+
+    @staticmethod
+    def _get_image_folder_modified_at(image_folder: Path) -> Optional[int]:
+        return (
+            os.stat(image_folder).st_mtime_ns if os.path.isdir(image_folder) else None
+        )
+
+    @staticmethod
+    def _get_missing_ranges(tiles: list[str], existing_tiles: set[str]) -> list:
+        """Missing tiles as ranges of consecutive indexes in the zoom tiles of the file"""
+        ranges = []
+        for index, tile in enumerate(tiles):
+            if tile in existing_tiles:
+                continue
+            if ranges and ranges[-1][1] == index - 1:
+                ranges[-1][1] = index
+            else:
+                ranges.append([index, index])
+        return ranges
+
+    @staticmethod
+    def build(
+        configuration: SpectrogramConfiguration,
+        files: Iterable[tuple[int, str]],
+        image_folder: Path,
+    ) -> "SpectrogramTileManifest":
+        """List the missing tiles of the given dataset files (id and filename),
+        the image folder is read once"""
+        image_folder_modified_at = (
+            SpectrogramTileManifest._get_image_folder_modified_at(image_folder)
+        )
+        existing_tiles = (
+            {entry.name for entry in os.scandir(image_folder) if entry.is_file()}
+            if image_folder_modified_at is not None
+            else set()
+        )
+        with transaction.atomic():
+            manifest, _ = SpectrogramTileManifest.objects.update_or_create(
+                spectrogram_configuration=configuration,
+                defaults={
+                    "created_at": timezone.now(),
+                    "image_folder_modified_at": image_folder_modified_at,
+                },
+            )
+            manifest.gaps.all().delete()
+            manifest.files_count = 0
+            manifest.tiles_count = 0
+            manifest.missing_tiles_count = 0
+
+            def get_gaps() -> Iterator[SpectrogramTileGap]:
+                for file_id, filename in files:
+                    tiles = list(
+                        configuration.zoom_tiles(
+                            SpectrogramTileManifest.get_tile_name(filename)
+                        )
+                    )
+                    ranges = SpectrogramTileManifest._get_missing_ranges(
+                        tiles, existing_tiles
+                    )
+                    missing_count = sum(last - first + 1 for first, last in ranges)
+                    manifest.files_count += 1
+                    manifest.tiles_count += len(tiles)
+                    manifest.missing_tiles_count += missing_count
+                    if ranges:
+                        yield SpectrogramTileGap(
+                            manifest=manifest,
+                            dataset_file_id=file_id,
+                            missing_tiles_count=missing_count,
+                            missing_ranges=ranges,
+                        )
+
+            gaps = get_gaps()
+            while batch := list(islice(gaps, settings.DATASET_IMPORT_FILES_BATCH_SIZE)):
+                SpectrogramTileGap.objects.bulk_create(batch)
+            manifest.save(
+                update_fields=["files_count", "tiles_count", "missing_tiles_count"]
+            )
+        return manifest
+
+    @staticmethod
+    def refresh(
+        configuration: SpectrogramConfiguration,
+        image_folder: Path,
+        force: bool = False,
+    ) -> Optional["SpectrogramTileManifest"]:
+        """Build the manifest again if the image folder changed since it was read,
+        returns None if the manifest is up-to-date"""
+        manifest = SpectrogramTileManifest.objects.filter(
+            spectrogram_configuration=configuration
+        ).first()
+        if (
+            not force
+            and manifest is not None
+            and manifest.image_folder_modified_at is not None
+            and manifest.image_folder_modified_at
+            == SpectrogramTileManifest._get_image_folder_modified_at(image_folder)
+        ):
+            return None
+        return SpectrogramTileManifest.build(
+            configuration,
+            configuration.dataset.files.values_list("id", "filename").iterator(),
+            image_folder,
+        )
+
+    @staticmethod
+    def get_file_missing_tiles(
+        configuration: SpectrogramConfiguration,
+        filename: str,
+        missing_ranges: Optional[list],
+    ) -> list[str]:
+        """Expand the stored missing tiles ranges of a file"""
+        if not missing_ranges:
+            return []
+        tiles = list(
+            configuration.zoom_tiles(SpectrogramTileManifest.get_tile_name(filename))
+        )
+        return [
+            tile for first, last in missing_ranges for tile in tiles[first : last + 1]
+        ]
+
+
+class SpectrogramTileGap(models.Model):
+    """Missing tiles of a dataset file in a spectrogram tiles manifest"""
+
+    class Meta:
+        db_table = "spectrogram_tile_gaps"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["manifest", "dataset_file"],
+                name="spectrogram_tile_gap_unicity",
+            ),
+        ]
+
+    manifest = models.ForeignKey(
+        SpectrogramTileManifest, on_delete=models.CASCADE, related_name="gaps"
+    )
+    dataset_file = models.ForeignKey(
+        DatasetFile, on_delete=models.CASCADE, related_name="tile_gaps"
+    )
+    missing_tiles_count = models.PositiveIntegerField()
+    missing_ranges = models.JSONField(
+        help_text="Ranges [first, last] of the missing tiles indexes in the zoom tiles of the file"
+    )
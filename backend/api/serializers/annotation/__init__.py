@@ -12,6 +12,10 @@ from .detector import (
     DetectorSerializer,
     DetectorConfigurationSerializer,
 )
+from .detection_import import (
+    DetectionImportSerializer,
+    DetectionImportRowSerializer,
+)
 from .file_range import (
     AnnotationFileRangeSerializer,
     AnnotationFileRangeFilesSerializer,
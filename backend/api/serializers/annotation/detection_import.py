@@ -0,0 +1,58 @@
+"""Detection import serializer"""
+from rest_framework import serializers
+
+from backend.api.models import AnnotationCampaign, DetectionImport, DetectionImportRow
+from backend.utils.serializers import EnumField
+
+
+class DetectionImportSerializer(serializers.ModelSerializer):
+    """Serializer for detection imports and their progress"""
+
+    status = EnumField(enum=DetectionImport.Status, read_only=True)
+    owner = serializers.SlugRelatedField(read_only=True, slug_field="username")
+    annotation_campaign = serializers.PrimaryKeyRelatedField(
+        queryset=AnnotationCampaign.objects.all()
+    )
+    detectors_map = serializers.JSONField(binary=True)
+    remaining_rows_count = serializers.IntegerField(read_only=True)
+    file = serializers.FileField(write_only=True)
+
+    class Meta:
+        # pylint: disable=duplicate-code
+        model = DetectionImport
+        fields = [
+            "id",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "status",
+            "owner",
+            "annotation_campaign",
+            "dataset_name",
+            "detectors_map",
+            "force",
+            "rows_count",
+            "processed_rows_count",
+            "rejected_rows_count",
+            "remaining_rows_count",
+            "imported_results_count",
+            "error",
+            "file",
+        ]
+        read_only_fields = [
+            "started_at",
+            "finished_at",
+            "rows_count",
+            "processed_rows_count",
+            "rejected_rows_count",
+            "imported_results_count",
+            "error",
+        ]
+
+
+class DetectionImportRowSerializer(serializers.ModelSerializer):
+    """Serializer meant to output rejected rows of a detection import"""
+
+    class Meta:
+        model = DetectionImportRow
+        fields = ["index", "data", "errors"]
@@ -1,14 +1,15 @@
 """Serializer for annotation file range"""
 
-from django.db.models import OuterRef, Subquery, F, Func, Exists, QuerySet, Q
+from django.db.models import QuerySet
 from rest_framework import serializers
 
 from backend.api.models import (
+    AnnotationCampaignAnnotatorFile,
     AnnotationFileRange,
     AnnotationTask,
-    AnnotationResult,
     AnnotationCampaign,
 )
+from backend.api.actions.file_range_assignment import FileRangeAssignment
 from backend.aplose.models import User
 from backend.utils.serializers import EnumField
 from ..data.file import DatasetFileSerializer
@@ -38,60 +39,14 @@ class AnnotationFileRangeListSerializer(serializers.ListSerializer):
                 )
         return deleted_ranges
 
-    def prepare_updates_and_creates(
-        self,
-        original_ranges: QuerySet[AnnotationFileRange],
-        validated_data: list[dict],
-    ) -> list[serializers.ModelSerializer]:
-        """Prepare updates and creates, recover each serializer and check data validity"""
-        serializers_list = []
-        for file_range in validated_data:
-            instance = original_ranges.filter(
-                Q(id=file_range["id"] if "id" in file_range else None)
-                | Q(
-                    annotation_campaign_id=file_range["annotation_campaign"].id,
-                    annotator_id=file_range["annotator"].id,
-                    first_file_index=file_range["first_file_index"],
-                    last_file_index=file_range["last_file_index"],
-                )
-            )
-            file_range_data = {
-                **file_range,
-                "annotator": file_range["annotator"].id,
-                "annotation_campaign": file_range["annotation_campaign"].id,
-            }
-            if instance.exists():
-                # Update
-                instance = instance.first()
-                serializer = AnnotationFileRangeSerializer(
-                    instance, data=file_range_data
-                )
-                serializer.is_valid(raise_exception=True)
-                serializers_list.append(serializer)
-            else:
-                # Create
-                serializer = AnnotationFileRangeSerializer(data=file_range_data)
-                serializer.is_valid(raise_exception=True)
-                serializers_list.append(serializer)
-        return serializers_list
-
     def update(
         self,
         instance: QuerySet[AnnotationFileRange],
         validated_data: list[dict],
     ):
-        # Preparation
-        deleted_ranges = self.prepare_deletion(instance, validated_data)
-        serializers_list = self.prepare_updates_and_creates(instance, validated_data)
-
-        # Execution
-        deleted_ranges.delete()
-        instances = []
-        for serializer in serializers_list:
-            serializer.save()
-            instances.append(serializer.data)
-
-        return AnnotationFileRange.clean_connected_ranges(instances)
+        # Check deletions before any change
+        self.prepare_deletion(instance, validated_data)
+        return FileRangeAssignment(self.context["campaign"]).assign(validated_data)
 
 
 class AnnotationFileRangeSerializer(serializers.ModelSerializer):
@@ -116,7 +71,11 @@ class AnnotationFileRangeSerializer(serializers.ModelSerializer):
         """Check file indexes doesn't go higher than campaign has files"""
         max_value_errors = {}
         campaign: AnnotationCampaign = data["annotation_campaign"]
-        max_files = campaign.get_sorted_files().count()
+        # Items of a list share the context, campaign files are only counted once
+        files_counts: dict[int, int] = self.context.setdefault("files_counts", {})
+        if campaign.id not in files_counts:
+            files_counts[campaign.id] = campaign.get_sorted_files().count()
+        max_files = files_counts[campaign.id]
         if data["first_file_index"] >= max_files:
             max_value_errors = {
                 **max_value_errors,
@@ -182,26 +141,12 @@ class AnnotationFileRangeFilesSerializer(AnnotationFileRangeSerializer):
 
     def get_files(self, file_range: AnnotationFileRange):
         """Get files within the range"""
-        files = file_range.get_files().annotate(
-            is_submitted=Exists(
-                AnnotationTask.objects.filter(
-                    annotation_campaign_id=file_range.annotation_campaign_id,
-                    annotator_id=file_range.annotator_id,
-                    dataset_file_id=OuterRef("pk"),
-                    status=AnnotationTask.Status.FINISHED,
-                )
-            ),
-            results_count=Subquery(
-                AnnotationResult.objects.filter(
-                    annotation_campaign_id=file_range.annotation_campaign_id,
-                    dataset_file_id=OuterRef("pk"),
-                )
-                .filter(
-                    Q(annotator=file_range.annotator)
-                    | Q(detector_configuration__isnull=False)
-                )
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            ),
+        AnnotationCampaignAnnotatorFile.refresh_if_outdated(
+            file_range.annotation_campaign_id
+        )
+        files = AnnotationCampaignAnnotatorFile.annotate_files(
+            file_range.get_files(),
+            file_range.annotation_campaign_id,
+            file_range.annotator_id,
         )
         return FileRangeDatasetFileSerializer(files, many=True).data
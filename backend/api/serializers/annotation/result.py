@@ -1,12 +1,13 @@
 """Annotation result serializer"""
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime
 from typing import Optional
 
 from django.db import transaction
-from django.db.models import QuerySet
 from rest_framework import serializers
 from rest_framework.fields import empty
 
+from backend.api.actions.detection_import import DetectionImporter
 from backend.api.models import (
     AnnotationResult,
     Label,
@@ -16,11 +17,10 @@ from backend.api.models import (
     AnnotationComment,
     AnnotationResultValidation,
     Dataset,
+    DatasetFileInterval,
     Detector,
     DetectorConfiguration,
-    ConfidenceIndicatorSet,
     AnnotationCampaignUsage,
-    ConfidenceIndicatorSetIndicator,
     AnnotationResultAcousticFeatures,
     SignalTrend,
 )
@@ -28,7 +28,8 @@ from backend.aplose.models import User
 from backend.aplose.models.user import ExpertiseLevel
 from backend.utils.serializers import (
     ListSerializer,
-    SlugRelatedGetOrCreateField,
+    CachedSlugRelatedField,
+    CachedSlugRelatedGetOrCreateField,
     EnumField,
 )
 from .comment import AnnotationCommentSerializer
@@ -36,16 +37,11 @@ from .confidence_indicator_set import ConfidenceIndicatorSerializer
 from ...models.annotation.result import AnnotationResultType
 
 
-def to_seconds(delta: timedelta) -> float:
-    """Format seconds timedelta as float"""
-    return delta.seconds + delta.microseconds / 1000000
-
-
 class AnnotationResultImportSerializer(serializers.Serializer):
     """Annotation result serializer for detection importation"""
 
     is_box = serializers.BooleanField()
-    dataset = serializers.SlugRelatedField(
+    dataset = CachedSlugRelatedField(
         queryset=Dataset.objects.all(),
         slug_field="name",
     )
@@ -59,12 +55,15 @@ class AnnotationResultImportSerializer(serializers.Serializer):
         allow_null=True,
         required=False,
     )
-    label = SlugRelatedGetOrCreateField(
+    label = CachedSlugRelatedGetOrCreateField(
         queryset=Label.objects,
         slug_field="name",
     )
     confidence_indicator = serializers.DictField(allow_null=True)
 
+    # Files of the detections, resolved by batch (see AnnotationResultImportListSerializer)
+    files_batch: dict[tuple[int, datetime, datetime], list[DatasetFileInterval]] = {}
+
     class Meta:
         list_serializer_class = ListSerializer
 
@@ -78,7 +77,13 @@ class AnnotationResultImportSerializer(serializers.Serializer):
             fields["dataset"].queryset = campaign.datasets
             if campaign.usage is AnnotationCampaignUsage.CREATE:
                 fields["label"].queryset = campaign.label_set.labels
-                if campaign.confidence_indicator_set is not None:
+                # Imports by batches give the campaign state at their start:
+                # their first batch may create the confidence set
+                has_confidence_set = self.context.get(
+                    "has_confidence_set",
+                    campaign.confidence_indicator_set_id is not None,
+                )
+                if has_confidence_set:
                     fields["confidence_indicator"] = ConfidenceIndicatorSerializer(
                         required=True,
                     )
@@ -111,7 +116,9 @@ class AnnotationResultImportSerializer(serializers.Serializer):
         dataset = attrs["dataset"]
         start = attrs["start_datetime"]
         end = attrs["end_datetime"]
-        dataset_files = dataset.get_files(start, end)
+        dataset_files = self.files_batch.get((dataset.id, start, end))
+        if dataset_files is None:
+            dataset_files = dataset.get_files_index().get_files(start, end)
         if not dataset_files:
             if "force" in self.context and self.context["force"]:
                 return None
@@ -137,133 +144,9 @@ class AnnotationResultImportSerializer(serializers.Serializer):
         attrs["files"] = dataset_files
         return attrs
 
-    def get_confidence_set(self, name, index=0):
-        """Recover appropriate confidence set based on the campaign name"""
-        real_name = name if index == 0 else f"{name} ({index})"
-        if ConfidenceIndicatorSet.objects.filter(name=real_name).exists():
-            return self.get_confidence_set(name, index + 1)
-        return ConfidenceIndicatorSet.objects.create(name=real_name)
-
     def create(self, validated_data):
-        is_box: bool = validated_data["is_box"]
-
-        files: QuerySet[DatasetFile] = validated_data["files"]
-        campaign: AnnotationCampaign = self.context["campaign"]
-        detector, _ = Detector.objects.get_or_create(name=validated_data["detector"])
-        detector_config, _ = DetectorConfiguration.objects.get_or_create(
-            detector=detector,
-            configuration=validated_data["detector_config"],
-        )
-        label, _ = Label.objects.get_or_create(name=validated_data["label"])
-        if not campaign.label_set.labels.filter(id=label.id).exists():
-            campaign.label_set.labels.add(label)
-        confidence_indicator = None
-        if (
-            "confidence_indicator" in validated_data
-            and validated_data["confidence_indicator"] is not None
-        ):
-            if campaign.confidence_indicator_set is None:
-                campaign.confidence_indicator_set = self.get_confidence_set(
-                    name=f"{campaign.name} confidence set"
-                )
-                campaign.save()
-            confidence_indicator, _ = ConfidenceIndicator.objects.get_or_create(
-                label=validated_data["confidence_indicator"].get("label"),
-                level=validated_data["confidence_indicator"].get("level"),
-            )
-            is_default = validated_data["confidence_indicator"].pop("is_default", None)
-            ConfidenceIndicatorSetIndicator.objects.get_or_create(
-                confidence_indicator=confidence_indicator,
-                confidence_indicator_set=campaign.confidence_indicator_set,
-                is_default=is_default or False,
-            )
-
-        if not is_box and files.count() == 1:
-            return AnnotationResult.objects.create(
-                annotation_campaign=campaign,
-                detector_configuration=detector_config,
-                label=label,
-                confidence_indicator=confidence_indicator,
-                dataset_file=files.first(),
-                type=AnnotationResultType.WEAK,
-            )
-
-        instances = []
-        start: datetime = validated_data["start_datetime"]
-        end: datetime = validated_data["end_datetime"]
-        dataset: Dataset = validated_data["dataset"]
-        for file in files:
-            if start < file.start:
-                start_time = 0
-            else:
-                start_time = to_seconds(start - file.start)
-            if end > file.end:
-                end_time = to_seconds(file.end - file.start)
-            else:
-                end_time = to_seconds(end - file.start)
-
-            start_frequency = (
-                validated_data["min_frequency"]
-                if "min_frequency" in validated_data and is_box
-                else 0
-            )
-            end_frequency = (
-                validated_data["max_frequency"]
-                if "max_frequency" in validated_data and is_box
-                else dataset.audio_metadatum.dataset_sr / 2
-            )
-
-            if (
-                start_time == 0
-                and end_time == to_seconds(file.end - file.start)
-                and start_frequency == 0
-                and end_frequency == dataset.audio_metadatum.dataset_sr / 2
-            ):
-                instances.append(
-                    AnnotationResult(
-                        annotation_campaign=campaign,
-                        detector_configuration=detector_config,
-                        label=label,
-                        confidence_indicator=confidence_indicator,
-                        dataset_file=file,
-                        type=AnnotationResultType.WEAK,
-                    )
-                )
-            elif start_time == end_time and (
-                start_frequency == end_frequency
-                or validated_data["max_frequency"] is None
-            ):
-                instances.append(
-                    AnnotationResult(
-                        annotation_campaign=campaign,
-                        detector_configuration=detector_config,
-                        label=label,
-                        confidence_indicator=confidence_indicator,
-                        dataset_file=file,
-                        start_frequency=start_frequency,
-                        end_frequency=None,
-                        start_time=start_time,
-                        end_time=None,
-                        type=AnnotationResultType.POINT,
-                    )
-                )
-            else:
-                instances.append(
-                    AnnotationResult(
-                        annotation_campaign=campaign,
-                        detector_configuration=detector_config,
-                        label=label,
-                        confidence_indicator=confidence_indicator,
-                        dataset_file=file,
-                        start_frequency=start_frequency,
-                        end_frequency=end_frequency,
-                        start_time=start_time,
-                        end_time=end_time,
-                        type=AnnotationResultType.BOX,
-                    )
-                )
-
-        return AnnotationResult.objects.bulk_create(instances)
+        importer = DetectionImporter(self.context["campaign"])
+        return importer.save_results(importer.get_results(validated_data))
 
     def update(self, instance, validated_data):
         raise NotImplementedError("`update()` must be implemented.")
@@ -274,6 +157,41 @@ class AnnotationResultImportListSerializer(ListSerializer):
 
     child = AnnotationResultImportSerializer()
 
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.child.files_batch = self.get_files_batch(data)
+        return super().to_internal_value(data)
+
+    def get_files_batch(
+        self, data: list
+    ) -> dict[tuple[int, datetime, datetime], list[DatasetFileInterval]]:
+        """Resolve the files of all detections at once, with a single sweep of each dataset index"""
+        fields = self.child.fields
+        intervals: dict[Dataset, set[tuple[datetime, datetime]]] = defaultdict(set)
+        for item in data:
+            try:
+                dataset = fields["dataset"].run_validation(item.get("dataset"))
+                intervals[dataset].add(
+                    (
+                        fields["start_datetime"].run_validation(
+                            item.get("start_datetime")
+                        ),
+                        fields["end_datetime"].run_validation(item.get("end_datetime")),
+                    )
+                )
+            except (AttributeError, serializers.ValidationError):
+                # Invalid detections are reported by the child validation
+                continue
+        files_batch = {}
+        for dataset, dataset_intervals in intervals.items():
+            dataset_intervals = list(dataset_intervals)
+            for (start, end), files in zip(
+                dataset_intervals,
+                dataset.get_files_index().get_files_batch(dataset_intervals),
+            ):
+                files_batch[(dataset.id, start, end)] = files
+        return files_batch
+
     def is_valid(self, *, raise_exception=False):
         data = super().is_valid(raise_exception=raise_exception)
         # pylint: disable=attribute-defined-outside-init
@@ -282,14 +200,10 @@ class AnnotationResultImportListSerializer(ListSerializer):
         ]
         return data
 
+    @transaction.atomic
     def create(self, validated_data: list[dict]):
-        result = super().create(validated_data)
-        ids = []
-        for new_result in result:
-            try:
-                ids.append(new_result.id)
-            except AttributeError:
-                ids += [r.id for r in new_result]
+        importer = DetectionImporter(self.context["campaign"])
+        ids = importer.import_detections(validated_data)
         return AnnotationResult.objects.filter(id__in=ids)
 
 
@@ -4,7 +4,10 @@ from rest_framework import serializers
 
 from backend.api.models import (
     Dataset,
+    DatasetImportJob,
+    DatasetImportJobDataset,
 )
+from backend.utils.serializers import EnumField
 from .data import SpectrogramConfigurationSerializer
 
 # Serializers have too many false-positives on the following warnings:
@@ -40,6 +43,50 @@ class DatasetSerializer(serializers.ModelSerializer):
         depth = 1
 
 
+class DatasetImportJobDatasetSerializer(serializers.ModelSerializer):
+    """Serializer meant to output the import progress of a dataset"""
+
+    status = EnumField(enum=DatasetImportJob.Status, read_only=True)
+
+    class Meta:
+        model = DatasetImportJobDataset
+        fields = [
+            "id",
+            "name",
+            "status",
+            "imported_files_count",
+            "missing_tiles_count",
+            "error",
+            "dataset",
+        ]
+
+
+class DatasetImportJobSerializer(serializers.ModelSerializer):
+    """Serializer for datawork import jobs"""
+
+    status = EnumField(enum=DatasetImportJob.Status, read_only=True)
+    owner = serializers.SlugRelatedField(read_only=True, slug_field="username")
+    datasets = DatasetImportJobDatasetSerializer(many=True, read_only=True)
+    wanted_datasets = serializers.ListField(
+        child=serializers.DictField(), write_only=True
+    )
+
+    class Meta:
+        model = DatasetImportJob
+        fields = [
+            "id",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "status",
+            "owner",
+            "errors",
+            "datasets",
+            "wanted_datasets",
+        ]
+        read_only_fields = ["started_at", "finished_at", "errors"]
+
+
 class SimpleSerializer(serializers.ModelSerializer):
     """Serializer meant to output basic data"""
 
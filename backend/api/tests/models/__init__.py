@@ -1,3 +1,5 @@
 """Models test case"""
 from .annotation import *
+from .datasets import DatasetFilesIndexTestCase
 from .metadata import MetadataTestCase
+from .spectrogram import SpectrogramTileManifestTestCase
@@ -1,3 +1,8 @@
 # pylint: disable=missing-module-docstring, missing-class-docstring, missing-function-docstring
 from .campaign import AnnotationCampaignModelTestCase
-from .tasks import AnnotationFileRangeTestCase
+from .campaign_file import (
+    AnnotationCampaignFileTestCase,
+    AnnotationCampaignAnnotatorFileTestCase,
+)
+from .progress import AnnotationCampaignProgressTestCase
+from .tasks import AnnotationFileRangeTestCase, AnnotationSessionTestCase
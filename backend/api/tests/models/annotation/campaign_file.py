@@ -0,0 +1,150 @@
+# pylint: disable=missing-module-docstring, missing-class-docstring, missing-function-docstring
+from django.db.models import Q
+from django.test import TestCase, override_settings
+
+from backend import settings
+from backend.api.actions.datawork_import import get_datasets_to_import, import_dataset
+from backend.api.actions.detection_import import DetectionImporter
+from backend.api.models import (
+    AnnotationCampaign,
+    AnnotationCampaignAnnotatorFile,
+    AnnotationCampaignFile,
+    AnnotationCampaignProgress,
+    AnnotationResult,
+    AnnotationTask,
+    Dataset,
+    DatasetFile,
+    DetectorConfiguration,
+)
+from backend.api.models.annotation.result import AnnotationResultType
+from backend.aplose.models import User
+from backend.utils.tests import all_fixtures
+
+IMPORT_FIXTURES = settings.FIXTURE_DIRS[1] / "dataset" / "list_to_import"
+
+
+class AnnotationCampaignFileTestCase(TestCase):
+    fixtures = all_fixtures
+
+    def _get_indexed_ids(self, campaign_id: int) -> list[int]:
+        return list(
+            AnnotationCampaignFile.objects.filter(
+                annotation_campaign_id=campaign_id
+            ).values_list("dataset_file_id", flat=True)
+        )
+
+    def test_fixtures_index(self):
+        campaign = AnnotationCampaign.objects.get(pk=1)
+        self.assertEqual(
+            self._get_indexed_ids(campaign.id),
+            list(campaign.get_sorted_files().values_list("id", flat=True)),
+        )
+        self.assertEqual(
+            list(
+                AnnotationCampaignFile.objects.filter(
+                    annotation_campaign_id=campaign.id
+                ).values_list("index", flat=True)
+            ),
+            list(range(campaign.get_sorted_files().count())),
+        )
+
+    def test_datasets_change(self):
+        campaign = AnnotationCampaign.objects.get(pk=1)
+        dataset = Dataset.objects.get(pk=1)
+        campaign.datasets.remove(dataset)
+        self.assertEqual(self._get_indexed_ids(campaign.id), [])
+
+        dataset.annotation_campaigns.add(campaign)
+        self.assertEqual(
+            self._get_indexed_ids(campaign.id),
+            list(campaign.get_sorted_files().values_list("id", flat=True)),
+        )
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good")
+    def test_files_imported_in_campaign_dataset(self):
+        campaign = AnnotationCampaign.objects.get(pk=1)
+        # The dataset is linked to the campaign before its files are imported
+        dataset = import_dataset(
+            get_datasets_to_import(["gliderSPAmsDemo"])[0],
+            User.objects.get(username="staff"),
+            on_dataset_created=campaign.datasets.add,
+        )
+        sorted_ids = list(campaign.get_sorted_files().values_list("id", flat=True))
+        self.assertEqual(self._get_indexed_ids(campaign.id), sorted_ids)
+        last_file = dataset.files.order_by("start", "id").last()
+        self.assertEqual(
+            AnnotationCampaignFile.get_index(campaign.id, last_file.id),
+            sorted_ids.index(last_file.id),
+        )
+        self.assertEqual(
+            campaign.get_file_ids([len(sorted_ids) - 1]),
+            {len(sorted_ids) - 1: sorted_ids[-1]},
+        )
+
+    def test_get_index_not_indexed(self):
+        AnnotationCampaignFile.objects.filter(annotation_campaign_id=1).delete()
+        self.assertEqual(AnnotationCampaignFile.get_index(1, 7), 6)
+        self.assertEqual(len(self._get_indexed_ids(1)), 11)
+
+
+class AnnotationCampaignAnnotatorFileTestCase(TestCase):
+    fixtures = all_fixtures
+
+    def setUp(self):
+        AnnotationCampaignAnnotatorFile.refresh_if_outdated(1)
+
+    def _get_results_count(self, annotator_id: int, file_id: int) -> int:
+        state = AnnotationCampaignAnnotatorFile.annotate_files(
+            DatasetFile.objects.filter(id=file_id), 1, annotator_id
+        ).get()
+        return state.results_count
+
+    def test_refresh(self):
+        self.assertFalse(
+            AnnotationCampaignProgress.objects.get(
+                annotation_campaign_id=1
+            ).files_states_outdated
+        )
+        for file_id in [7, 8, 9]:
+            self.assertEqual(
+                self._get_results_count(4, file_id),
+                AnnotationResult.objects.filter(
+                    annotation_campaign_id=1, dataset_file_id=file_id
+                )
+                .filter(Q(annotator_id=4) | Q(detector_configuration__isnull=False))
+                .count(),
+            )
+
+    def test_task_submit(self):
+        task, _ = AnnotationTask.objects.get_or_create(
+            annotation_campaign_id=1, annotator_id=4, dataset_file_id=9
+        )
+        task.status = AnnotationTask.Status.FINISHED
+        task.save()
+        state = AnnotationCampaignAnnotatorFile.objects.get(
+            annotation_campaign_id=1, annotator_id=4, dataset_file_id=9
+        )
+        self.assertTrue(state.is_submitted)
+
+        task.delete()
+        state.refresh_from_db()
+        self.assertFalse(state.is_submitted)
+
+    def test_detections(self):
+        old_count = self._get_results_count(4, 9)
+        importer = DetectionImporter(AnnotationCampaign.objects.get(pk=1))
+        label = importer.get_label("Boat")
+        importer.save_results(
+            [
+                AnnotationResult(
+                    annotation_campaign_id=1,
+                    dataset_file_id=9,
+                    label=label,
+                    detector_configuration=DetectorConfiguration.objects.first(),
+                    type=AnnotationResultType.WEAK,
+                )
+                for _ in range(2)
+            ]
+        )
+        self.assertEqual(self._get_results_count(4, 9), old_count + 2)
+        self.assertEqual(self._get_results_count(1, 9), old_count + 2)
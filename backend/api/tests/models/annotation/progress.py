@@ -0,0 +1,166 @@
+# pylint: disable=missing-module-docstring, missing-class-docstring, missing-function-docstring
+from django.test import TestCase, override_settings
+
+from backend import settings
+from backend.api.actions.datawork_import import get_datasets_to_import, import_dataset
+from backend.api.models import (
+    AnnotationCampaign,
+    AnnotationCampaignProgress,
+    AnnotationCampaignAnnotatorProgress,
+    AnnotationFileRange,
+    AnnotationTask,
+)
+from backend.aplose.models import User
+from backend.utils.tests import all_fixtures
+
+IMPORT_FIXTURES = settings.FIXTURE_DIRS[1] / "dataset" / "list_to_import"
+
+
+class AnnotationCampaignProgressTestCase(TestCase):
+    fixtures = all_fixtures
+
+    def _get_counters(self, campaign_id: int, annotator_id: int):
+        return (
+            AnnotationCampaignProgress.objects.get(annotation_campaign_id=campaign_id),
+            AnnotationCampaignAnnotatorProgress.objects.get(
+                annotation_campaign_id=campaign_id, annotator_id=annotator_id
+            ),
+        )
+
+    def _assert_refresh_is_stable(self, campaign_id: int):
+        values = list(
+            AnnotationCampaignAnnotatorProgress.objects.filter(
+                annotation_campaign_id=campaign_id
+            )
+            .order_by("annotator_id")
+            .values_list("annotator_id", "assigned_files_count", "finished_tasks_count")
+        )
+        campaign = AnnotationCampaignProgress.objects.get(
+            annotation_campaign_id=campaign_id
+        )
+        AnnotationCampaignProgress.refresh(campaign_id)
+        self.assertEqual(
+            list(
+                AnnotationCampaignAnnotatorProgress.objects.filter(
+                    annotation_campaign_id=campaign_id
+                )
+                .order_by("annotator_id")
+                .values_list(
+                    "annotator_id", "assigned_files_count", "finished_tasks_count"
+                )
+            ),
+            values,
+        )
+        refreshed = AnnotationCampaignProgress.objects.get(
+            annotation_campaign_id=campaign_id
+        )
+        self.assertEqual(refreshed.files_count, campaign.files_count)
+        self.assertEqual(refreshed.assigned_files_count, campaign.assigned_files_count)
+        self.assertEqual(refreshed.finished_tasks_count, campaign.finished_tasks_count)
+
+    def test_fixtures_counters(self):
+        campaign, annotator = self._get_counters(campaign_id=1, annotator_id=1)
+        self.assertEqual(campaign.files_count, 11)
+        self.assertEqual(annotator.assigned_files_count, 6)
+        self.assertEqual(annotator.finished_tasks_count, 1)
+        self._assert_refresh_is_stable(1)
+
+    def test_task_status_change(self):
+        task = AnnotationTask.objects.filter(
+            annotation_campaign_id=1,
+            annotator_id=1,
+        ).exclude(status=AnnotationTask.Status.FINISHED)[0]
+        campaign, annotator = self._get_counters(campaign_id=1, annotator_id=1)
+
+        task.status = AnnotationTask.Status.FINISHED
+        task.save()
+        task.save()  # Saving twice should not count twice
+        new_campaign, new_annotator = self._get_counters(campaign_id=1, annotator_id=1)
+        self.assertEqual(
+            new_campaign.finished_tasks_count, campaign.finished_tasks_count + 1
+        )
+        self.assertEqual(
+            new_annotator.finished_tasks_count, annotator.finished_tasks_count + 1
+        )
+
+        task.delete()
+        new_campaign, new_annotator = self._get_counters(campaign_id=1, annotator_id=1)
+        self.assertEqual(
+            new_campaign.finished_tasks_count, campaign.finished_tasks_count
+        )
+        self.assertEqual(
+            new_annotator.finished_tasks_count, annotator.finished_tasks_count
+        )
+        self._assert_refresh_is_stable(1)
+
+    def test_file_range_update_and_delete(self):
+        file_range = AnnotationFileRange.objects.get(pk=1)
+        campaign, annotator = self._get_counters(campaign_id=1, annotator_id=1)
+
+        file_range.last_file_index -= 1
+        file_range.save()
+        new_campaign, new_annotator = self._get_counters(campaign_id=1, annotator_id=1)
+        self.assertEqual(
+            new_campaign.assigned_files_count, campaign.assigned_files_count - 1
+        )
+        self.assertEqual(
+            new_annotator.assigned_files_count, annotator.assigned_files_count - 1
+        )
+        self._assert_refresh_is_stable(1)
+
+        AnnotationFileRange.objects.filter(pk=1).delete()
+        new_campaign, new_annotator = self._get_counters(campaign_id=1, annotator_id=1)
+        self.assertEqual(
+            new_campaign.assigned_files_count,
+            campaign.assigned_files_count - file_range.files_count - 1,
+        )
+        self.assertEqual(new_annotator.assigned_files_count, 0)
+        self._assert_refresh_is_stable(1)
+
+    def test_file_range_update_deletes_tasks_in_bulk(self):
+        file_range = AnnotationFileRange.objects.get(pk=1)
+        tasks = AnnotationTask.objects.filter(
+            annotation_campaign_id=1,
+            annotator_id=1,
+            dataset_file_id__gt=file_range.first_file_id,
+        )
+        tasks.update(status=AnnotationTask.Status.FINISHED)
+        AnnotationCampaignProgress.refresh(1)
+        deleted_count = tasks.count()
+        self.assertGreater(deleted_count, 1)
+        campaign, annotator = self._get_counters(campaign_id=1, annotator_id=1)
+
+        file_range.last_file_index = file_range.first_file_index
+        with self.assertNumQueries(12):
+            file_range.save()
+        self.assertFalse(tasks.exists())
+        new_campaign, new_annotator = self._get_counters(campaign_id=1, annotator_id=1)
+        self.assertEqual(
+            new_campaign.finished_tasks_count,
+            campaign.finished_tasks_count - deleted_count,
+        )
+        self.assertEqual(
+            new_annotator.finished_tasks_count,
+            annotator.finished_tasks_count - deleted_count,
+        )
+        self._assert_refresh_is_stable(1)
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good")
+    def test_files_imported_in_campaign_dataset(self):
+        campaign = AnnotationCampaign.objects.get(pk=1)
+        files_count = AnnotationCampaignProgress.objects.get(
+            annotation_campaign_id=1
+        ).files_count
+
+        # The dataset is linked to the campaign before its files are imported
+        import_dataset(
+            get_datasets_to_import(["gliderSPAmsDemo"])[0],
+            User.objects.get(username="staff"),
+            on_dataset_created=campaign.datasets.add,
+        )
+        self.assertEqual(
+            AnnotationCampaignProgress.objects.get(
+                annotation_campaign_id=1
+            ).files_count,
+            files_count + 10,
+        )
@@ -1,7 +1,8 @@
 # pylint: disable=missing-module-docstring, missing-class-docstring, missing-function-docstring
+from django.core import management
 from django.test import TestCase
 
-from backend.api.models import AnnotationTask, AnnotationFileRange
+from backend.api.models import AnnotationTask, AnnotationFileRange, AnnotationSession
 from backend.utils.tests import all_fixtures
 
 
@@ -41,3 +42,42 @@ class AnnotationFileRangeTestCase(TestCase):
         file_range.delete()
         self.assertEqual(AnnotationFileRange.objects.count(), 6)
         self.assertEqual(AnnotationTask.objects.count(), 13)
+
+
+class AnnotationSessionTestCase(TestCase):
+    fixtures = all_fixtures
+
+    def setUp(self):
+        AnnotationSession.objects.all().delete()
+        for task_id in (1, 2):
+            for index in range(3):
+                AnnotationSession.objects.create(
+                    annotation_task_id=task_id,
+                    start="2024-11-11T08:10Z",
+                    end="2024-11-11T08:15Z",
+                    session_output={"results": [], "task_comments": [], "index": index},
+                )
+
+    def test_compact(self):
+        self.assertEqual(AnnotationSession.compact(2, task_ids=[1]), 1)
+        self.assertEqual(
+            list(
+                AnnotationSession.objects.filter(annotation_task_id=1)
+                .order_by("id")
+                .values_list("session_output__index", flat=True)
+            ),
+            [None, 1, 2],
+        )
+        self.assertFalse(
+            AnnotationSession.objects.filter(
+                annotation_task_id=2, session_output__isnull=True
+            ).exists()
+        )
+
+    def test_compact_command(self):
+        management.call_command("compact_annotation_sessions", keep=1)
+        self.assertEqual(
+            AnnotationSession.objects.filter(session_output__isnull=False).count(), 2
+        )
+        with self.assertRaises(management.CommandError):
+            management.call_command("compact_annotation_sessions")
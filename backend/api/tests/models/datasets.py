@@ -0,0 +1,109 @@
+# pylint: disable=missing-module-docstring, missing-class-docstring, missing-function-docstring
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+
+from backend.api.models import Dataset, DatasetFile, clear_dataset_files_indexes
+
+MINUTE = timedelta(minutes=1)
+
+
+class DatasetFilesIndexTestCase(TestCase):
+    fixtures = ["users", "datasets"]
+
+    def setUp(self):
+        self.dataset = Dataset.objects.get(pk=1)
+        first_file = self.dataset.files.order_by("start").first()
+        # Before, on the bounds, inside, in a gap and across files
+        self.intervals = [
+            (first_file.start - 10 * MINUTE, first_file.start - MINUTE),
+            (first_file.start - MINUTE, first_file.start),
+            (first_file.start, first_file.start),
+            (first_file.end, first_file.end),
+            (first_file.start + MINUTE, first_file.start + 2 * MINUTE),
+            (first_file.end + MINUTE, first_file.end + 2 * MINUTE),
+            (first_file.start + MINUTE, first_file.start + 150 * MINUTE),
+            (first_file.start - MINUTE, first_file.start + 100000 * MINUTE),
+        ]
+
+    def tearDown(self):
+        # Files created by the tests are rolled back
+        clear_dataset_files_indexes()
+
+    def _get_expected_ids(self, start, end) -> list[int]:
+        """Files overlapping the interval, as found by the previous three filters"""
+        files = self.dataset.files
+        query = (
+            files.filter(start__lte=start, end__gte=start)
+            | files.filter(start__gt=start, end__lt=end)
+            | files.filter(start__lte=end, end__gte=end)
+        )
+        return list(query.order_by("start").values_list("id", flat=True))
+
+    def test_get_files(self):
+        index = self.dataset.get_files_index()
+        for start, end in self.intervals:
+            expected = self._get_expected_ids(start, end)
+            self.assertEqual(
+                [file.id for file in index.get_files(start, end)], expected
+            )
+            self.assertEqual(
+                list(self.dataset.get_files(start, end).values_list("id", flat=True)),
+                expected,
+            )
+
+    def test_get_files_batch(self):
+        index = self.dataset.get_files_index()
+        intervals = list(reversed(self.intervals))
+        self.assertEqual(
+            [[file.id for file in files] for files in index.get_files_batch(intervals)],
+            [self._get_expected_ids(start, end) for start, end in intervals],
+        )
+
+    def test_index_cached_until_files_change(self):
+        index = self.dataset.get_files_index()
+        # Only the dataset version is checked
+        with self.assertNumQueries(1):
+            self.assertIs(self.dataset.get_files_index(), index)
+
+        last_file = self.dataset.files.order_by("start").last()
+        DatasetFile.objects.create(
+            dataset=self.dataset,
+            filename="new",
+            filepath="new",
+            size=0,
+            start=last_file.end + MINUTE,
+            end=last_file.end + 2 * MINUTE,
+        )
+        new_index = self.dataset.get_files_index()
+        self.assertIsNot(new_index, index)
+        self.assertEqual(len(new_index.files), len(index.files) + 1)
+
+    def test_index_reloaded_on_changes_without_signals(self):
+        # Like imports and deletions done by other processes
+        index = self.dataset.get_files_index()
+        last_file = self.dataset.files.order_by("start").last()
+        DatasetFile.objects.bulk_create(
+            [
+                DatasetFile(
+                    dataset=self.dataset,
+                    filename="new",
+                    filepath="new",
+                    size=0,
+                    start=last_file.end + MINUTE,
+                    end=last_file.end + 2 * MINUTE,
+                )
+            ]
+        )
+        new_index = self.dataset.get_files_index()
+        self.assertEqual(len(new_index.files), len(index.files) + 1)
+
+        DatasetFile.objects.filter(id=last_file.id).delete()
+        self.assertNotIn(
+            last_file.id, [file.id for file in self.dataset.get_files_index().files]
+        )
+
+    @override_settings(DATASET_FILES_INDEX_CACHE_SIZE=0)
+    def test_index_cache_bounded(self):
+        index = self.dataset.get_files_index()
+        self.assertIsNot(self.dataset.get_files_index(), index)
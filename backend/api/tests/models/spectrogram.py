@@ -0,0 +1,87 @@
+# pylint: disable=missing-module-docstring, missing-class-docstring, missing-function-docstring
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from backend.api.models import SpectrogramConfiguration, SpectrogramTileManifest
+
+FILES = [(1, "sound001.wav"), (2, "sound002.wav"), (3, "sound003.wav")]
+
+
+class SpectrogramTileManifestTestCase(TestCase):
+    fixtures = ["users", "datasets"]
+
+    def setUp(self):
+        self.configuration = SpectrogramConfiguration.objects.get(pk=1)
+        # pylint: disable=consider-using-with
+        self.folder = tempfile.TemporaryDirectory()
+        self.image_folder = Path(self.folder.name)
+        for tile in self.configuration.zoom_tiles("sound001"):
+            (self.image_folder / tile).touch()
+        (self.image_folder / "sound002_1_0.png").touch()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_build(self):
+        manifest = SpectrogramTileManifest.build(
+            self.configuration, FILES, self.image_folder
+        )
+        # 1 + 2 + 4 + 8 tiles by file for zoom level 3
+        self.assertEqual(manifest.files_count, 3)
+        self.assertEqual(manifest.tiles_count, 45)
+        self.assertEqual(manifest.missing_tiles_count, 29)
+        gaps = {gap.dataset_file_id: gap for gap in manifest.gaps.all()}
+        self.assertNotIn(1, gaps)
+        self.assertEqual(gaps[2].missing_tiles_count, 14)
+        self.assertEqual(gaps[2].missing_ranges, [[1, 14]])
+        self.assertEqual(gaps[3].missing_ranges, [[0, 14]])
+        missing_tiles = SpectrogramTileManifest.get_file_missing_tiles(
+            self.configuration, "sound002.wav", gaps[2].missing_ranges
+        )
+        self.assertEqual(len(missing_tiles), 14)
+        self.assertNotIn("sound002_1_0.png", missing_tiles)
+        self.assertEqual(
+            len(
+                SpectrogramTileManifest.get_file_missing_tiles(
+                    self.configuration, "sound003.wav", gaps[3].missing_ranges
+                )
+            ),
+            15,
+        )
+
+    def test_build_missing_folder(self):
+        manifest = SpectrogramTileManifest.build(
+            self.configuration, FILES[:1], self.image_folder / "unknown"
+        )
+        self.assertEqual(
+            list(manifest.gaps.values_list("dataset_file_id", "missing_ranges")),
+            [(1, [[0, 14]])],
+        )
+        self.assertEqual(
+            SpectrogramTileManifest.objects.get(
+                spectrogram_configuration=self.configuration
+            ).missing_tiles_count,
+            15,
+        )
+
+    def test_refresh(self):
+        SpectrogramTileManifest.build(self.configuration, FILES, self.image_folder)
+        self.assertIsNone(
+            SpectrogramTileManifest.refresh(self.configuration, self.image_folder)
+        )
+
+        # Tiles generated since the import
+        for tile in self.configuration.zoom_tiles("sound002"):
+            (self.image_folder / tile).touch()
+        modified_at = os.stat(self.image_folder).st_mtime_ns + 1
+        os.utime(self.image_folder, ns=(modified_at, modified_at))
+        manifest = SpectrogramTileManifest.refresh(
+            self.configuration, self.image_folder
+        )
+        # All the files of the dataset are listed
+        self.assertEqual(manifest.files_count, 11)
+        self.assertFalse(manifest.gaps.filter(dataset_file_id__in=[1, 2]).exists())
+        self.assertEqual(manifest.gaps.count(), 9)
@@ -2,5 +2,6 @@
 from .comment import (
     CreateTestCase as AnnotationResultCommentSerializerCreateTestCase,
     UpdateTestCase as AnnotationResultCommentSerializerUpdateTestCase,
+    ListUpdateTestCase as AnnotationResultCommentSerializerListUpdateTestCase,
 )
 from .result import *
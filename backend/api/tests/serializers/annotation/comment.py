@@ -136,3 +136,60 @@ class UpdateTestCase(CreateTestCase):
             dict(serializer.data),
             {"id": self.instance.id, **comment},
         )
+
+
+class ListUpdateTestCase(TestCase):
+    fixtures = all_fixtures
+
+    def setUp(self):
+        campaign = AnnotationCampaign.objects.get(pk=1)
+        file = campaign.datasets.first().files.first()
+        self.queryset = AnnotationComment.objects.filter(
+            annotation_campaign=campaign, dataset_file=file, author_id=4
+        )
+        self.queryset.delete()
+        self.kept, self.removed = AnnotationComment.objects.bulk_create(
+            AnnotationComment(
+                annotation_campaign=campaign,
+                dataset_file=file,
+                author_id=4,
+                comment=text,
+            )
+            for text in ("Kept", "Removed")
+        )
+        self.data = {**comment, "dataset_file": file.id, "annotation_result": None}
+
+    def _save(self, new_comments_count: int):
+        serializer = AnnotationCommentSerializer(
+            self.queryset,
+            data=[
+                {**self.data, "id": self.kept.id, "comment": "Updated"},
+                *[
+                    {**self.data, "comment": f"New {index}"}
+                    for index in range(new_comments_count)
+                ],
+            ],
+            many=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        # Load, update, create and delete queries within a transaction
+        with self.assertNumQueries(6):
+            serializer.save()
+        return serializer
+
+    def test_update(self):
+        serializer = self._save(new_comments_count=2)
+        self.assertEqual(
+            [item["comment"] for item in serializer.data],
+            ["Updated", "New 0", "New 1"],
+        )
+        self.assertEqual(serializer.data[0]["id"], self.kept.id)
+        self.assertEqual(
+            sorted(self.queryset.values_list("comment", flat=True)),
+            ["New 0", "New 1", "Updated"],
+        )
+        self.assertFalse(AnnotationComment.objects.filter(id=self.removed.id).exists())
+
+    def test_query_count_does_not_depend_on_items_count(self):
+        self._save(new_comments_count=20)
+        self.assertEqual(self.queryset.count(), 21)
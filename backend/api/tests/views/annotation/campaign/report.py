@@ -2,12 +2,11 @@
 import csv
 import io
 
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 
 # pylint: disable=missing-class-docstring, missing-function-docstring
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.response import Response
 from rest_framework.test import APITestCase
 
 from backend.api.views.annotation.campaign import REPORT_HEADERS
@@ -18,9 +17,10 @@ URL_check = reverse("annotation-campaign-report", kwargs={"pk": 4})
 URL_status = reverse("annotation-campaign-report-status", kwargs={"pk": 1})
 
 
-def check_report(test: APITestCase, response: Response):
+def check_report(test: APITestCase, response: StreamingHttpResponse):
     test.assertEqual(response.status_code, status.HTTP_200_OK)
-    reader = csv.reader(io.StringIO(response.content.decode("utf-8")))
+    test.assertTrue(response.streaming)
+    reader = csv.reader(io.StringIO(response.getvalue().decode("utf-8")))
     data = list(reader)
     test.assertEqual(len(data), 10)
     test.assertEqual(data[0], REPORT_HEADERS)
@@ -48,9 +48,10 @@ def check_report(test: APITestCase, response: Response):
     )
 
 
-def check_report_check(test: APITestCase, response: Response):
+def check_report_check(test: APITestCase, response: StreamingHttpResponse):
     test.assertEqual(response.status_code, status.HTTP_200_OK)
-    reader = csv.reader(io.StringIO(response.content.decode("utf-8")))
+    test.assertTrue(response.streaming)
+    reader = csv.reader(io.StringIO(response.getvalue().decode("utf-8")))
     data = list(reader)
     test.assertEqual(len(data), 2)
     test.assertEqual(data[0], REPORT_HEADERS + ["admin", "user2"])
@@ -87,9 +88,10 @@ def check_report_check(test: APITestCase, response: Response):
     )
 
 
-def check_report_status(test: APITestCase, response: HttpResponse):
+def check_report_status(test: APITestCase, response: StreamingHttpResponse):
     test.assertEqual(response.status_code, status.HTTP_200_OK)
-    reader = csv.reader(io.StringIO(response.content.decode("utf-8")))
+    test.assertTrue(response.streaming)
+    reader = csv.reader(io.StringIO(response.getvalue().decode("utf-8")))
     data = list(reader)
     test.assertEqual(len(data), 12)
     test.assertEqual(data[0], ["dataset", "filename", "admin", "user2"])
@@ -101,6 +103,11 @@ def check_report_status(test: APITestCase, response: HttpResponse):
         data[2],
         ["SPM Aural A 2010", "sound002.wav", "CREATED", "UNASSIGNED"],
     )
+    # user2 range covers the files 7 to 10
+    test.assertEqual(
+        [row[3] for row in data[1:]],
+        ["UNASSIGNED"] * 6 + ["CREATED"] * 4 + ["UNASSIGNED"],
+    )
 
 
 class ReportUnauthenticatedTestCase(APITestCase):
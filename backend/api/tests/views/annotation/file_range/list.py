@@ -4,6 +4,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from backend.api.models import AnnotationFileRange
 from backend.utils.tests import AuthenticatedTestCase, empty_fixtures, all_fixtures
 
 URL = reverse("annotation-file-range-list")
@@ -321,3 +322,41 @@ class ListFilledBaseUserAuthenticatedTestCase(AuthenticatedTestCase):
         self.assertEqual(response.data["results"][0]["id"], 7)
         self.assertEqual(response.data["results"][0]["results_count"], 3)
         self.assertEqual(response.data["results"][0]["filename"], "sound007.wav")
+
+    def test_list_for_current_user_with_files__fragmented_ranges(self):
+        for index in [0, 2, 4]:
+            AnnotationFileRange.objects.create(
+                first_file_index=index,
+                last_file_index=index,
+                annotator_id=4,
+                annotation_campaign_id=1,
+            )
+        response = self.client.get(
+            URL_files,
+            {
+                "page": 1,
+                "page_size": 100,
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [file["id"] for file in response.data["results"]], [1, 3, 5, 7, 8, 9, 10]
+        )
+
+    def test_list_for_current_user_with_files__cursor(self):
+        response = self.client.get(URL_files, {"cursor": "", "page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(response.data["resume"], 7)
+        self.assertEqual([file["id"] for file in response.data["results"]], [7, 8, 9])
+        self.assertEqual(response.data["results"][0]["results_count"], 3)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["resume"], 7)
+        self.assertEqual([file["id"] for file in response.data["results"]], [10])
+        self.assertIsNone(response.data["next"])
+
+    def test_list_for_current_user_with_files__invalid_cursor(self):
+        response = self.client.get(URL_files, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
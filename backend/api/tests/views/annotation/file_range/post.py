@@ -8,7 +8,15 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.test import APITestCase
 
-from backend.api.models import AnnotationFileRange
+from backend.api.actions.file_range_assignment import FileRangeAssignment
+from backend.api.models import (
+    AnnotationCampaign,
+    AnnotationCampaignAnnotatorFile,
+    AnnotationCampaignProgress,
+    AnnotationFileRange,
+    AnnotationTask,
+)
+from backend.aplose.models import User
 from backend.utils.tests import AuthenticatedTestCase, all_fixtures
 
 URL = reverse("annotation-file-range-campaign", kwargs={"campaign_id": 1})
@@ -236,6 +244,102 @@ class PostCampaignOwnerAuthenticatedTestCase(PostBaseUserAuthenticatedTestCase):
 
         self.assertEqual(AnnotationFileRange.objects.count(), initial_count)
 
+    def test_post_many_connected(self):
+        initial_count = AnnotationFileRange.objects.count()
+        response = self.post(
+            existing_ranges
+            + [
+                {"first_file_index": 0, "last_file_index": 1, "annotator": 4},
+                {"first_file_index": 2, "last_file_index": 3, "annotator": 4},
+                {"first_file_index": 5, "last_file_index": 5, "annotator": 4},
+                {"first_file_index": 8, "last_file_index": 10, "annotator": 4},
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ranges = AnnotationFileRange.objects.filter(
+            annotation_campaign_id=1, annotator_id=4
+        ).order_by("first_file_index")
+        self.assertEqual(
+            [(r.first_file_index, r.last_file_index) for r in ranges],
+            [(0, 3), (5, 10)],
+        )
+        self.assertEqual(ranges[1].id, 3)
+        self.assertEqual(ranges[1].files_count, 6)
+        self.assertEqual(AnnotationFileRange.objects.count(), initial_count + 1)
+
+    def test_assignment_queries_do_not_depend_on_ranges_count(self):
+        campaign = AnnotationCampaign.objects.get(pk=1)
+        annotator = User.objects.get(username="user3")
+        kept_ranges = [
+            {
+                **file_range,
+                "annotator": User.objects.get(pk=file_range["annotator"]),
+            }
+            for file_range in existing_ranges
+        ]
+        new_ranges = [
+            {
+                "first_file_index": index * 2,
+                "last_file_index": index * 2,
+                "annotator": annotator,
+            }
+            for index in range(0, 5)
+        ]
+        with self.assertNumQueries(18):
+            FileRangeAssignment(campaign).assign(kept_ranges + new_ranges[:2])
+        with self.assertNumQueries(18):
+            FileRangeAssignment(campaign).assign(kept_ranges + new_ranges)
+        self.assertEqual(
+            AnnotationFileRange.objects.filter(
+                annotation_campaign_id=1, annotator=annotator
+            ).count(),
+            5,
+        )
+
+    def test_task_cleanup_queries_do_not_depend_on_tasks_count(self):
+        campaign = AnnotationCampaign.objects.get(pk=1)
+        tasks = AnnotationTask.objects.filter(annotation_campaign_id=1, annotator_id=1)
+        for task in tasks.all():
+            task.status = AnnotationTask.Status.FINISHED
+            task.save()
+        ranges = [
+            {
+                **file_range,
+                "annotator": User.objects.get(pk=file_range["annotator"]),
+            }
+            for file_range in existing_ranges
+        ]
+
+        for last_file_index in (4, 0):
+            tasks_count = tasks.count()
+            ranges[0]["last_file_index"] = last_file_index
+            with self.assertNumQueries(20):
+                FileRangeAssignment(campaign).assign(ranges)
+            self.assertLess(tasks.count(), tasks_count)
+
+        file_range = AnnotationFileRange.objects.get(pk=1)
+        self.assertEqual(
+            tasks.filter(
+                dataset_file_id__gte=file_range.first_file_id,
+                dataset_file_id__lte=file_range.last_file_id,
+            ).count(),
+            tasks.count(),
+        )
+        self.assertEqual(
+            AnnotationCampaignAnnotatorFile.objects.filter(
+                annotation_campaign_id=1, annotator_id=1, is_submitted=True
+            ).count(),
+            tasks.count(),
+        )
+        self.assertEqual(
+            AnnotationCampaignProgress.objects.get(
+                annotation_campaign_id=1
+            ).finished_tasks_count,
+            AnnotationTask.objects.filter(
+                annotation_campaign_id=1, status=AnnotationTask.Status.FINISHED
+            ).count(),
+        )
+
     def test_post_delete_all_with_finished_task(self):
         response = self.post([])
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
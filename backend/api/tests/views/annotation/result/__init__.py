@@ -1,10 +1,15 @@
 """Annotation result tests"""
+from .detection_import import (
+    DetectionImportCampaignOwnerAuthenticatedTestCase,
+    DetectionImportAnnotatorAuthenticatedTestCase,
+)
 from .import_results import (
     ImportUnauthenticatedTestCase,
     ImportBaseUserAuthenticatedTestCase,
     ImportAnnotatorAuthenticatedTestCase,
     ImportCampaignOwnerAuthenticatedTestCase,
     ImportAdminAuthenticatedTestCase,
+    ReadCSVUploadTestCase,
 )
 from .list import (
     ListUnauthenticatedTestCase,
@@ -0,0 +1,196 @@
+"""Test DetectionImportViewSet"""
+# pylint: disable=missing-class-docstring, missing-function-docstring, duplicate-code
+import json
+import os
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from backend.api.actions.detection_import_session import (
+    restart_running_detection_imports,
+    run_detection_import,
+    _import_next_chunk,
+)
+from backend.api.models import (
+    AnnotationCampaign,
+    AnnotationCampaignUsage,
+    AnnotationResult,
+    Dataset,
+    DetectionImport,
+    LabelSet,
+)
+from backend.utils.tests import AuthenticatedTestCase
+
+URL = reverse("detection-import-list")
+IMPORT_CSV = f"{os.path.dirname(os.path.realpath(__file__))}/import_csv"
+DATASET_NAME = "SPM Aural A 2010"
+detectors_map = {"detector1": {"detector": "nnini", "configuration": "test"}}
+
+
+class DetectionImportBaseTestCase(AuthenticatedTestCase):
+    username = "user1"
+    fixtures = ["users", "datasets"]
+
+    def setUp(self):
+        super().setUp()
+        self.campaign = AnnotationCampaign.objects.create(
+            name="string",
+            desc="string",
+            instructions_url="string",
+            deadline="2022-01-30",
+            created_at="2012-01-14T00:00:00Z",
+            usage=AnnotationCampaignUsage.CHECK,
+            label_set=LabelSet.objects.create(name="string label set"),
+            owner_id=3,
+        )
+        self.campaign.datasets.add(Dataset.objects.get(pk=1))
+
+    def _post(self, filename: str):
+        with open(f"{IMPORT_CSV}/{filename}", "rb") as data:
+            return self.client.post(
+                URL,
+                {
+                    "file": SimpleUploadedFile(content=data.read(), name=filename),
+                    "annotation_campaign": self.campaign.id,
+                    "dataset_name": DATASET_NAME,
+                    "detectors_map": json.dumps(detectors_map),
+                },
+                format="multipart",
+            )
+
+
+class DetectionImportCampaignOwnerAuthenticatedTestCase(DetectionImportBaseTestCase):
+    def test_create_and_run(self):
+        old_count = AnnotationResult.objects.count()
+        response = self._post("strong_two_files_annotation.csv")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "Pending")
+        self.assertEqual(response.data["rows_count"], 1)
+        self.assertEqual(response.data["remaining_rows_count"], 1)
+        self.assertEqual(AnnotationResult.objects.count(), old_count)
+
+        detection_import = run_detection_import(response.data["id"])
+        self.assertEqual(detection_import.status, DetectionImport.Status.SUCCESS)
+        self.assertIsNone(run_detection_import(response.data["id"]))
+        self.assertEqual(AnnotationResult.objects.count(), old_count + 2)
+        self.assertFalse(detection_import.rows.exists())
+
+        response = self.client.get(
+            reverse("detection-import-detail", kwargs={"pk": detection_import.id})
+        )
+        self.assertEqual(response.data["status"], "Success")
+        self.assertEqual(response.data["processed_rows_count"], 1)
+        self.assertEqual(response.data["remaining_rows_count"], 0)
+        self.assertEqual(response.data["imported_results_count"], 2)
+
+    def test_rejected_rows(self):
+        old_count = AnnotationResult.objects.count()
+        response = self._post("mixed_valid_invalid.csv")
+        detection_import = run_detection_import(response.data["id"])
+        self.assertEqual(detection_import.status, DetectionImport.Status.SUCCESS)
+        self.assertEqual(detection_import.processed_rows_count, 3)
+        self.assertEqual(detection_import.rejected_rows_count, 1)
+        self.assertEqual(AnnotationResult.objects.count(), old_count + 2)
+
+        response = self.client.get(
+            reverse(
+                "detection-import-rejected-rows", kwargs={"pk": detection_import.id}
+            )
+        )
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["index"], 1)
+        self.assertIn("label", response.data[0]["errors"])
+
+    @override_settings(DETECTION_IMPORT_CHUNK_SIZE=1)
+    def test_resume_without_duplicates(self):
+        old_count = AnnotationResult.objects.count()
+        response = self._post("mixed_valid_invalid.csv")
+        detection_import = DetectionImport.objects.get(pk=response.data["id"])
+
+        # The import stopped after its first chunk
+        self.assertTrue(_import_next_chunk(detection_import))
+        detection_import.status = DetectionImport.Status.FAILURE
+        detection_import.save()
+        self.assertEqual(AnnotationResult.objects.count(), old_count + 1)
+
+        response = self.client.post(
+            reverse("detection-import-resume", kwargs={"pk": detection_import.id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "Pending")
+        self.assertEqual(response.data["remaining_rows_count"], 2)
+
+        detection_import = run_detection_import(detection_import.id)
+        self.assertEqual(detection_import.processed_rows_count, 3)
+        self.assertEqual(detection_import.imported_results_count, 2)
+        self.assertEqual(AnnotationResult.objects.count(), old_count + 2)
+
+    @override_settings(DETECTION_IMPORT_CHUNK_SIZE=1)
+    def test_chunk_continues_from_committed_progress(self):
+        old_count = AnnotationResult.objects.count()
+        response = self._post("mixed_valid_invalid.csv")
+        detection_import = DetectionImport.objects.get(pk=response.data["id"])
+        other_runner = DetectionImport.objects.get(pk=detection_import.id)
+
+        self.assertTrue(_import_next_chunk(detection_import))
+        # The other runner progress is outdated, it must not import the first row again
+        self.assertTrue(_import_next_chunk(other_runner))
+        self.assertEqual(other_runner.processed_rows_count, 2)
+        self.assertEqual(
+            AnnotationResult.objects.count(),
+            old_count + other_runner.imported_results_count,
+        )
+
+    def test_restart_running(self):
+        response = self._post("strong_one_file_annotation.csv")
+        detection_import = DetectionImport.objects.get(pk=response.data["id"])
+        detection_import.status = DetectionImport.Status.RUNNING
+        detection_import.heartbeat_at = timezone.now()
+        detection_import.save()
+
+        # A running import with recent progress is kept running
+        self.assertEqual(restart_running_detection_imports(), 0)
+        detection_import.refresh_from_db()
+        self.assertEqual(detection_import.status, DetectionImport.Status.RUNNING)
+
+        detection_import.heartbeat_at -= settings.DETECTION_IMPORT_STALE_DELAY
+        detection_import.save()
+        self.assertEqual(restart_running_detection_imports(), 1)
+        detection_import.refresh_from_db()
+        self.assertEqual(detection_import.status, DetectionImport.Status.PENDING)
+
+    @override_settings(DETECTION_IMPORT_CHUNK_SIZE=1)
+    def test_create_campaign_by_chunks(self):
+        response = self._post("strong_two_detections_annotation.csv")
+        detection_import = DetectionImport.objects.get(pk=response.data["id"])
+        self.assertFalse(detection_import.has_confidence_set)
+        # The campaign is used with its usage member, like when it was created in the process
+        self.campaign.usage = AnnotationCampaignUsage.CREATE
+        detection_import.annotation_campaign = self.campaign
+
+        # The first chunk creates the confidence set, the second one is validated the same way
+        while _import_next_chunk(detection_import):
+            pass
+        self.assertEqual(detection_import.rejected_rows_count, 0)
+        self.assertEqual(detection_import.imported_results_count, 2)
+        self.assertIsNotNone(self.campaign.confidence_indicator_set)
+
+    def test_resume_not_failed(self):
+        response = self._post("strong_one_file_annotation.csv")
+        response = self.client.post(
+            reverse("detection-import-resume", kwargs={"pk": response.data["id"]})
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DetectionImportAnnotatorAuthenticatedTestCase(DetectionImportBaseTestCase):
+    username = "user2"
+
+    def test_create(self):
+        response = self._post("strong_one_file_annotation.csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(DetectionImport.objects.exists())
@@ -1,8 +1,11 @@
 """Test AnnotationFileRangeViewSet"""
 # pylint: disable=missing-class-docstring, missing-function-docstring, duplicate-code, too-many-public-methods
 import os
+from unittest import mock
 
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models import QuerySet
+from django.test import SimpleTestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -13,10 +16,12 @@ from backend.api.models import (
     AnnotationCampaignUsage,
     LabelSet,
     Dataset,
+    DatasetFilesIndex,
     SpectrogramConfiguration,
     ConfidenceIndicatorSet,
 )
 from backend.utils.tests import AuthenticatedTestCase, upload_csv_file
+from backend.utils.uploads import read_csv_upload
 
 URL = reverse("annotation-result-campaign-import", kwargs={"campaign_id": 1})
 URL_unknown_campaign = reverse(
@@ -308,6 +313,50 @@ class ImportCampaignOwnerAuthenticatedTestCase(ImportBaseUserAuthenticatedTestCa
         results = AnnotationResult.objects.exclude(id__in=old_ids)
         self.__check_strong_two_files_annotation(response.data, results, campaign_id)
 
+    @mock.patch("backend.api.views.annotation.result.IMPORT_BATCH_SIZE", 1)
+    def test_post_create_campaign_by_batches(self):
+        url, campaign_id = self._get_url()
+        campaign = AnnotationCampaign.objects.get(id=campaign_id)
+        # The campaign is used with its usage member, like when it was created in the process
+        campaign.usage = AnnotationCampaignUsage.CREATE
+        old_count = AnnotationResult.objects.count()
+        with mock.patch(
+            "backend.api.views.annotation.result.get_object_or_404",
+            return_value=campaign,
+        ):
+            response = upload_csv_file(
+                self,
+                url,
+                f"{os.path.dirname(os.path.realpath(__file__))}/import_csv/strong_two_detections_annotation.csv",
+            )
+        # The first batch creates the confidence set, the second one is validated the same way
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(AnnotationResult.objects.count(), old_count + 2)
+        self.assertIsNotNone(
+            AnnotationCampaign.objects.get(id=campaign_id).confidence_indicator_set
+        )
+
+    def test_post_resolves_files_by_batch(self):
+        url, _ = self._get_url()
+        with mock.patch.object(
+            DatasetFilesIndex, "get_files", autospec=True
+        ) as get_files, mock.patch.object(
+            DatasetFilesIndex,
+            "get_files_batch",
+            autospec=True,
+            side_effect=DatasetFilesIndex.get_files_batch,
+        ) as get_files_batch:
+            response = upload_csv_file(
+                self,
+                url,
+                f"{os.path.dirname(os.path.realpath(__file__))}/import_csv/strong_two_detections_annotation.csv",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        get_files.assert_not_called()
+        get_files_batch.assert_called_once()
+        self.assertEqual(len(get_files_batch.call_args.args[1]), 2)
+
     # Errors
 
     def test_empty_post_without_is_box(self):
@@ -555,3 +604,28 @@ class ImportCampaignOwnerAuthenticatedTestCase(ImportBaseUserAuthenticatedTestCa
 
 class ImportAdminAuthenticatedTestCase(ImportCampaignOwnerAuthenticatedTestCase):
     username = "admin"
+
+
+class ReadCSVUploadTestCase(SimpleTestCase):
+    def test_read_line_endings(self):
+        content = 'label,comment\r\nbaleine,"é\r\nà"\r\nclick,ü\r\n'
+        file = SimpleUploadedFile("test.csv", content.encode())
+        self.assertEqual(
+            list(read_csv_upload(file)),
+            [
+                {"label": "baleine", "comment": "é\r\nà"},
+                {"label": "click", "comment": "ü"},
+            ],
+        )
+
+    def test_read_unicode_separators(self):
+        content = "label,comment\nbaleine,a\x0cb\u2028c\x85d\nclick,e\x1ef\n"
+        file = SimpleUploadedFile("test.csv", content.encode())
+        self.assertEqual(
+            list(read_csv_upload(file)),
+            [
+                {"label": "baleine", "comment": "a\x0cb\u2028c\x85d"},
+                {"label": "click", "comment": "e\x1ef"},
+            ],
+        )
+        self.assertFalse(file.closed)
@@ -1,3 +1,8 @@
 """API Dataset view test"""
 from .dataset_base import DatasetViewSetTestCase, DatasetViewSetUnauthenticatedTestCase
-from .datawork_import import DatasetViewSetDataworkImportTestcase
+from .datawork_import import (
+    DatasetViewSetDataworkImportTestcase,
+    DataworkCatalogueTestCase,
+    SpectroConfigsSyncTestCase,
+)
+from .datawork_import_job import DatasetImportJobViewSetTestCase
@@ -1,4 +1,11 @@
 """Dataset import tests"""
+import os
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from django.core.management import CommandError, call_command
 from django.http import HttpResponse
 from django.test import override_settings
 from django.urls import reverse
@@ -6,11 +13,20 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from backend import settings
-from backend.api.models import Dataset
+from backend.api.actions import datawork_catalogue
+from backend.api.actions.check_new_spectro_config_errors import sync_spectro_configs
+from backend.api.actions.datawork_import_job import run_import_job
+from backend.api.models import (
+    Dataset,
+    DatasetImportJob,
+    DatasetImportJobDataset,
+    SpectrogramTileManifest,
+)
 from backend.api.serializers.dataset import DATASET_FIELDS
 
 IMPORT_FIXTURES = settings.FIXTURE_DIRS[1] / "dataset" / "list_to_import"
 URL = reverse("dataset-datawork-import")
+LIST_URL = reverse("dataset-list-to-import")
 DATA_SEND = {"wanted_datasets": [{"name": "gliderSPAmsDemo"}]}
 
 
@@ -67,43 +83,35 @@ class DatasetViewSetDataworkImportTestcase(APITestCase):
     @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "porp_delph_scale")
     def test_datawork_import_for_staff_porp_delph_scale(self):
         """Check correct import of porp_delph scale"""
-        response = self.basic_import_test()
+        data = self.basic_import_test()
         self.assertEqual(
-            response.data[0]["spectros"][0]["multi_linear_frequency_scale"]["name"],
+            data["spectros"][0]["multi_linear_frequency_scale"]["name"],
             "porp_delph",
         )
         self.assertEqual(
-            len(
-                response.data[0]["spectros"][0]["multi_linear_frequency_scale"][
-                    "inner_scales"
-                ]
-            ),
+            len(data["spectros"][0]["multi_linear_frequency_scale"]["inner_scales"]),
             3,
         )
 
     @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "Dual_LF_HF_scale")
     def test_datawork_import_for_staff_dual_lf_hf_scale(self):
         """Check correct import of Dual_LF_HF scale"""
-        response = self.basic_import_test()
+        data = self.basic_import_test()
         self.assertEqual(
-            response.data[0]["spectros"][0]["multi_linear_frequency_scale"]["name"],
+            data["spectros"][0]["multi_linear_frequency_scale"]["name"],
             "dual_lf_hf",
         )
         self.assertEqual(
-            len(
-                response.data[0]["spectros"][0]["multi_linear_frequency_scale"][
-                    "inner_scales"
-                ]
-            ),
+            len(data["spectros"][0]["multi_linear_frequency_scale"]["inner_scales"]),
             2,
         )
 
     @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "Audible_scale")
     def test_datawork_import_for_staff_audible_scale(self):
         """Check correct import of Audible scale"""
-        response = self.basic_import_test()
+        data = self.basic_import_test()
         self.assertEqual(
-            response.data[0]["spectros"][0]["linear_frequency_scale"]["name"],
+            data["spectros"][0]["linear_frequency_scale"]["name"],
             "audible",
         )
 
@@ -112,18 +120,181 @@ class DatasetViewSetDataworkImportTestcase(APITestCase):
         """Check correct import of Audible scale"""
         self.basic_import_test()
 
-    def basic_import_test(self) -> HttpResponse:
-        """Basic test for dataset import for authorized user"""
+    def basic_import_test(self) -> dict:
+        """Basic test for dataset import for authorized user, returns the imported dataset"""
         old_count = Dataset.objects.count()
         self.client.login(username="staff", password="osmose29")
         response: HttpResponse = self.client.post(
             URL, DATA_SEND, format="json", follow=True
         )
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The request returns the pending job, the import is done when the job runs
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "Pending")
+        self.assertEqual(Dataset.objects.count(), old_count)
+        job = run_import_job(response.data["id"])
+        self.assertEqual(job.status, DatasetImportJob.Status.SUCCESS)
         self.assertEqual(Dataset.objects.count(), old_count + 1)
         self.assertEqual(Dataset.objects.latest("id").files.count(), 10)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(list(response.data[0].keys()), DATASET_FIELDS)
-        self.assertEqual(response.data[0]["name"], "gliderSPAmsDemo")
-        self.assertEqual(len(response.data[0]["spectros"]), 1)
-        return response
+
+        response = self.client.get(
+            reverse("dataset-detail", kwargs={"pk": Dataset.objects.latest("id").id})
+        )
+        self.assertEqual(list(response.data.keys()), DATASET_FIELDS)
+        self.assertEqual(response.data["name"], "gliderSPAmsDemo")
+        self.assertEqual(len(response.data["spectros"]), 1)
+        # Import fixtures have no spectrogram images
+        manifest = SpectrogramTileManifest.objects.get(
+            spectrogram_configuration_id=response.data["spectros"][0]["id"]
+        )
+        self.assertEqual(manifest.files_count, 10)
+        self.assertEqual(manifest.missing_tiles_count, manifest.tiles_count)
+        self.assertEqual(
+            job.datasets.get().missing_tiles_count, manifest.missing_tiles_count
+        )
+        return response.data
+
+
+class ImportFolderCopyTestCase(APITestCase):
+    """Run tests on a copy of the good import folder, so that it can be updated"""
+
+    fixtures = ["users", "datasets"]
+
+    def setUp(self):
+        self.folder = TemporaryDirectory()  # pylint: disable=consider-using-with
+        shutil.copytree(IMPORT_FIXTURES / "good", self.folder.name, dirs_exist_ok=True)
+        self.import_folder = override_settings(
+            DATASET_IMPORT_FOLDER=Path(self.folder.name)
+        )
+        self.import_folder.enable()
+        self.client.login(username="staff", password="osmose29")
+
+    def tearDown(self):
+        self.client.logout()
+        self.import_folder.disable()
+        self.folder.cleanup()
+
+
+class DataworkCatalogueTestCase(ImportFolderCopyTestCase):
+    """Test datasets.csv is parsed again only when it changes"""
+
+    def test_list_to_import_cached(self):
+        """Dataset view 'list_to_import' doesn't read an unchanged datasets.csv again"""
+        self.client.get(LIST_URL)
+        with mock.patch.object(
+            datawork_catalogue, "open", create=True, side_effect=open
+        ) as mocked_open:
+            response = self.client.get(LIST_URL)
+        mocked_open.assert_not_called()
+        self.assertEqual([d["name"] for d in response.data], ["gliderSPAmsDemo"])
+
+    def test_list_to_import_changed(self):
+        """Dataset view 'list_to_import' reads datasets.csv again once it changes"""
+        self.client.get(LIST_URL)
+        with open(
+            os.path.join(self.folder.name, "datasets.csv"), "a", encoding="utf-8"
+        ) as csvfile:
+            csvfile.write("otherDemo,otherDemo,600,480,.wav,\n")
+        response = self.client.get(LIST_URL)
+        self.assertEqual(
+            [d["name"] for d in response.data], ["gliderSPAmsDemo", "otherDemo"]
+        )
+
+
+class TileManifestsRefreshTestCase(ImportFolderCopyTestCase):
+    """Test tile manifests are built again once the tiles folder changes"""
+
+    def test_command(self):
+        """Manifests are built again when tiles are generated after the import"""
+        response = self.client.post(URL, DATA_SEND, format="json")
+        run_import_job(response.data["id"])
+        job_dataset = DatasetImportJobDataset.objects.get(job_id=response.data["id"])
+        configuration = job_dataset.dataset.spectro_configs.get()
+        manifest = configuration.tile_manifest
+        self.assertEqual(job_dataset.missing_tiles_count, manifest.tiles_count)
+
+        # Tiles of the first file are generated after the import
+        image_folder = (
+            Path(self.folder.name)
+            / "gliderSPAmsDemo"
+            / settings.DATASET_SPECTRO_FOLDER
+            / "600_480"
+            / configuration.name
+            / "image"
+        )
+        image_folder.mkdir(parents=True)
+        dataset_file = job_dataset.dataset.files.order_by("id").first()
+        for tile in configuration.zoom_tiles(
+            SpectrogramTileManifest.get_tile_name(dataset_file.filename)
+        ):
+            (image_folder / tile).touch()
+        call_command("refresh_tile_manifests", "--dataset", job_dataset.dataset.name)
+        manifest.refresh_from_db()
+        self.assertEqual(manifest.files_count, 10)
+        self.assertEqual(
+            manifest.missing_tiles_count,
+            manifest.tiles_count - manifest.tiles_count // 10,
+        )
+        self.assertFalse(manifest.gaps.filter(dataset_file=dataset_file).exists())
+
+        # Unchanged folders are skipped
+        created_at = manifest.created_at
+        call_command("refresh_tile_manifests")
+        manifest.refresh_from_db()
+        self.assertEqual(manifest.created_at, created_at)
+
+
+class SpectroConfigsSyncTestCase(ImportFolderCopyTestCase):
+    """Test spectro configs are synced only for changed spectrogram folders"""
+
+    def setUp(self):
+        super().setUp()
+        self.dataset = Dataset.objects.create(
+            name="gliderSPAmsDemo (600_480)",
+            dataset_path="datawork/dataset/gliderSPAmsDemo",
+            dataset_conf="600_480",
+            status=1,
+            files_type=".wav",
+            owner_id=1,
+        )
+        self.metadata_path = (
+            Path(self.folder.name)
+            / "gliderSPAmsDemo"
+            / settings.DATASET_SPECTRO_FOLDER
+            / "600_480"
+            / "4096_512_85"
+            / "metadata.csv"
+        )
+
+    def test_sync(self):
+        """Configurations are created, then unchanged folders are skipped"""
+        datasets, errors = sync_spectro_configs()
+        self.assertEqual(datasets, [self.dataset])
+        self.assertEqual(errors, [])
+        configuration = self.dataset.spectro_configs.get()
+        self.assertEqual(configuration.name, "4096_512_0.85")
+        self.assertEqual(configuration.zoom_level, 8)
+        self.assertEqual(configuration.window_type.name, "Hamming")
+
+        # Only the datasets are listed
+        with self.assertNumQueries(1):
+            datasets, _ = sync_spectro_configs()
+        self.assertEqual(datasets, [])
+
+    def test_sync_changed(self):
+        """Configurations of changed folders are updated"""
+        sync_spectro_configs()
+        content = self.metadata_path.read_text(encoding="utf-8")
+        self.metadata_path.write_text(
+            content.replace(",0.85,8,", ",0.85,9,"), encoding="utf-8"
+        )
+        datasets, _ = sync_spectro_configs()
+        self.assertEqual(datasets, [self.dataset])
+        self.assertEqual(self.dataset.spectro_configs.get().zoom_level, 9)
+
+    def test_command_missing_folder(self):
+        """The command reports the datasets which folders can't be read"""
+        self.dataset.dataset_conf = "missing"
+        self.dataset.save()
+        with self.assertRaises(CommandError):
+            call_command("sync_spectro_configs", "--force")
+        self.assertFalse(self.dataset.spectro_configs.exists())
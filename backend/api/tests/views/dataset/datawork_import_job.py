@@ -0,0 +1,183 @@
+"""Dataset import job tests"""
+from unittest import mock
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from backend import settings
+from backend.api.actions.datawork_import import get_datasets_to_import, import_dataset
+from backend.api.actions.datawork_import_job import run_import_job
+from backend.api.models import (
+    AudioMetadatum,
+    Dataset,
+    DatasetImportJob,
+    SpectrogramTileManifest,
+)
+from backend.aplose.models import User
+
+IMPORT_FIXTURES = settings.FIXTURE_DIRS[1] / "dataset" / "list_to_import"
+URL = reverse("dataset-import-job-list")
+DATA_SEND = {"wanted_datasets": [{"name": "gliderSPAmsDemo"}]}
+
+
+class DatasetImportJobViewSetTestCase(APITestCase):
+    """Test DatasetImportJobViewSet"""
+
+    fixtures = ["users", "datasets"]
+
+    def tearDown(self):
+        """Logout when tests ends"""
+        self.client.logout()
+
+    def test_request_unauthenticated(self):
+        """Unauthenticated request is unauthorized"""
+        response = self.client.post(URL, DATA_SEND, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good")
+    def test_create_for_user(self):
+        """Import jobs are forbidden for non-staff"""
+        self.client.login(username="user1", password="osmose29")
+        response = self.client.post(URL, DATA_SEND, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good")
+    def test_create_and_run_for_staff(self):
+        """Job creation returns immediately, the import is done when the job runs"""
+        old_count = Dataset.objects.count()
+        self.client.login(username="staff", password="osmose29")
+        response = self.client.post(URL, DATA_SEND, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "Pending")
+        self.assertEqual(len(response.data["datasets"]), 1)
+        self.assertEqual(response.data["datasets"][0]["name"], "gliderSPAmsDemo")
+        self.assertEqual(Dataset.objects.count(), old_count)
+
+        job = run_import_job(response.data["id"])
+        self.assertEqual(job.status, DatasetImportJob.Status.SUCCESS)
+        self.assertIsNone(run_import_job(response.data["id"]))
+        self.assertEqual(Dataset.objects.count(), old_count + 1)
+        self.assertEqual(Dataset.objects.latest("id").files.count(), 10)
+
+        response = self.client.get(
+            reverse("dataset-import-job-detail", kwargs={"pk": job.id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "Success")
+        self.assertEqual(response.data["datasets"][0]["status"], "Success")
+        self.assertEqual(response.data["datasets"][0]["imported_files_count"], 10)
+        self.assertEqual(
+            response.data["datasets"][0]["dataset"], Dataset.objects.latest("id").id
+        )
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "missing_csv_columns")
+    def test_create_for_staff_missing_csv_columns(self):
+        """Job creation returns a 'CSV column missing' message when datasets.csv is malformed"""
+        self.client.login(username="staff", password="osmose29")
+        response: HttpResponse = self.client.post(URL, DATA_SEND, format="json")
+        self.assertContains(
+            response,
+            "One of the import CSV is missing the following column : 'dataset'",
+            status_code=400,
+        )
+        self.assertFalse(DatasetImportJob.objects.exists())
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good")
+    def test_run_with_missing_dataset_files(self):
+        """A dataset failing to import is reported and cleaned"""
+        old_count = Dataset.objects.count()
+        self.client.login(username="staff", password="osmose29")
+        response = self.client.post(URL, DATA_SEND, format="json")
+        job = DatasetImportJob.objects.get(pk=response.data["id"])
+        job.datasets.update(csv_data={"dataset": "gliderSPAmsDemo"})
+
+        job = run_import_job(job.id)
+        self.assertEqual(job.status, DatasetImportJob.Status.FAILURE)
+        job_dataset = job.datasets.first()
+        self.assertEqual(job_dataset.status, DatasetImportJob.Status.FAILURE)
+        self.assertIn("missing the following column", job_dataset.error)
+        self.assertEqual(Dataset.objects.count(), old_count)
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good")
+    def test_run_with_unexpected_error(self):
+        """A dataset failing with any error is reported and its partial import is cleaned"""
+        old_count = Dataset.objects.count()
+        old_audio_count = AudioMetadatum.objects.count()
+        self.client.login(username="staff", password="osmose29")
+        response = self.client.post(URL, DATA_SEND, format="json")
+
+        with mock.patch.object(
+            SpectrogramTileManifest, "build", side_effect=RuntimeError("Unexpected")
+        ):
+            job = run_import_job(response.data["id"])
+        self.assertEqual(job.status, DatasetImportJob.Status.FAILURE)
+        job_dataset = job.datasets.first()
+        self.assertEqual(job_dataset.status, DatasetImportJob.Status.FAILURE)
+        self.assertEqual(job_dataset.error, "Unexpected")
+        self.assertIsNone(job_dataset.dataset)
+        self.assertEqual(Dataset.objects.count(), old_count)
+        self.assertEqual(AudioMetadatum.objects.count(), old_audio_count)
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good")
+    def test_run_with_dataset_imported_meanwhile(self):
+        """A dataset imported since the job creation is not imported nor removed"""
+        self.client.login(username="staff", password="osmose29")
+        response = self.client.post(URL, DATA_SEND, format="json")
+        dataset = import_dataset(
+            get_datasets_to_import(["gliderSPAmsDemo"])[0],
+            User.objects.get(username="staff"),
+        )
+
+        job = run_import_job(response.data["id"])
+        self.assertEqual(job.status, DatasetImportJob.Status.FAILURE)
+        self.assertIn("already imported", job.datasets.first().error)
+        self.assertTrue(Dataset.objects.filter(id=dataset.id).exists())
+
+    @override_settings(DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good")
+    def test_restart_running(self):
+        """Jobs left running are imported again, without their partial import"""
+        old_count = Dataset.objects.count()
+        self.client.login(username="staff", password="osmose29")
+        response = self.client.post(URL, DATA_SEND, format="json")
+        job = DatasetImportJob.objects.get(pk=response.data["id"])
+        # The worker stopped after the dataset creation
+        with mock.patch.object(
+            SpectrogramTileManifest, "build", side_effect=SystemExit
+        ), self.assertRaises(SystemExit):
+            run_import_job(job.id)
+        self.assertEqual(Dataset.objects.count(), old_count + 1)
+
+        call_command("run_dataset_import_jobs")
+        job.refresh_from_db()
+        self.assertEqual(job.status, DatasetImportJob.Status.RUNNING)
+
+        # The job may still be running in another process until it gets stale
+        call_command("run_dataset_import_jobs", "--restart-running")
+        job.refresh_from_db()
+        self.assertEqual(job.status, DatasetImportJob.Status.RUNNING)
+
+        job.heartbeat_at -= settings.DATASET_IMPORT_JOB_STALE_DELAY
+        job.save()
+        call_command("run_dataset_import_jobs", "--restart-running")
+        job.refresh_from_db()
+        self.assertEqual(job.status, DatasetImportJob.Status.SUCCESS)
+        self.assertEqual(Dataset.objects.count(), old_count + 1)
+        self.assertEqual(job.datasets.first().dataset.files.count(), 10)
+
+    @override_settings(
+        DATASET_IMPORT_FOLDER=IMPORT_FIXTURES / "good",
+        DATASET_IMPORT_FILES_BATCH_SIZE=4,
+    )
+    def test_import_dataset_by_batches(self):
+        """Dataset files are inserted by bounded batches and progress is reported for each"""
+        dataset = get_datasets_to_import(["gliderSPAmsDemo"])[0]
+        progress = []
+        imported = import_dataset(
+            dataset, User.objects.get(username="staff"), progress.append
+        )
+        self.assertEqual(progress, [4, 8, 10])
+        self.assertEqual(imported.files.count(), 10)
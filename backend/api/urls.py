@@ -3,11 +3,13 @@ from rest_framework import routers
 
 from backend.api.views import (
     DatasetViewSet,
+    DatasetImportJobViewSet,
     LabelSetViewSet,
     AnnotationCampaignViewSet,
     AnnotationCommentViewSet,
     ConfidenceIndicatorSetViewSet,
     DetectorViewSet,
+    DetectionImportViewSet,
     AnnotationFileRangeViewSet,
     AnnotationResultViewSet,
     AudioMetadatumViewSet,
@@ -18,6 +20,9 @@ from backend.api.views import (
 # API urls are meant to be used by our React frontend
 api_router = routers.DefaultRouter()
 api_router.register(r"dataset", DatasetViewSet, basename="dataset")
+api_router.register(
+    r"dataset-import-job", DatasetImportJobViewSet, basename="dataset-import-job"
+)
 api_router.register(r"dataset-file", DatasetFileViewSet, basename="dataset-file")
 api_router.register(r"detector", DetectorViewSet, basename="detector")
 api_router.register(r"label-set", LabelSetViewSet, basename="label-set")
@@ -32,6 +37,9 @@ api_router.register(
 api_router.register(
     r"annotation-result", AnnotationResultViewSet, basename="annotation-result"
 )
+api_router.register(
+    r"detection-import", DetectionImportViewSet, basename="detection-import"
+)
 api_router.register(
     r"annotation-comment", AnnotationCommentViewSet, basename="annotation-comment"
 )
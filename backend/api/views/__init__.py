@@ -4,6 +4,6 @@ DRF views module based on viewsets
 
 from backend.api.views.label_set import LabelSetViewSet
 from backend.api.views.confidence_indicators import ConfidenceIndicatorSetViewSet
-from backend.api.views.dataset import DatasetViewSet
+from backend.api.views.dataset import DatasetViewSet, DatasetImportJobViewSet
 from .annotation import *
 from .data import *
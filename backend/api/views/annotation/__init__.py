@@ -1,6 +1,7 @@
 """Annotation related views"""
 from .campaign import AnnotationCampaignViewSet
 from .comment import AnnotationCommentViewSet
+from .detection_import import DetectionImportViewSet
 from .detector import DetectorViewSet
 from .file_range import AnnotationFileRangeViewSet
 from .result import AnnotationResultViewSet
@@ -1,5 +1,7 @@
 """Annotation campaign DRF-Viewset file"""
-import csv
+from collections import defaultdict
+from itertools import chain, islice
+from typing import Iterator
 
 from django.db import models, transaction
 from django.db.models import (
@@ -13,15 +15,16 @@ from django.db.models import (
     QuerySet,
     Subquery,
     Prefetch,
+    FilteredRelation,
 )
-from django.db.models.functions import Lower, Concat, Extract
-from django.http import HttpResponse
+from django.db.models.functions import Lower, Concat, Extract, Coalesce
 from rest_framework import viewsets, status, filters, permissions, mixins
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.utils.serializer_helpers import ReturnDict
 
+from backend.api.actions.file_range_assignment import RangeBounds, merge_ranges
 from backend.api.models import (
     AnnotationCampaign,
     AnnotationResult,
@@ -29,7 +32,6 @@ from backend.api.models import (
     AnnotationTask,
     AnnotationComment,
     AnnotationFileRange,
-    DatasetFile,
 )
 from backend.api.models.annotation.result import AnnotationResultType
 from backend.api.serializers import (
@@ -42,6 +44,7 @@ from backend.aplose.models import User
 from backend.aplose.models.user import ExpertiseLevel
 from backend.utils.filters import ModelFilter
 from backend.utils.renderers import CSVRenderer
+from backend.utils.responses import CSVStreamingResponse
 
 REPORT_HEADERS = [  # headers
     "dataset",
@@ -69,6 +72,7 @@ REPORT_HEADERS = [  # headers
     "signal_trend",
     "signal_steps_count",
 ]
+REPORT_CHUNK_SIZE = 2000
 
 
 class CampaignAccessFilter(filters.BaseFilterBackend):
@@ -116,37 +120,21 @@ class AnnotationCampaignViewSet(
         queryset = (
             super()
             .get_queryset()
-            .extra(
-                select={
-                    "files_count": """
-                        SELECT count(*) FROM dataset_files f
-                        LEFT JOIN annotation_campaigns_datasets d on d.dataset_id = f.dataset_id
-                        WHERE d.annotationcampaign_id = annotation_campaigns.id
-                    """,
-                    "my_progress": """
-                        SELECT count(*) FROM api_annotationtask t
-                        WHERE t.annotation_campaign_id = annotation_campaigns.id AND t.annotator_id = %s AND t.status = 'F'
-                    """,
-                    "my_total": """
-                        SELECT case when total notnull then total else 0 end as data FROM 
-                            (SELECT sum(files_count) as total FROM api_annotationfilerange r
-                            WHERE r.annotation_campaign_id = annotation_campaigns.id AND r.annotator_id = %s) as info
-                    """,
-                    "progress": """
-                        SELECT count(*) FROM api_annotationtask t
-                        WHERE t.annotation_campaign_id = annotation_campaigns.id AND t.status = 'F'
-                    """,
-                    "total": """
-                        SELECT case when total notnull then total else 0 end as data FROM 
-                            (SELECT sum(files_count) as total FROM api_annotationfilerange r
-                            WHERE r.annotation_campaign_id = annotation_campaigns.id) as info
-                    """,
-                },
-                select_params=(
-                    self.request.user.id,
-                    self.request.user.id,
+            .annotate(
+                my_progress_counter=FilteredRelation(
+                    "annotator_progress_counters",
+                    condition=Q(
+                        annotator_progress_counters__annotator_id=self.request.user.id
+                    ),
                 ),
             )
+            .annotate(
+                files_count=Coalesce(F("progress_counter__files_count"), 0),
+                my_progress=Coalesce(F("my_progress_counter__finished_tasks_count"), 0),
+                my_total=Coalesce(F("my_progress_counter__assigned_files_count"), 0),
+                progress=Coalesce(F("progress_counter__finished_tasks_count"), 0),
+                total=Coalesce(F("progress_counter__assigned_files_count"), 0),
+            )
             .order_by("name")
         )
         return queryset.distinct()
@@ -217,7 +205,6 @@ class AnnotationCampaignViewSet(
                 "comments__author",
             )
             .order_by("dataset_file__start", "dataset_file__id", "id")
-            .distinct()
             .annotate(
                 dataset=F("dataset_file__dataset__name"),
                 filename=F("dataset_file__filename"),
@@ -318,7 +305,6 @@ class AnnotationCampaignViewSet(
                 ],
                 "annotator__username",
                 "comments_data",
-                "validations",
                 "_start_time",
                 "_end_time",
                 "_start_frequency",
@@ -399,6 +385,29 @@ class AnnotationCampaignViewSet(
             )
         )
 
+    @staticmethod
+    def _report_add_validations(
+        results: QuerySet[AnnotationResult], validate_users: list[str]
+    ) -> Iterator[dict]:
+        """Add validation columns to result rows, fetching validations once for each chunk of results"""
+        rows = results.iterator(chunk_size=REPORT_CHUNK_SIZE)
+        while chunk := list(islice(rows, REPORT_CHUNK_SIZE)):
+            validations: dict[int, dict[str, bool]] = defaultdict(dict)
+            for result_id, user, is_valid in AnnotationResultValidation.objects.filter(
+                result_id__in=[row["id"] for row in chunk],
+                is_valid__isnull=False,
+            ).values_list("result_id", "annotator__username", "is_valid"):
+                # A positive validation wins over a negative one
+                validations[result_id][user] = (
+                    validations[result_id].get(user, False) or is_valid
+                )
+            for row in chunk:
+                result_validations = validations[row.pop("id")]
+                yield {
+                    **row,
+                    **{user: result_validations.get(user) for user in validate_users},
+                }
+
     @action(
         detail=True,
         url_path="report",
@@ -410,10 +419,6 @@ class AnnotationCampaignViewSet(
         # pylint: disable=unused-argument
         campaign: AnnotationCampaign = self.get_object()
 
-        response = HttpResponse(content_type="text/csv")
-        filename = f"{campaign.name.replace(' ', '_')}_status.csv"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
         validate_users = list(
             AnnotationResultValidation.objects.filter(
                 result__annotation_campaign=campaign
@@ -426,30 +431,8 @@ class AnnotationCampaignViewSet(
 
         # CSV
         headers = REPORT_HEADERS + validate_users
-        writer = csv.DictWriter(response, fieldnames=headers)
-        writer.writeheader()
-
-        def map_validations(user: str) -> [str, Case]:
-            validation_sub = AnnotationResultValidation.objects.filter(
-                annotator__username=user,
-                result_id=OuterRef("id"),
-            )
 
-            query = Case(
-                When(Exists(Subquery(validation_sub.filter(is_valid=True))), then=True),
-                When(
-                    Exists(Subquery(validation_sub.filter(is_valid=False))), then=False
-                ),
-                default=None,
-                output_field=models.BooleanField(null=True),
-            )
-            return [user, query]
-
-        results = (
-            self._report_get_results()
-            .annotate(**dict(map(map_validations, validate_users)))
-            .values(*headers)
-        )
+        results = self._report_get_results().values("id", *REPORT_HEADERS)
         comments = self._report_get_task_comments().values(
             "dataset",
             "filename",
@@ -459,9 +442,15 @@ class AnnotationCampaignViewSet(
             "comments",
         )
 
-        writer.writerows(list(results) + list(comments))
-
-        return response
+        # Rows are fetched through server-side cursors and written as they come
+        return CSVStreamingResponse(
+            rows=chain(
+                self._report_add_validations(results, validate_users),
+                comments.iterator(chunk_size=REPORT_CHUNK_SIZE),
+            ),
+            fieldnames=headers,
+            filename=f"{campaign.name.replace(' ', '_')}_status.csv",
+        )
 
     @action(
         detail=True,
@@ -474,58 +463,77 @@ class AnnotationCampaignViewSet(
         # pylint: disable=unused-argument
         campaign: AnnotationCampaign = self.get_object()
 
-        response = HttpResponse(content_type="text/csv")
-        filename = f"{campaign.name.replace(' ', '_')}_status.csv"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-        # Headers
-        header = ["dataset", "filename"]
-        file_ranges: QuerySet[AnnotationFileRange] = campaign.annotation_file_ranges
-        annotators = (
-            file_ranges.values("annotator__username")
+        annotators: list[tuple[int, str]] = list(
+            campaign.annotation_file_ranges.values_list(
+                "annotator_id", "annotator__username"
+            )
             .distinct()
             .order_by(Lower("annotator__username"))
-            .values_list("annotator__username", flat=True)
-        )
-        header += annotators
-        writer = csv.DictWriter(response, fieldnames=header)
-        writer.writeheader()
-
-        # Content
-        all_files: QuerySet[DatasetFile] = campaign.get_sorted_files().select_related(
-            "dataset"
         )
-        finished_tasks: QuerySet[AnnotationTask] = campaign.tasks.filter(
-            status=AnnotationTask.Status.FINISHED,
+        return CSVStreamingResponse(
+            rows=self._report_status_rows(campaign, annotators),
+            fieldnames=["dataset", "filename"]
+            + [username for _, username in annotators],
+            filename=f"{campaign.name.replace(' ', '_')}_status.csv",
         )
 
-        def map_annotators(user: str) -> [str, Case]:
-            task_sub = finished_tasks.filter(
-                dataset_file_id=OuterRef("pk"), annotator__username=user
-            )
-            range_sub = file_ranges.filter(
-                first_file_id__lte=OuterRef("pk"),
-                last_file_id__gte=OuterRef("pk"),
-                annotator__username=user,
-            )
-            query = Case(
-                When(Exists(Subquery(task_sub)), then=models.Value("FINISHED")),
-                When(Exists(Subquery(range_sub)), then=models.Value("CREATED")),
-                default=models.Value("UNASSIGNED"),
-                output_field=models.CharField(),
-            )
-            return [user, query]
-
-        data = dict(map(map_annotators, annotators))
-
-        writer.writerows(
-            list(
-                all_files.values("dataset__name", "filename", "pk")
-                .annotate(dataset=F("dataset__name"), **data)
-                .values(*header)
+    @staticmethod
+    def _report_status_rows(
+        campaign: AnnotationCampaign, annotators: list[tuple[int, str]]
+    ) -> Iterator[dict]:
+        """
+        Sweep once over the sorted files of the campaign. For each annotator, the merged ranges are
+        walked along the files positions and finished tasks are looked up in an in-memory set.
+        """
+        ranges: dict[int, list[RangeBounds]] = defaultdict(list)
+        for (
+            annotator_id,
+            first_index,
+            last_index,
+        ) in campaign.annotation_file_ranges.values_list(
+            "annotator_id", "first_file_index", "last_file_index"
+        ):
+            ranges[annotator_id].append(
+                RangeBounds(first_index, last_index, frozenset())
             )
+        merged_ranges = {
+            annotator_id: merge_ranges(annotator_ranges)
+            for annotator_id, annotator_ranges in ranges.items()
+        }
+        finished_files: dict[int, set[int]] = defaultdict(set)
+        for annotator_id, file_id in campaign.tasks.filter(
+            status=AnnotationTask.Status.FINISHED
+        ).values_list("annotator_id", "dataset_file_id"):
+            finished_files[annotator_id].add(file_id)
+
+        # Position of the current or next range of each annotator
+        range_positions = {annotator_id: 0 for annotator_id, _ in annotators}
+        files = (
+            campaign.get_sorted_files()
+            .values_list("id", "dataset__name", "filename")
+            .iterator(chunk_size=REPORT_CHUNK_SIZE)
         )
-        return response
+        for index, (file_id, dataset, filename) in enumerate(files):
+            row = {"dataset": dataset, "filename": filename}
+            for annotator_id, username in annotators:
+                annotator_ranges = merged_ranges[annotator_id]
+                position = range_positions[annotator_id]
+                while (
+                    position < len(annotator_ranges)
+                    and annotator_ranges[position].last_file_index < index
+                ):
+                    position += 1
+                range_positions[annotator_id] = position
+                if file_id in finished_files[annotator_id]:
+                    row[username] = "FINISHED"
+                elif (
+                    position < len(annotator_ranges)
+                    and annotator_ranges[position].first_file_index <= index
+                ):
+                    row[username] = "CREATED"
+                else:
+                    row[username] = "UNASSIGNED"
+            yield row
 
     @action(
         detail=True,
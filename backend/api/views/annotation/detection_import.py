@@ -0,0 +1,79 @@
+"""Detection import viewset"""
+from django.db.models import Q
+from rest_framework import viewsets, mixins, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from backend.api.actions.detection_import_session import (
+    create_detection_import,
+    resume_detection_import,
+    submit_detection_import,
+)
+from backend.api.models import DetectionImport
+from backend.api.serializers import (
+    DetectionImportSerializer,
+    DetectionImportRowSerializer,
+)
+
+
+class DetectionImportViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Detection imports processed in background by committed chunks,
+    creation returns immediately with the pending import
+    """
+
+    serializer_class = DetectionImportSerializer
+    queryset = DetectionImport.objects.select_related("owner")
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(
+            Q(owner=self.request.user) | Q(annotation_campaign__owner=self.request.user)
+        )
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        campaign = serializer.validated_data["annotation_campaign"]
+        if campaign.owner_id != request.user.id and not request.user.is_staff:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        detection_import = create_detection_import(
+            file=serializer.validated_data["file"],
+            campaign=campaign,
+            owner=request.user,
+            dataset_name=serializer.validated_data["dataset_name"],
+            detectors_map=serializer.validated_data["detectors_map"],
+            force=serializer.validated_data.get("force", False),
+        )
+        submit_detection_import(detection_import)
+        return Response(
+            self.get_serializer(detection_import).data, status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(methods=["POST"], detail=True)
+    def resume(self, request, pk: int = None):
+        """Resume a failed import where it stopped"""
+        # pylint: disable=unused-argument
+        detection_import: DetectionImport = self.get_object()
+        if not resume_detection_import(detection_import):
+            return Response(
+                "Only failed imports can be resumed", status=status.HTTP_400_BAD_REQUEST
+            )
+        detection_import.refresh_from_db()
+        return Response(
+            self.get_serializer(detection_import).data, status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(detail=True)
+    def rejected_rows(self, request, pk: int = None):
+        """Rows which couldn't be imported, with their errors"""
+        # pylint: disable=unused-argument
+        detection_import: DetectionImport = self.get_object()
+        serializer = DetectionImportRowSerializer(
+            detection_import.rows.filter(errors__isnull=False), many=True
+        )
+        return Response(serializer.data)
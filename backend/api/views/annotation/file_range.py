@@ -1,4 +1,6 @@
 """Viewset for annotation file range"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
 from typing import Optional
 
 from django.db.models import (
@@ -6,16 +8,18 @@ from django.db.models import (
     Q,
     Exists,
     OuterRef,
-    Count,
 )
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, BasePagination
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from backend.api.models import (
+    AnnotationCampaignAnnotatorFile,
     AnnotationFileRange,
     AnnotationCampaign,
     AnnotationTask,
@@ -35,28 +39,17 @@ class AnnotationFileRangeFilesFilter(filters.BaseFilterBackend):
         self, request: Request, queryset: QuerySet[AnnotationFileRange], view
     ) -> QuerySet[DatasetFile]:
         """Get filtered dataset files"""
-        if not queryset.exists():
-            return DatasetFile.objects.none()
-        campaign_ids = queryset.values_list("annotation_campaign", flat=True)
-
-        id_filter = None
-        for file_range in queryset:
-            file_range_filter = Q(
-                id__gte=file_range.first_file_id, id__lte=file_range.last_file_id
-            )
-            if id_filter is None:
-                id_filter = file_range_filter
-            else:
-                id_filter = id_filter | file_range_filter
-
-        if id_filter is None:
-            return DatasetFile.objects.none()
-
+        # Single correlated join on the ranges: SQL size doesn't depend on the number of ranges
+        file_ranges = AnnotationFileRange.objects.filter(
+            id__in=queryset.values("id"),
+            annotation_campaign__datasets=OuterRef("dataset_id"),
+            first_file_id__lte=OuterRef("id"),
+            last_file_id__gte=OuterRef("id"),
+        )
         files = (
             DatasetFile.objects.select_related("dataset")
             .prefetch_related("dataset__annotation_campaigns")
-            .filter(dataset__annotation_campaigns__in=campaign_ids)
-            .filter(id_filter)
+            .filter(Exists(file_ranges))
         )
 
         files: QuerySet[DatasetFile] = ModelFilter().filter_queryset(
@@ -113,6 +106,89 @@ class AnnotationFilePagination(PageNumberPagination):
         return Response(response)
 
 
+class AnnotationFileCursorPagination(BasePagination):
+    # pylint: disable=abstract-method
+    """
+    Keyset pagination on the files (start, id) ordering: a page is read from the position of
+    the last file of the previous page instead of counting and skipping all previous files
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.request: Optional[Request] = None
+        self.next_position: Optional[tuple[datetime, int]] = None
+
+    @staticmethod
+    def is_requested(request: Request) -> bool:
+        """Cursor pagination is used when a cursor is given, an empty cursor stands for the first page"""
+        return AnnotationFileCursorPagination.cursor_query_param in request.query_params
+
+    @staticmethod
+    def encode_cursor(position: tuple[datetime, int]) -> str:
+        """Encode file position"""
+        start, file_id = position
+        return urlsafe_b64encode(f"{start.isoformat()}|{file_id}".encode()).decode()
+
+    def decode_cursor(self, request: Request) -> Optional[tuple[datetime, int]]:
+        """Decode file position from request, None for the first page"""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            start, file_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(start), int(file_id)
+        except (TypeError, ValueError) as error:
+            raise NotFound(self.invalid_cursor_message) from error
+
+    def get_page_size(self, request: Request) -> int:
+        """Get requested page size"""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return page_size if page_size > 0 else self.page_size
+
+    def paginate_queryset(self, queryset: QuerySet[DatasetFile], request, view=None):
+        """Files following the cursor position, queryset must be ordered by start and id"""
+        self.request = request
+        position = self.decode_cursor(request)
+        if position is not None:
+            start, file_id = position
+            queryset = queryset.filter(
+                Q(start__gt=start) | Q(start=start, id__gt=file_id)
+            )
+        page_size = self.get_page_size(request)
+        files = list(queryset[: page_size + 1])
+        page = files[:page_size]
+        self.next_position = (
+            (page[-1].start, page[-1].id) if len(files) > page_size else None
+        )
+        return page
+
+    def get_next_link(self) -> Optional[str]:
+        """Get next page link"""
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def get_paginated_response(self, data, next_file: Optional[int] = None):
+        response = {
+            "next": self.get_next_link(),
+            "results": data,
+        }
+        if next_file:
+            response["resume"] = next_file
+        return Response(response)
+
+
 class AnnotationFileRangeFilter(filters.BaseFilterBackend):
     """Filter comment access base on user"""
 
@@ -184,32 +260,27 @@ class AnnotationFileRangeViewSet(viewsets.ReadOnlyModelViewSet):
             self.get_queryset()
         ).filter(annotator_id=self.request.user.id, annotation_campaign_id=campaign_id)
 
+        AnnotationCampaignAnnotatorFile.refresh_if_outdated(campaign_id)
         files: QuerySet[DatasetFile] = (
             AnnotationFileRangeFilesFilter()
             .filter_queryset(request, queryset, self)
             .select_related("dataset", "dataset__audio_metadatum")
-            .annotate(
-                is_submitted=Exists(
-                    AnnotationTask.objects.filter(
-                        dataset_file_id=OuterRef("pk"),
-                        annotation_campaign_id=campaign_id,
-                        annotator_id=self.request.user.id,
-                        status=AnnotationTask.Status.FINISHED,
-                    )
-                ),
-                results_count=Count(
-                    "annotation_results",
-                    filter=Q(
-                        annotation_results__annotation_campaign_id=campaign_id,
-                    )
-                    & (
-                        Q(annotation_results__annotator_id=self.request.user.id)
-                        | Q(annotation_results__detector_configuration__isnull=False)
-                    ),
-                ),
-            )
+            # Filters on results can duplicate files
+            .distinct()
+        )
+        files = AnnotationCampaignAnnotatorFile.annotate_files(
+            files, campaign_id, self.request.user.id
         )
         next_file = files.filter(is_submitted=False).first()
+        if AnnotationFileCursorPagination.is_requested(request):
+            paginator = AnnotationFileCursorPagination()
+            serializer = FileRangeDatasetFileSerializer(
+                paginator.paginate_queryset(files, request, self), many=True
+            )
+            return paginator.get_paginated_response(
+                serializer.data,
+                next_file=next_file.id if next_file is not None else None,
+            )
         paginated_files = self.paginate_queryset(files)
         if paginated_files is not None:
             files = files.filter(id__in=[file.id for file in paginated_files])
@@ -251,7 +322,8 @@ class AnnotationFileRangeViewSet(viewsets.ReadOnlyModelViewSet):
             campaign.annotation_file_ranges,
             data=data,
             context={
-                "force": request.data["force"] if "force" in request.data else False
+                "force": request.data["force"] if "force" in request.data else False,
+                "campaign": campaign,
             },
             many=True,
         )
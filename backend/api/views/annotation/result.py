@@ -1,8 +1,8 @@
 """Annotation result viewset"""
 import ast
-import csv
-from io import StringIO
+from itertools import islice
 
+from django.db import transaction
 from django.db.models import QuerySet, Q
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, permissions, filters, status, mixins
@@ -10,6 +10,10 @@ from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from backend.api.actions.detection_import import (
+    IMPORT_BATCH_SIZE,
+    map_detection_rows,
+)
 from backend.api.models import (
     AnnotationResult,
     AnnotationCampaign,
@@ -21,6 +25,7 @@ from backend.api.serializers import (
 )
 from backend.utils.filters import ModelFilter, get_boolean_query_param
 from backend.utils.serializers import FileUploadSerializer
+from backend.utils.uploads import read_csv_upload
 
 
 # pylint: disable=duplicate-code
@@ -150,62 +155,44 @@ class AnnotationResultViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
 
         force = get_boolean_query_param(self.request, "force")
 
-        dataset_name = request.query_params.get("dataset_name")
-        detectors_map = ast.literal_eval(request.query_params.get("detectors_map"))
-
-        decoded_file = file.read().decode()
-        io_string = StringIO(decoded_file)
-        reader = csv.DictReader(io_string)
-        data = []
-        for row in reader:
-            annotator = row["annotator"] if "annotator" in row else None
-            if annotator not in detectors_map:
-                continue
-            detector_map = detectors_map[annotator] if annotator else None
-            confidence_level = (
-                row["confidence_indicator_level"]
-                if "confidence_indicator_level" in row
-                else None
-            )
-            detector = annotator
-            if detector_map and "detector" in detector_map and detector_map["detector"]:
-                detector = detector_map["detector"]
-            data.append(
-                {
-                    "is_box": row["is_box"],
-                    "dataset": dataset_name,
-                    "detector": detector,
-                    "detector_config": detector_map["configuration"]
-                    if detector_map and "configuration" in detector_map
-                    else None,
-                    "start_datetime": row["start_datetime"],
-                    "end_datetime": row["end_datetime"],
-                    "min_frequency": row["start_frequency"],
-                    "max_frequency": row["end_frequency"]
-                    if row["end_frequency"] != ""
-                    else None,
-                    "label": row["annotation"],
-                    "confidence_indicator": {
-                        "label": row["confidence_indicator_label"],
-                        "level": confidence_level.split("/")[0],
-                    }
-                    if "confidence_indicator_label" in row
-                    and row["confidence_indicator_label"]
-                    and confidence_level
-                    else None,
-                    "annotation_campaign": campaign_id,
-                }
-            )
-
-        # Execute import
-        serializer = AnnotationResultImportListSerializer(
-            data=data,
-            context={
-                "campaign": campaign,
-                "force": force,
-            },
+        detections = map_detection_rows(
+            read_csv_upload(file),
+            dataset_name=request.query_params.get("dataset_name"),
+            detectors_map=ast.literal_eval(request.query_params.get("detectors_map")),
+            campaign_id=campaign.id,
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        list_serializer = self.get_serializer_class()(serializer.instance, many=True)
-        return Response(list_serializer.data, status=status.HTTP_201_CREATED)
+
+        # Execute import, the upload is validated and inserted by batches
+        # The response keeps the created results or the errors of every row, as clients rely on them:
+        # large files should be imported through detection imports instead
+        errors = []
+        results = []
+        validated_count = 0
+        context = {
+            "campaign": campaign,
+            "force": force,
+            "has_confidence_set": campaign.confidence_indicator_set_id is not None,
+        }
+        with transaction.atomic():
+            while batch := list(islice(detections, IMPORT_BATCH_SIZE)):
+                serializer = AnnotationResultImportListSerializer(
+                    data=batch, context=context
+                )
+                if not serializer.is_valid():
+                    # Keep errors aligned with the rows of the whole file
+                    errors += [{}] * (validated_count - len(errors))
+                    errors += serializer.errors
+                elif not errors:
+                    serializer.save()
+                    # Created results are serialized with their batch, not reloaded all at once
+                    results += self.get_serializer_class()(
+                        serializer.instance, many=True
+                    ).data
+                validated_count += len(batch)
+            if errors:
+                errors += [{}] * (validated_count - len(errors))
+                transaction.set_rollback(True)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(results, status=status.HTTP_201_CREATED)
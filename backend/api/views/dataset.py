@@ -1,20 +1,20 @@
 """Dataset DRF-Viewset file"""
-import csv
 
-from django.conf import settings
-from django.db.models import Count, OuterRef, Subquery
-from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
-from rest_framework import viewsets
+from django.db.models import Count
+from django.http import HttpResponse, HttpResponseBadRequest
+from rest_framework import viewsets, mixins, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from sentry_sdk import capture_exception
 
-from backend.api.actions import datawork_import
-from backend.api.actions.check_new_spectro_config_errors import (
-    check_new_spectro_config_errors,
+from backend.api.actions.datawork_catalogue import get_datasets_catalogue
+from backend.api.actions.datawork_import_job import (
+    create_import_job,
+    submit_import_job,
 )
-from backend.api.models import Dataset
+from backend.api.models import Dataset, DatasetImportJob
 from backend.api.serializers import DatasetSerializer
+from backend.api.serializers.dataset import DatasetImportJobSerializer
 from backend.utils.filters import ModelFilter
 
 
@@ -55,19 +55,15 @@ class DatasetViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False)
     def list_to_import(self, request):
         """list dataset in datasets.csv"""
-        dataset_names = Dataset.objects.values_list("name", flat=True)
-        new_datasets = []
+        dataset_names = set(Dataset.objects.values_list("name", flat=True))
 
         # Check for new datasets
         try:
-            with open(
-                settings.DATASET_IMPORT_FOLDER / settings.DATASET_FILE, encoding="utf-8"
-            ) as csvfile:
-                dataset: dict
-                for dataset in csv.DictReader(csvfile):
-                    dataset["name"] = dataset["dataset"]
-                    if dataset["name"] not in dataset_names:
-                        new_datasets.append(dataset)
+            new_datasets = [
+                dataset
+                for dataset in get_datasets_catalogue()
+                if dataset["name"] not in dataset_names
+            ]
         except FileNotFoundError as error:
             capture_exception(error)
             return HttpResponse(error, status=400)
@@ -83,37 +79,55 @@ class DatasetViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=["POST"])
     def datawork_import(self, request):
-        """Import new datasets from datawork"""
+        """
+        Deprecated: use dataset-import-job.
+        Import new datasets from datawork, the import is processed in background by a job
+        """
         if not request.user.is_staff:
             return HttpResponse("Forbidden", status=403)
+        return create_import_job_response(request)
 
-        try:
-            new_datasets = datawork_import(
-                wanted_datasets=request.data["wanted_datasets"],
-                importer=request.user,
-            )
-        except KeyError as error:
-            print("[datawork_import] > KeyError")
-            capture_exception(error)
-            return HttpResponse(
-                f"One of the import CSV is missing the following column : {error}",
-                status=400,
-            )
-        except (FileNotFoundError, PermissionError, ValueError) as error:
-            print("[datawork_import] > ValueError")
-            capture_exception(error)
-            return HttpResponse(error, status=400)
 
-        queryset = new_datasets.annotate(
-            files_count=Count("files"),
-            type=Subquery(
-                new_datasets.filter(pk=OuterRef("pk")).values("dataset_type__name")[:1]
-            ),
+def create_import_job_response(request) -> Response:
+    """Create the import job of the requested datasets and submit it, returns the pending job"""
+    serializer = DatasetImportJobSerializer(
+        data=request.data, context={"request": request}
+    )
+    serializer.is_valid(raise_exception=True)
+    try:
+        job = create_import_job(
+            wanted_datasets=serializer.validated_data["wanted_datasets"],
+            importer=request.user,
+        )
+    except KeyError as error:
+        print("[datawork_import] > KeyError")
+        capture_exception(error)
+        return HttpResponse(
+            f"One of the import CSV is missing the following column : {error}",
+            status=400,
         )
-        serializer = self.serializer_class(queryset, many=True)
+    except (FileNotFoundError, PermissionError, ValueError) as error:
+        print("[datawork_import] > ValueError")
+        capture_exception(error)
+        return HttpResponse(error, status=400)
 
-        errors = check_new_spectro_config_errors()
-        if errors:
-            return JsonResponse(errors, status=400)
+    submit_import_job(job)
+    return Response(
+        DatasetImportJobSerializer(job, context={"request": request}).data,
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+class DatasetImportJobViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Datawork imports processed in background, creation returns immediately with the pending job
+    """
+
+    serializer_class = DatasetImportJobSerializer
+    queryset = DatasetImportJob.objects.select_related("owner").prefetch_related(
+        "datasets"
+    )
+    permission_classes = (permissions.IsAdminUser,)
 
-        return Response(serializer.data)
+    def create(self, request, *args, **kwargs):
+        return create_import_job_response(request)
@@ -1,5 +1,8 @@
 """Aplose views test case"""
 from .annotator import (
+    GetAnnotatorAuthenticatedTestCase,
+    GetBaseUserAuthenticatedTestCase,
+    GetUnauthenticatedTestCase,
     PostAnnotatorAuthenticatedEmptyResultsTestCase,
     PostUnauthenticatedTestCase,
     PostAdminAuthenticatedTestCase,
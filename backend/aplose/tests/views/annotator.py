@@ -7,8 +7,11 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from backend.api.models import (
+    AnnotationCampaignAnnotatorFile,
     AnnotationResult,
     AnnotationComment,
+    SpectrogramTileGap,
+    SpectrogramTileManifest,
 )
 from backend.utils.tests import AuthenticatedTestCase, all_fixtures
 
@@ -151,6 +154,15 @@ class PostAnnotatorAuthenticatedEmptyResultsTestCase(PostBaseUserAuthenticatedTe
         self.assertEqual(len(response.data["results"]), 0)
         self.assertEqual(len(response.data["task_comments"]), 0)
 
+    def test_post_not_assigned_file(self):
+        # File 5 is only in the admin range
+        response = self.client.post(
+            reverse("annotator-campaign-file", kwargs={"campaign_id": 1, "file_id": 5}),
+            data=json.dumps(empty_data),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_post_all(self):
         result_old_count = AnnotationResult.objects.count()
         comment_old_count = AnnotationComment.objects.count()
@@ -166,3 +178,107 @@ class PostAnnotatorAuthenticatedEmptyResultsTestCase(PostBaseUserAuthenticatedTe
         self._check_presence(response.data["results"][0], presence, 9)
         self._check_box(response.data["results"][1], box, 9)
         self.assertEqual(comment.comment, "Test A")
+
+        state = AnnotationCampaignAnnotatorFile.objects.get(
+            annotation_campaign_id=1, annotator_id=4, dataset_file_id=9
+        )
+        self.assertTrue(state.is_submitted)
+        self.assertEqual(state.results_count, 2)
+
+
+class GetUnauthenticatedTestCase(APITestCase):
+    def test_unauthenticated(self):
+        response = self.client.get(URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class GetBaseUserAuthenticatedTestCase(AuthenticatedTestCase):
+    username = "user3"
+    fixtures = all_fixtures
+
+    def test_get_unknown_campaign(self):
+        response = self.client.get(URL_unknown_campaign)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_unknown_file(self):
+        response = self.client.get(URL_unknown_file)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get(self):
+        response = self.client.get(URL_with_annotations)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["is_assigned"])
+        self.assertEqual(response.data["file"]["id"], 7)
+        self.assertEqual(len(response.data["results"]), 0)
+        self.assertEqual(response.data["total_tasks"], 0)
+        self.assertIsNone(response.data["next_file_id"])
+
+
+class GetAnnotatorAuthenticatedTestCase(AuthenticatedTestCase):
+    username = "user2"
+    fixtures = all_fixtures
+
+    def test_get(self):
+        response = self.client.get(URL_with_annotations)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_assigned"])
+        self.assertFalse(response.data["is_submitted"])
+        self.assertEqual(response.data["file"]["id"], 7)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(len(response.data["task_comments"]), 0)
+        self.assertEqual(len(response.data["spectrogram_configurations"]), 1)
+        self.assertEqual(response.data["current_task_index"], 0)
+        self.assertEqual(response.data["total_tasks"], 4)
+        self.assertIsNone(response.data["previous_file_id"])
+        self.assertEqual(response.data["next_file_id"], 8)
+        self.assertIsNone(
+            response.data["spectrogram_configurations"][0]["tile_manifest"]
+        )
+
+    def test_get_tile_manifest(self):
+        manifest = SpectrogramTileManifest.objects.create(
+            spectrogram_configuration_id=1
+        )
+        SpectrogramTileGap.objects.bulk_create(
+            [
+                SpectrogramTileGap(
+                    manifest=manifest,
+                    dataset_file_id=7,
+                    missing_tiles_count=1,
+                    missing_ranges=[[14, 14]],
+                ),
+                SpectrogramTileGap(
+                    manifest=manifest,
+                    dataset_file_id=8,
+                    missing_tiles_count=15,
+                    missing_ranges=[[0, 14]],
+                ),
+            ]
+        )
+        response = self.client.get(URL_with_annotations)
+        self.assertEqual(
+            response.data["spectrogram_configurations"][0]["tile_manifest"],
+            {"missing_tiles": ["sound007_8_7.png"]},
+        )
+        response = self.client.get(URL)
+        self.assertEqual(
+            response.data["spectrogram_configurations"][0]["tile_manifest"],
+            {"missing_tiles": []},
+        )
+
+    def test_get_filtered(self):
+        response = self.client.get(URL, {"with_user_annotations": True}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["current_task_index"], 2)
+        self.assertEqual(response.data["current_task_index_in_filter"], 2)
+        self.assertEqual(response.data["total_tasks_in_filter"], 2)
+        self.assertEqual(response.data["previous_file_id"], 8)
+        self.assertIsNone(response.data["next_file_id"])
+
+    def test_get_num_queries(self):
+        # Session and user, then a fixed number of queries for the payload
+        with self.assertNumQueries(11):
+            self.client.get(URL)
+        # Comments and validations of the results are prefetched
+        with self.assertNumQueries(13):
+            self.client.get(URL_with_annotations)
@@ -1,20 +1,21 @@
 """Annotator viewset"""
 
+from django.conf import settings
 from django.db import transaction
-
-# pylint: disable=protected-access
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from backend.api.actions.annotator_file import AnnotatorFilePayload
 from backend.api.models import (
     AnnotationCampaign,
+    AnnotationCampaignAnnotatorFile,
+    AnnotationFileRange,
+    AnnotationSession,
     DatasetFile,
     AnnotationTask,
-    AnnotationFileRange,
 )
 from backend.api.serializers import (
     AnnotationSessionSerializer,
@@ -22,8 +23,6 @@ from backend.api.serializers import (
 from backend.api.views import (
     AnnotationCommentViewSet,
     AnnotationResultViewSet,
-    DatasetFileViewSet,
-    SpectrogramConfigurationViewSet,
 )
 from backend.api.views.annotation.file_range import AnnotationFileRangeFilesFilter
 
@@ -39,115 +38,13 @@ class AnnotatorViewSet(viewsets.ViewSet):
         url_name="campaign-file",
     )
     def get_file(self, request: Request, campaign_id: int, file_id: int):
-        # pylint: disable=too-many-locals
         """Get all data for annotator"""
-
-        campaign = AnnotationCampaign.objects.get(pk=campaign_id)
-        file_ranges = AnnotationFileRange.objects.filter(
-            annotation_campaign_id=campaign_id,
-            annotator_id=request.user.id,
-        )
-        is_assigned = (
-            campaign.archive is None
-            and file_ranges.filter(
-                first_file_id__lte=file_id,
-                last_file_id__gte=file_id,
-            ).exists()
-        )
+        payload = AnnotatorFilePayload(campaign_id, file_id, request.user)
         filtered_files = AnnotationFileRangeFilesFilter().filter_queryset(
-            request, file_ranges, self
+            request, payload.file_ranges, self
         )
-
-        # User previous results
-        results = []
-        task_comments = []
-        current_task_index = 0
-        current_task_index_in_filter = 0
-        next_file = None
-        previous_file = None
-        total_tasks = 0
-        total_tasks_in_filter = 0
-        if is_assigned:
-            total_tasks_in_filter = filtered_files.count()
-            request._request.GET = {
-                "annotation_campaign_id": campaign_id,
-                "dataset_file_id": file_id,
-                "for_current_user": True,
-            }
-            results = AnnotationResultViewSet.as_view({"get": "list"})(
-                request._request
-            ).data
-            request._request.GET = {
-                "annotation_campaign_id": campaign_id,
-                "dataset_file_id": file_id,
-                "annotation_result__isnull": True,
-                "for_current_user": True,
-            }
-            task_comments = AnnotationCommentViewSet.as_view({"get": "list"})(
-                request._request
-            ).data
-
-            current_file = DatasetFile.objects.get(pk=file_id)
-
-            min_id = min(file_ranges.values_list("first_file_id", flat=True))
-            max_id = max(file_ranges.values_list("last_file_id", flat=True))
-
-            all_files = DatasetFile.objects.filter(
-                dataset__annotation_campaigns=campaign_id,
-                id__gte=min_id,
-                id__lte=max_id,
-            )
-            total_tasks = all_files.count()
-
-            previous_file: DatasetFile = filtered_files.filter(
-                Q(start__lt=current_file.start)
-                | Q(start=current_file.start, id__lt=current_file.id)
-            ).last()
-            next_file = filtered_files.filter(
-                Q(start__gt=current_file.start)
-                | Q(start=current_file.start, id__gt=current_file.id)
-            ).first()
-
-            index_filter = Q(start__lt=current_file.start) | Q(
-                start=current_file.start, id__lt=current_file.id
-            )
-
-            current_task_index_in_filter = filtered_files.filter(index_filter).count()
-            current_task_index = all_files.filter(index_filter).count()
-
-        # Spectrogram configurations
-        request._request.GET = {
-            "annotation_campaigns__id": campaign_id,
-        }
-        spectrogram_configurations = SpectrogramConfigurationViewSet.as_view(
-            {"get": "list"}
-        )(request._request).data
-
         return Response(
-            {
-                "current_task_index_in_filter": current_task_index_in_filter,
-                "total_tasks_in_filter": total_tasks_in_filter,
-                "current_task_index": current_task_index,
-                "total_tasks": total_tasks,
-                "is_submitted": AnnotationTask.objects.filter(
-                    annotation_campaign_id=campaign_id,
-                    dataset_file_id=file_id,
-                    annotator_id=request.user.id,
-                    status=AnnotationTask.Status.FINISHED,
-                ).exists(),
-                "file": DatasetFileViewSet.as_view({"get": "retrieve"})(
-                    request._request,
-                    pk=file_id,
-                ).data,
-                "results": results,
-                "task_comments": task_comments,
-                "spectrogram_configurations": spectrogram_configurations,
-                "previous_file_id": previous_file.id
-                if previous_file is not None
-                else None,
-                "next_file_id": next_file.id if next_file is not None else None,
-                "is_assigned": is_assigned,
-            },
+            payload.get_data(filtered_files),
             status=status.HTTP_200_OK,
         )
 
@@ -164,15 +61,7 @@ class AnnotatorViewSet(viewsets.ViewSet):
         # Check permission
         campaign = get_object_or_404(AnnotationCampaign, id=campaign_id)
         file = get_object_or_404(DatasetFile, id=file_id)
-        file_ranges = campaign.annotation_file_ranges.filter(
-            annotator_id=request.user.id
-        )
-        if not file_ranges.exists():
-            return Response(status=status.HTTP_403_FORBIDDEN)
-        all_files = []
-        for file_range in file_ranges:
-            all_files += list(file_range.get_files())
-        if file not in all_files:
+        if not AnnotationFileRange.is_file_assigned(campaign.id, request.user.id, file):
             return Response(status=status.HTTP_403_FORBIDDEN)
 
         # Update
@@ -193,6 +82,10 @@ class AnnotatorViewSet(viewsets.ViewSet):
         )
         task.status = AnnotationTask.Status.FINISHED
         task.save()
+        # Results are saved in bulk, without signals
+        AnnotationCampaignAnnotatorFile.refresh_results_count(
+            campaign.id, request.user.id, file.id
+        )
         session_serializer = AnnotationSessionSerializer(
             data={
                 **request.data["session"],
@@ -205,6 +98,10 @@ class AnnotatorViewSet(viewsets.ViewSet):
         )
         session_serializer.is_valid(raise_exception=True)
         session_serializer.save()
+        if settings.ANNOTATION_SESSION_OUTPUT_RETENTION is not None:
+            AnnotationSession.compact(
+                settings.ANNOTATION_SESSION_OUTPUT_RETENTION, task_ids=[task.id]
+            )
 
         return Response(
             {
@@ -8,3 +8,10 @@ class OsmoseWebsiteConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "backend.osmosewebsite"
     verbose_name = "OSmOSE website"
+
+    def ready(self):
+        """Connect the cache invalidation once all models are loaded"""
+        # pylint: disable=import-outside-toplevel
+        from .models.website_cache import connect_website_cache_invalidation
+
+        connect_website_cache_invalidation()
@@ -5,3 +5,9 @@ from .collaborator import Collaborator
 from .news import News
 from .scientific_talk import ScientificTalk
 from .project import Project
+from .website_cache import get_website_cache_version, clear_website_cache
+from .deployment_labels import (
+    get_deployments_annotated_labels,
+    get_deployments_labels_version,
+    clear_deployments_annotated_labels,
+)
@@ -0,0 +1,70 @@
+"""Annotated labels of metadatax deployments, shown on the website map"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import signals, Count, F
+from django.dispatch import receiver
+
+from backend.api.models import AnnotationResult, Dataset, Label
+from .website_cache import bump_cache_version, get_cache_version
+
+DEPLOYMENTS_LABELS_CACHE_KEY = "osmosewebsite:deployments_annotated_labels"
+DEPLOYMENTS_LABELS_VERSION_KEY = "osmosewebsite:deployments_labels_version"
+
+
+def _count_deployments_annotated_labels() -> dict[int, dict[str, int]]:
+    """Count the annotated labels of all deployments in a single grouped query"""
+    deployment_field = (
+        "annotation_campaign__datasets__related_channel_configuration__deployment_id"
+    )
+    counts: dict[int, dict[str, int]] = defaultdict(dict)
+    for deployment_id, label, total in (
+        AnnotationResult.objects.filter(**{f"{deployment_field}__isnull": False})
+        .order_by()
+        .values(deployment=F(deployment_field), label_name=F("label__name"))
+        .annotate(total=Count("id"))
+        .values_list("deployment", "label_name", "total")
+    ):
+        counts[deployment_id][label] = total
+    return dict(counts)
+
+
+def get_deployments_annotated_labels() -> dict[int, dict[str, int]]:
+    """Annotated labels count of each deployment, recomputed when the cache expires or is cleared"""
+    return cache.get_or_set(
+        DEPLOYMENTS_LABELS_CACHE_KEY,
+        _count_deployments_annotated_labels,
+        settings.WEBSITE_DEPLOYMENTS_LABELS_CACHE_TIMEOUT,
+    )
+
+
+def get_deployments_labels_version() -> int:
+    """Version of the annotated labels counts, for the cached responses showing them"""
+    return get_cache_version(DEPLOYMENTS_LABELS_VERSION_KEY)
+
+
+def clear_deployments_annotated_labels():
+    """Invalidate the cached annotated labels counts, and only the responses showing them"""
+    cache.delete(DEPLOYMENTS_LABELS_CACHE_KEY)
+    bump_cache_version(DEPLOYMENTS_LABELS_VERSION_KEY)
+
+
+@receiver(signal=signals.post_save, sender=AnnotationResult)
+@receiver(signal=signals.post_save, sender=Label)
+def clear_labels_on_change(sender, **kwargs):
+    """
+    Results saved or deleted in bulk, and deleted results, are counted when the cache expires:
+    a delete receiver would prevent the fast deletes of results
+    """
+    # pylint: disable=unused-argument
+    clear_deployments_annotated_labels()
+
+
+@receiver(
+    signal=signals.m2m_changed, sender=Dataset.related_channel_configuration.through
+)
+def clear_labels_on_channels_change(sender, **kwargs):
+    """Datasets linked to other deployments"""
+    # pylint: disable=unused-argument
+    clear_deployments_annotated_labels()
@@ -0,0 +1,54 @@
+"""Invalidation of the cached website responses"""
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import signals
+
+WEBSITE_CACHE_VERSION_KEY = "osmosewebsite:responses_version"
+# Apps which models are shown on the website
+WEBSITE_APPS = ("osmosewebsite", "metadatax")
+
+
+def get_cache_version(key: str) -> int:
+    """Current version stored at the given key, changed on each invalidation"""
+    return cache.get_or_set(key, 0, None)
+
+
+def bump_cache_version(key: str):
+    """Change the version stored at the given key"""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_website_cache_version() -> int:
+    """Current version of the cached responses, changed on each invalidation"""
+    return get_cache_version(WEBSITE_CACHE_VERSION_KEY)
+
+
+def clear_website_cache():
+    """Invalidate all cached website responses"""
+    bump_cache_version(WEBSITE_CACHE_VERSION_KEY)
+
+
+def clear_website_cache_on_change(sender, **kwargs):
+    """Website contents are updated, including through the admin"""
+    # pylint: disable=unused-argument
+    clear_website_cache()
+
+
+def connect_website_cache_invalidation():
+    """
+    Connect the website models changes to the cache invalidation.
+    Receivers are connected per model: a receiver for all senders would prevent
+    the fast deletes of every other model.
+    """
+    for app_label in WEBSITE_APPS:
+        app_config = apps.get_app_config(app_label)
+        for model in app_config.get_models(include_auto_created=True):
+            # pylint: disable=protected-access
+            if model._meta.auto_created:
+                signals.m2m_changed.connect(clear_website_cache_on_change, model)
+            else:
+                signals.post_save.connect(clear_website_cache_on_change, model)
+                signals.post_delete.connect(clear_website_cache_on_change, model)
@@ -2,5 +2,9 @@
 from .team_member import TeamMemberSerializer
 from .collaborator import CollaboratorSerializer
 from .news import NewsSerializer
-from .project import ProjectSerializer, DeploymentSerializer
+from .project import (
+    ProjectSerializer,
+    DeploymentSerializer,
+    DeploymentSummarySerializer,
+)
 from .scientific_talk import ScientificTalkSerializer
@@ -1,17 +1,14 @@
 """Project DRF serializers file"""
-from collections import Counter
-
-from metadatax.models import Deployment
+from metadatax.models import Deployment, Project as MetadataxProject
 from metadatax.serializers.acquisition import (
     DeploymentSerializerWithChannel,
     ProjectSerializer as SourceMetadataxProjectSerializer,
 )
 from rest_framework import serializers
 
-from backend.osmosewebsite.models import Project
+from backend.osmosewebsite.models import Project, get_deployments_annotated_labels
 from .collaborator import CollaboratorSerializer
 from .team_member import TeamMemberSerializer
-from ...api.models import AnnotationResult
 
 ProjectFields = [
     "id",
@@ -26,6 +23,20 @@ ProjectFields = [
     "collaborators",
 ]
 
+DeploymentSummaryFields = [
+    "id",
+    "name",
+    "longitude",
+    "latitude",
+    "deployment_date",
+    "recovery_date",
+    "project",
+    "site",
+    "campaign",
+    "sampling_frequencies",
+    "annotated_labels",
+]
+
 
 class ProjectSerializer(serializers.ModelSerializer):
     """Serializer meant to output Project data"""
@@ -44,20 +55,57 @@ class MetadataxProjectSerializer(SourceMetadataxProjectSerializer):
     website_project = serializers.PrimaryKeyRelatedField(read_only=True)
 
 
-class DeploymentSerializer(DeploymentSerializerWithChannel):
-    """Add project to basic Deployment serializer"""
+class AnnotatedLabelsMixin(serializers.Serializer):
+    """Add the annotated labels counts of the deployment"""
 
-    project = MetadataxProjectSerializer()
+    # pylint: disable=abstract-method
 
     annotated_labels = serializers.SerializerMethodField(read_only=True)
 
-    def get_annotated_labels(self, deployment: Deployment):
+    def get_annotated_labels(self, deployment: Deployment) -> dict[str, int]:
         """Get annotated_labels related to the deployment"""
-        all_channels = deployment.channelconfiguration_set.all()
-        return dict(
-            Counter(
-                AnnotationResult.objects.filter(
-                    annotation_campaign__datasets__related_channel_configuration__in=all_channels
-                ).values_list("label__name", flat=True)
-            )
+        # Counts of all deployments can be given by the view
+        annotated_labels = self.context.get("annotated_labels")
+        if annotated_labels is None:
+            annotated_labels = get_deployments_annotated_labels()
+        return annotated_labels.get(deployment.id, {})
+
+
+class DeploymentSerializer(AnnotatedLabelsMixin, DeploymentSerializerWithChannel):
+    """Add project to basic Deployment serializer"""
+
+    project = MetadataxProjectSerializer()
+
+
+class DeploymentProjectSummarySerializer(serializers.ModelSerializer):
+    """Project fields shown with a deployment summary"""
+
+    website_project = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta:
+        model = MetadataxProject
+        fields = ["id", "name", "accessibility", "website_project"]
+
+
+class DeploymentSummarySerializer(AnnotatedLabelsMixin, serializers.ModelSerializer):
+    """Deployment fields needed to display it on a map, without its equipment"""
+
+    project = DeploymentProjectSummarySerializer(read_only=True)
+    site = serializers.CharField(source="site.name", read_only=True, allow_null=True)
+    campaign = serializers.CharField(
+        source="campaign.name", read_only=True, allow_null=True
+    )
+    sampling_frequencies = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = Deployment
+        fields = DeploymentSummaryFields
+
+    def get_sampling_frequencies(self, deployment: Deployment) -> list[int]:
+        """Sampling frequencies of the deployment channels"""
+        return sorted(
+            {
+                channel.sampling_frequency
+                for channel in deployment.channelconfiguration_set.all()
+            }
         )
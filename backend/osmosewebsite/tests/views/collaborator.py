@@ -5,6 +5,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from backend.osmosewebsite.models import clear_website_cache
 from backend.osmosewebsite.serializers.collaborator import CollaboratorFields
 
 
@@ -13,6 +14,9 @@ class CollaboratorViewSetTestCase(APITestCase):
 
     fixtures = ["collaborator"]
 
+    def setUp(self):
+        clear_website_cache()
+
     def test_list(self):
         """CollaboratorViewSet 'list' returns list of Collaborator"""
         url = reverse("collaborators-list")
@@ -5,6 +5,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from backend.osmosewebsite.models import News, clear_website_cache
 from backend.osmosewebsite.serializers.news import NewsFields
 
 
@@ -20,6 +21,9 @@ class NewsViewSetTestCase(APITestCase):
         "thumbnail": "string",
     }
 
+    def setUp(self):
+        clear_website_cache()
+
     def test_list(self):
         """NewsViewSet 'list' returns list of news"""
         url = reverse("news-list")
@@ -75,3 +79,44 @@ class NewsViewSetTestCase(APITestCase):
             "Her order another who company step office. Garden space various suddenly. Character large standard "
             "attention. Pass time special according role carry base.",
         )
+
+    def test_list_cached(self):
+        """NewsViewSet 'list' is cached for anonymous users until news change"""
+        url = reverse("news-list")
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url)
+        self.assertEqual(cached_response.data, response.data)
+
+        News.objects.filter(pk=1).first().delete()
+        response = self.client.get(url)
+        self.assertEqual(len(response.data), 1)
+
+    def test_list_cached_by_query(self):
+        """NewsViewSet 'list' cache is keyed on the query"""
+        url = reverse("news-list")
+        self.client.get(url)
+        response = self.client.get(url, {"page": 1, "page_size": 1})
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_list_not_modified(self):
+        """NewsViewSet 'list' answers If-None-Match with the cached ETag"""
+        url = reverse("news-list")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        News.objects.create(**{**self.creation_data, "date": "2022-01-25"})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_authenticated_not_cached(self):
+        """NewsViewSet 'list' is not cached for authenticated users"""
+        url = reverse("news-list")
+        self.client.login(username="admin", password="osmose29")
+        self.client.get(url)
+        News.objects.filter(pk=1).update(title="updated")
+        response = self.client.get(url)
+        self.assertIn("updated", [news["title"] for news in response.data])
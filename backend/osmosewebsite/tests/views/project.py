@@ -1,11 +1,21 @@
 """Project DRF-Viewset test file"""
+from collections import Counter
 
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from backend.osmosewebsite.serializers.project import ProjectFields
+from backend.api.models import AnnotationResult, Dataset
+from backend.osmosewebsite.models import (
+    clear_deployments_annotated_labels,
+    clear_website_cache,
+)
+from backend.osmosewebsite.serializers.project import (
+    ProjectFields,
+    DeploymentSummaryFields,
+)
+from backend.utils.tests import all_fixtures
 
 
 class ProjectViewSetTestCase(APITestCase):
@@ -13,6 +23,9 @@ class ProjectViewSetTestCase(APITestCase):
 
     fixtures = ["project"]
 
+    def setUp(self):
+        clear_website_cache()
+
     def test_list(self):
         """ProjectViewSet 'list' returns list of Project"""
         url = reverse("projects-list")
@@ -31,3 +44,63 @@ class ProjectViewSetTestCase(APITestCase):
         self.assertEqual(list(response.data), ProjectFields)
         self.assertEqual(response.data["title"], "title1")
         self.assertEqual(response.data["body"], "body1")
+
+
+class ProjectDeploymentsTestCase(APITestCase):
+    """Test ProjectViewSet deployments actions"""
+
+    fixtures = all_fixtures + ["project", "deployments"]
+
+    def setUp(self):
+        clear_deployments_annotated_labels()
+        Dataset.objects.get(pk=1).related_channel_configuration.add(1)
+
+    def test_all_deployments(self):
+        """ProjectViewSet 'deployments' returns open deployments with their annotated labels"""
+        url = reverse("projects-deployments")
+        with self.assertNumQueries(10):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        deployments = {deployment["id"]: deployment for deployment in response.data}
+        labels_count = Counter(
+            AnnotationResult.objects.filter(
+                annotation_campaign__datasets__id=1
+            ).values_list("label__name", flat=True)
+        )
+        self.assertEqual(deployments[1]["annotated_labels"], dict(labels_count))
+        self.assertEqual(deployments[2]["annotated_labels"], {})
+
+    def test_all_deployments_cached(self):
+        """Annotated labels are counted once until results change"""
+        url = reverse("projects-deployments")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        # Only the response is invalidated
+        clear_website_cache()
+        with self.assertNumQueries(9):
+            self.client.get(url)
+        # Result changes clear the counts and the deployments responses only
+        news_url = reverse("news-list")
+        self.client.get(news_url)
+        AnnotationResult.objects.filter(annotation_campaign_id=1).first().save()
+        with self.assertNumQueries(10):
+            self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(news_url)
+
+    def test_deployments_summary(self):
+        """ProjectViewSet 'deployments summary' returns only the map fields"""
+        url = reverse("projects-deployments-summary")
+        # Deployments, their channels and the annotated labels counts
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        deployment = next(d for d in response.data if d["id"] == 1)
+        self.assertEqual(list(deployment.keys()), DeploymentSummaryFields)
+        self.assertEqual(deployment["project"]["name"], "metadatax_project1")
+        self.assertIsNone(deployment["site"])
+        self.assertEqual(deployment["sampling_frequencies"], [128000])
+        self.assertGreater(sum(deployment["annotated_labels"].values()), 0)
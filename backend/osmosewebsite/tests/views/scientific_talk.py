@@ -3,6 +3,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from backend.osmosewebsite.models import clear_website_cache
 from backend.osmosewebsite.serializers.scientific_talk import ScientificTalkFields
 
 
@@ -17,6 +18,9 @@ class ScientificTalkViewSetTestCase(APITestCase):
         "thumbnail": "string",
     }
 
+    def setUp(self):
+        clear_website_cache()
+
     def test_list(self):
         """ScientificTalkViewSet 'list' returns list of ScientificTalk"""
         url = reverse("scientific-talk-list")
@@ -3,6 +3,7 @@
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from backend.osmosewebsite.models import clear_website_cache
 from backend.osmosewebsite.serializers.team_member import TeamMemberFields
 
 
@@ -26,6 +27,9 @@ class TeamMemberViewSetTestCase(APITestCase):
         "is_former_member": False,
     }
 
+    def setUp(self):
+        clear_website_cache()
+
     def test_list(self):
         """TeamMemberViewSet 'list' returns list of team members"""
         url = reverse("members-list")
@@ -0,0 +1,71 @@
+"""Cache of the public website responses"""
+import hashlib
+import json
+from functools import wraps
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from backend.osmosewebsite.models import get_website_cache_version
+
+
+def anonymous_read_cache(handler: Callable[..., Response]) -> Callable[..., Response]:
+    """
+    Cache the responses of the decorated viewset handler to anonymous GET requests,
+    keyed on their path and query.
+    Cached responses have an ETag, so that clients can revalidate them with If-None-Match.
+    """
+
+    @wraps(handler)
+    def cached_handler(view, request: Request, *args, **kwargs) -> Response:
+        if request.method != "GET" or request.user.is_authenticated:
+            return handler(view, request, *args, **kwargs)
+        key = (
+            f"osmosewebsite:response:{view.get_cache_version()}:"
+            f"{request.get_full_path()}"
+        )
+        cached = cache.get(key)
+        if cached is None:
+            response = handler(view, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            content = JSONRenderer().render(response.data)
+            cached = {
+                "data": json.loads(content),
+                "etag": quote_etag(hashlib.md5(content).hexdigest()),
+            }
+            cache.set(key, cached, settings.WEBSITE_RESPONSES_CACHE_TIMEOUT)
+
+        headers = {"ETag": cached["etag"]}
+        if cached["etag"] in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(cached["data"], headers=headers)
+
+    return cached_handler
+
+
+class AnonymousReadCacheMixin:
+    """
+    Cache the list and retrieve responses to anonymous users,
+    other read actions are cached with the anonymous_read_cache decorator.
+    """
+
+    def get_cache_version(self) -> str:
+        """Version of the cached responses, to override for responses depending on other data"""
+        return str(get_website_cache_version())
+
+    @anonymous_read_cache
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """List, cached for anonymous users"""
+        return super().list(request, *args, **kwargs)
+
+    @anonymous_read_cache
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """Retrieve, cached for anonymous users"""
+        return super().retrieve(request, *args, **kwargs)
@@ -2,9 +2,10 @@
 from rest_framework import viewsets, permissions, decorators, response
 from backend.osmosewebsite.models import Collaborator
 from backend.osmosewebsite.serializers import CollaboratorSerializer
+from .cache import AnonymousReadCacheMixin, anonymous_read_cache
 
 
-class CollaboratorViewSet(viewsets.ModelViewSet):
+class CollaboratorViewSet(AnonymousReadCacheMixin, viewsets.ModelViewSet):
     """
     `list`, `create`, `retrieve`, `update` and `destroy` collaborators.
     """
@@ -14,6 +15,7 @@ class CollaboratorViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     @decorators.action(detail=False)
+    @anonymous_read_cache
     def on_home(self, request):
         """List collaborators to be shown on home page"""
         queryset = Collaborator.objects.all().filter(show_on_home_page=True)
@@ -21,6 +23,7 @@ class CollaboratorViewSet(viewsets.ModelViewSet):
         return response.Response(serializer.data)
 
     @decorators.action(detail=False)
+    @anonymous_read_cache
     def on_aplose_home(self, request):
         """List collaborators to be shown on Aplose home page"""
         queryset = Collaborator.objects.all().filter(show_on_aplose_home=True)
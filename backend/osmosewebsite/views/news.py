@@ -3,9 +3,10 @@ from rest_framework import viewsets, permissions
 
 from backend.osmosewebsite.models import News
 from backend.osmosewebsite.serializers import NewsSerializer
+from .cache import AnonymousReadCacheMixin
 
 
-class NewsViewSet(viewsets.ModelViewSet):
+class NewsViewSet(AnonymousReadCacheMixin, viewsets.ModelViewSet):
     """
     A simple ViewSet for news related actions
     """
@@ -1,13 +1,25 @@
 """ project DRF-Viewset file"""
-from metadatax.models import Accessibility
+from django.db.models import Prefetch
+from metadatax.models import Accessibility, ChannelConfiguration, Deployment
 from metadatax.view.acquisition import DeploymentViewSet
 from rest_framework import viewsets, permissions, decorators, response
 
-from backend.osmosewebsite.models import Project
-from backend.osmosewebsite.serializers import ProjectSerializer, DeploymentSerializer
+from backend.osmosewebsite.models import (
+    Project,
+    get_deployments_annotated_labels,
+    get_deployments_labels_version,
+)
+from backend.osmosewebsite.serializers import (
+    ProjectSerializer,
+    DeploymentSerializer,
+    DeploymentSummarySerializer,
+)
+from .cache import AnonymousReadCacheMixin, anonymous_read_cache
 
+PUBLIC_ACCESSIBILITIES = [Accessibility.REQUEST, Accessibility.OPEN]
 
-class ProjectViewSet(viewsets.ModelViewSet):
+
+class ProjectViewSet(AnonymousReadCacheMixin, viewsets.ModelViewSet):
     """
     A simple ViewSet for project related actions
     """
@@ -16,26 +28,44 @@ class ProjectViewSet(viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
-    deployments_queryset = (
-        DeploymentViewSet.queryset.filter(
-            project__accessibility__in=[Accessibility.REQUEST, Accessibility.OPEN]
-        )
-        .select_related("project__website_project")
+    # Annotated labels are counted separately, see get_deployments_annotated_labels
+    deployments_queryset = DeploymentViewSet.queryset.filter(
+        project__accessibility__in=PUBLIC_ACCESSIBILITIES
+    ).select_related("project__website_project")
+
+    deployments_summary_queryset = (
+        Deployment.objects.filter(project__accessibility__in=PUBLIC_ACCESSIBILITIES)
+        .select_related("project__website_project", "site", "campaign")
         .prefetch_related(
-            "channelconfiguration_set__aplose_datasets__annotation_campaigns__results__label"
+            Prefetch(
+                "channelconfiguration_set",
+                queryset=ChannelConfiguration.objects.only(
+                    "id", "deployment_id", "sampling_frequency"
+                ),
+            )
         )
     )
 
+    def get_cache_version(self) -> str:
+        """Deployments responses show the annotated labels counts"""
+        return f"{super().get_cache_version()}.{get_deployments_labels_version()}"
+
     @decorators.action(
         detail=False, name="deployments", url_name="deployments", url_path="deployments"
     )
+    @anonymous_read_cache
     def all_deployments(self, request):
         """List all deployments"""
-        queryset = self.deployments_queryset
-        serializer = DeploymentSerializer(queryset, many=True)
+        queryset = self.deployments_queryset.all()
+        serializer = DeploymentSerializer(
+            queryset,
+            many=True,
+            context={"annotated_labels": get_deployments_annotated_labels()},
+        )
         return response.Response(serializer.data)
 
     @decorators.action(detail=True)
+    @anonymous_read_cache
     def deployments(self, request, pk):
         """List all deployments"""
         # pylint: disable=unused-argument
@@ -43,6 +73,25 @@ class ProjectViewSet(viewsets.ModelViewSet):
         queryset = self.deployments_queryset.filter(
             project_id=project.metadatax_project_id,
         )
-        serializer = DeploymentSerializer(queryset, many=True)
-        print(serializer.data)
+        serializer = DeploymentSerializer(
+            queryset,
+            many=True,
+            context={"annotated_labels": get_deployments_annotated_labels()},
+        )
+        return response.Response(serializer.data)
+
+    @decorators.action(
+        detail=False,
+        name="deployments summary",
+        url_name="deployments-summary",
+        url_path="deployments/summary",
+    )
+    @anonymous_read_cache
+    def deployments_summary(self, request):
+        """List all deployments with only the fields needed by the map"""
+        serializer = DeploymentSummarySerializer(
+            self.deployments_summary_queryset.all(),
+            many=True,
+            context={"annotated_labels": get_deployments_annotated_labels()},
+        )
         return response.Response(serializer.data)
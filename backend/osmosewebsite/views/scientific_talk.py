@@ -4,9 +4,10 @@ from rest_framework import viewsets, permissions
 from backend.osmosewebsite.models import ScientificTalk
 
 from backend.osmosewebsite.serializers import ScientificTalkSerializer
+from .cache import AnonymousReadCacheMixin
 
 
-class ScientificTalkViewSet(viewsets.ModelViewSet):
+class ScientificTalkViewSet(AnonymousReadCacheMixin, viewsets.ModelViewSet):
     """
     A simple ViewSet for ScientificTalk related actions
     """
@@ -2,9 +2,10 @@
 from rest_framework import viewsets, permissions
 from backend.osmosewebsite.models.team_member import TeamMember
 from backend.osmosewebsite.serializers.team_member import TeamMemberSerializer
+from .cache import AnonymousReadCacheMixin
 
 
-class TeamMemberViewSet(viewsets.ModelViewSet):
+class TeamMemberViewSet(AnonymousReadCacheMixin, viewsets.ModelViewSet):
     """
     `list`, `create`, `retrieve`, `update` and `destroy` team members.
     """
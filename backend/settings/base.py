@@ -111,6 +111,31 @@ DATASET_EXPORT_PATH = Path("datawork/dataset")  # linked to nginx conf
 DATASET_FILES_FOLDER = Path("data/audio")
 DATASET_SPECTRO_FOLDER = Path("processed/spectrogram")
 DATASET_FILE = "datasets.csv"
+# Number of local worker threads processing datawork import jobs
+DATASET_IMPORT_WORKERS = 2
+# Number of datasets of a same job imported concurrently
+DATASET_IMPORT_DATASET_WORKERS = 2
+# Maximum number of dataset files inserted by query
+DATASET_IMPORT_FILES_BATCH_SIZE = 5000
+# Running import jobs without progress for this delay are considered stopped
+DATASET_IMPORT_JOB_STALE_DELAY = timedelta(minutes=30)
+# Maximum number of dataset files kept in the files indexes of each process
+DATASET_FILES_INDEX_CACHE_SIZE = 500000
+# Number of local worker threads processing detection imports
+DETECTION_IMPORT_WORKERS = 2
+# Number of detection rows imported and committed together
+DETECTION_IMPORT_CHUNK_SIZE = 1000
+# Running detection imports without progress for this delay are considered stopped
+DETECTION_IMPORT_STALE_DELAY = timedelta(minutes=10)
+# Number of latest sessions of a task keeping their output, older outputs are cleared on submit
+# (None keeps all outputs, they can be cleared later with the compact_annotation_sessions command)
+ANNOTATION_SESSION_OUTPUT_RETENTION = None
+# Seconds during which the website deployments annotated labels counts are cached
+WEBSITE_DEPLOYMENTS_LABELS_CACHE_TIMEOUT = 60 * 60
+# Seconds during which the website responses to anonymous users are cached
+# (without a CACHES setting, responses and their invalidations are kept in the memory of each process:
+# use a shared cache such as Memcached or Redis when the server runs several processes)
+WEBSITE_RESPONSES_CACHE_TIMEOUT = 60 * 60
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
@@ -0,0 +1,44 @@
+"""Custom HTTP responses"""
+import csv
+from typing import Iterable, Iterator
+
+from django.http import StreamingHttpResponse
+
+
+class _Echo:
+    """File-like object that returns written values instead of storing them"""
+
+    # pylint: disable=too-few-public-methods
+
+    def write(self, value: str) -> str:
+        """Return the given value so the CSV writer output can be yielded"""
+        return value
+
+
+class CSVStreamingResponse(StreamingHttpResponse):
+    """Stream CSV rows as they are produced, memory usage does not depend on the number of rows"""
+
+    rows_per_chunk = 500
+
+    def __init__(
+        self,
+        rows: Iterable[dict],
+        fieldnames: list[str],
+        filename: str,
+        **kwargs,
+    ):
+        super().__init__(
+            self._stream(rows, fieldnames), content_type="text/csv", **kwargs
+        )
+        self["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    def _stream(self, rows: Iterable[dict], fieldnames: list[str]) -> Iterator[str]:
+        writer = csv.DictWriter(_Echo(), fieldnames=fieldnames)
+        chunk = [writer.writeheader()]
+        for row in rows:
+            chunk.append(writer.writerow(row))
+            if len(chunk) >= self.rows_per_chunk:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
@@ -1,9 +1,10 @@
 """ Serializer util functions """
 
-from django.db import transaction
-from django.db.models import QuerySet
+from typing import Optional
+
+from django.db import transaction, models
+from django.db.models import QuerySet, Model, signals
 from rest_framework import serializers
-from rest_framework.serializers import Serializer
 
 
 class EnumField(serializers.ChoiceField):
@@ -32,39 +33,60 @@ class ListSerializer(serializers.ListSerializer):
     """Default list serializer -> will update corresponding ids,
     remove extra items in queryset and create extra items in data"""
 
-    def get_serializer_data(self, data: dict) -> dict:
-        """Get serialized data"""
-        return self.child.__class__(data).data
+    def can_bulk_save(self) -> bool:
+        """Bulk operations skip custom create/update/save, signals and many-to-many fields"""
+        child_class = self.child.__class__
+        model = self.child.Meta.model
+        return (
+            child_class.create is serializers.ModelSerializer.create
+            and child_class.update is serializers.ModelSerializer.update
+            and model.save is models.Model.save
+            and not model._meta.many_to_many
+            and not signals.pre_save.has_listeners(model)
+            and not signals.post_save.has_listeners(model)
+        )
 
     @transaction.atomic()
     def update(self, instance: QuerySet, validated_data: list[dict]):
-        serializer_list: [Serializer] = []
-        for data in validated_data:
-            serializer_data = self.get_serializer_data(data)
-            if "id" in data and data["id"] is not None:
-                update_instance = instance.filter(id=data["id"])
-                if update_instance.exists():
-                    serializer_list.append(
-                        self.child.__class__(
-                            instance=update_instance.first(),
-                            data=serializer_data,
-                            context=self.context,
-                        )
-                    )
-                    continue
-            serializer_list.append(
-                self.child.__class__(data=serializer_data, context=self.context)
+        existing_instances = {item.id: item for item in instance.all()}
+
+        # Reconcile data with the existing instances, results keep the data order
+        results: list[Optional[Model]] = [None] * len(validated_data)
+        updates: dict[int, dict] = {}
+        creations: dict[int, dict] = {}
+        for index, data in enumerate(validated_data):
+            data = dict(data)
+            item_id = data.pop("id", None)
+            if item_id in existing_instances:
+                results[index] = existing_instances.pop(item_id)
+                updates[index] = data
+            else:
+                creations[index] = data
+
+        if self.can_bulk_save():
+            model = self.child.Meta.model
+            updated_fields = set()
+            for index, data in updates.items():
+                for attr, value in data.items():
+                    setattr(results[index], attr, value)
+                updated_fields.update(data.keys())
+            if updated_fields:
+                model.objects.bulk_update(
+                    [results[index] for index in updates], list(updated_fields)
+                )
+            created_instances = model.objects.bulk_create(
+                [model(**data) for data in creations.values()]
             )
-        serializer: Serializer
-        for serializer in serializer_list:
-            serializer.is_valid(raise_exception=True)
+            for index, created_instance in zip(creations, created_instances):
+                results[index] = created_instance
+        else:
+            for index, data in updates.items():
+                results[index] = self.child.update(results[index], data)
+            for index, data in creations.items():
+                results[index] = self.child.create(data)
 
-        result_instances = []
-        for serializer in serializer_list:
-            serializer.save()
-            result_instances.append(serializer.instance)
-        instance.exclude(id__in=[r.id for r in result_instances]).delete()
-        return result_instances
+        instance.filter(id__in=existing_instances.keys()).delete()
+        return results
 
 
 class FileUploadSerializer(serializers.Serializer):
@@ -92,3 +114,29 @@ class SlugRelatedGetOrCreateField(serializers.SlugRelatedField):
         except (TypeError, ValueError):
             self.fail("invalid")
             return None
+
+
+class SlugRelatedCacheMixin:  # pylint: disable=too-few-public-methods
+    """Keep items found by slug, for fields validated on many rows by a list serializer"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._items = {}
+
+    def to_internal_value(self, data):
+        """Get item from the already found ones"""
+        if not isinstance(data, (str, int)):
+            return super().to_internal_value(data)
+        if data not in self._items:
+            self._items[data] = super().to_internal_value(data)
+        return self._items[data]
+
+
+class CachedSlugRelatedField(SlugRelatedCacheMixin, serializers.SlugRelatedField):
+    """Slug related field querying each slug only once"""
+
+
+class CachedSlugRelatedGetOrCreateField(
+    SlugRelatedCacheMixin, SlugRelatedGetOrCreateField
+):
+    """Slug related field that can create an unknown item, querying each slug only once"""
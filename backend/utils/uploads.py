@@ -0,0 +1,23 @@
+""" Uploaded files util functions """
+import csv
+import io
+from typing import Iterator
+
+from django.core.files.uploadedfile import UploadedFile
+
+
+def iter_lines(file: UploadedFile, encoding: str = "utf-8") -> Iterator[str]:
+    """Decode the uploaded file as a stream and yield its lines, line endings included"""
+    file.seek(0)
+    # Lines are only split on CSV line endings, other unicode separators stay in the values
+    text = io.TextIOWrapper(file, encoding=encoding, newline="")
+    try:
+        yield from text
+    finally:
+        # The upload is closed by Django, not by the wrapper
+        text.detach()
+
+
+def read_csv_upload(file: UploadedFile, encoding: str = "utf-8") -> csv.DictReader:
+    """Read the uploaded CSV file as a stream of rows"""
+    return csv.DictReader(iter_lines(file, encoding))
@@ -7,6 +7,7 @@ import { CampaignAPI, CampaignSlice } from '@/service/campaign';
 import { AnnotationFileRangeAPI } from '@/service/campaign/annotation-file-range';
 import { LabelSetAPI } from '@/service/campaign/label-set';
 import { DatasetAPI } from '@/service/dataset';
+import { DatasetImportJobAPI } from '@/service/dataset/import-job';
 import { ConfidenceSetAPI } from '@/service/campaign/confidence-set';
 import { SpectrogramConfigurationAPI } from '@/service/dataset/spectrogram-configuration';
 import { AudioMetadataAPI } from '@/service/dataset/audio-metatada';
@@ -33,6 +34,7 @@ export const AppStore = configureStore({
     [CampaignAPI.reducerPath]: CampaignAPI.reducer,
     [AnnotationFileRangeAPI.reducerPath]: AnnotationFileRangeAPI.reducer,
     [DatasetAPI.reducerPath]: DatasetAPI.reducer,
+    [DatasetImportJobAPI.reducerPath]: DatasetImportJobAPI.reducer,
     [LabelSetAPI.reducerPath]: LabelSetAPI.reducer,
     [ConfidenceSetAPI.reducerPath]: ConfidenceSetAPI.reducer,
     [SpectrogramConfigurationAPI.reducerPath]: SpectrogramConfigurationAPI.reducer,
@@ -51,6 +53,7 @@ export const AppStore = configureStore({
       .concat(CampaignAPI.middleware)
       .concat(AnnotationFileRangeAPI.middleware)
       .concat(DatasetAPI.middleware)
+      .concat(DatasetImportJobAPI.middleware)
       .concat(LabelSetAPI.middleware)
       .concat(ConfidenceSetAPI.middleware)
       .concat(SpectrogramConfigurationAPI.middleware)
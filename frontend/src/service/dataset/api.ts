@@ -26,13 +26,5 @@ export const DatasetAPI = createApi({
         return response.map(d => ({ ...d, id: uuidV4() }))
       }
     }),
-
-    import: builder.mutation<Array<ImportDataset>, Array<ImportDataset>>({
-      query: (data) => ({
-        url: `datawork_import/`,
-        method: 'POST',
-        body: { wanted_datasets: data }
-      })
-    })
   })
 })
@@ -0,0 +1,27 @@
+import { createApi } from '@reduxjs/toolkit/query/react';
+import { getAuthenticatedBaseQuery } from '@/service/auth/function.ts';
+import { ID } from '@/service/type.ts';
+import { ImportDataset } from '@/service/dataset/type.ts';
+import { DatasetImportJob } from './type.ts';
+
+export const DatasetImportJobAPI = createApi({
+  reducerPath: 'datasetImportJobApi',
+  baseQuery: getAuthenticatedBaseQuery('/api/dataset-import-job/'),
+  endpoints: (builder) => ({
+    retrieve: builder.query<DatasetImportJob, ID>({
+      query: (id) => `${ id }/`,
+    }),
+    create: builder.mutation<DatasetImportJob, Array<ImportDataset>>({
+      query: (data) => ({
+        url: '',
+        method: 'POST',
+        body: { wanted_datasets: data }
+      })
+    }),
+  })
+})
+
+export const {
+  useRetrieveQuery: useRetrieveDatasetImportJobQuery,
+  useCreateMutation: useCreateDatasetImportJobMutation,
+} = DatasetImportJobAPI;
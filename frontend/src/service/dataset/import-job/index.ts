@@ -0,0 +1,11 @@
+export {
+  DatasetImportJobAPI,
+  useRetrieveDatasetImportJobQuery,
+  useCreateDatasetImportJobMutation,
+} from './api';
+
+export type {
+  DatasetImportJob,
+  DatasetImportJobDataset,
+  DatasetImportJobStatus,
+} from './type';
@@ -0,0 +1,24 @@
+import { ID } from '@/service/type.ts';
+
+export type DatasetImportJobStatus = 'Pending' | 'Running' | 'Success' | 'Failure';
+
+export type DatasetImportJobDataset = {
+  id: number;
+  name: string;
+  status: DatasetImportJobStatus;
+  imported_files_count: number;
+  missing_tiles_count: number;
+  error: string | null;
+  dataset: ID | null;
+}
+
+export type DatasetImportJob = {
+  id: number;
+  created_at: string; // Datetime
+  started_at: string | null; // Datetime
+  finished_at: string | null; // Datetime
+  status: DatasetImportJobStatus;
+  owner: string;
+  errors: any | null;
+  datasets: Array<DatasetImportJobDataset>;
+}
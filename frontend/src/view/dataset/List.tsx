@@ -13,9 +13,6 @@ export const DatasetList: React.FC = () => {
 
   // Services
   const { data: datasets, error: datasetsError, isLoading } = DatasetAPI.useListQuery({})
-
-  // eslint-disable-next-line @typescript-eslint/no-unused-vars
-  const [ _, { isLoading: isImportInProgress } ] = DatasetAPI.useImportMutation()
   const toast = useToast();
 
 
@@ -33,7 +30,7 @@ export const DatasetList: React.FC = () => {
         <ImportDatasetsButton/>
       </div>
 
-      { (isLoading || isImportInProgress) && <IonSpinner/> }
+      { isLoading && <IonSpinner/> }
       { datasetsError && <WarningMessage>{ getErrorMessage(datasetsError) }</WarningMessage> }
 
       { datasets && datasets.length === 0 && <IonNote color='medium'>No datasets</IonNote> }
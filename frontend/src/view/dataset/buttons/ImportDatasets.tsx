@@ -1,5 +1,6 @@
 import React, { Fragment, useEffect, useMemo, useState } from "react";
 import { DatasetAPI, ImportDataset } from "@/service/dataset";
+import { useCreateDatasetImportJobMutation, useRetrieveDatasetImportJobQuery } from "@/service/dataset/import-job";
 import { useToast } from "@/service/ui";
 import { IonButton, IonIcon } from "@ionic/react";
 import { downloadOutline } from "ionicons/icons";
@@ -10,6 +11,7 @@ import styles from '../dataset.module.scss'
 export const ImportDatasetsButton: React.FC = () => {
   // State
   const [ isImportModalOpen, setIsImportModalOpen ] = useState(false);
+  const [ importJobID, setImportJobID ] = useState<number | undefined>();
 
   // API
   const { refetch: refetchDatasets } = DatasetAPI.useListQuery({})
@@ -18,10 +20,20 @@ export const ImportDatasetsButton: React.FC = () => {
     refetch: refetchDatasetsToImport,
     error: datasetsToImportError
   } = DatasetAPI.useListForImportQuery()
-  const [ doImportDatasets, { isLoading: isImportInProgress } ] = DatasetAPI.useImportMutation()
+  const [ doImportDatasets, { isLoading: isJobCreationInProgress } ] = useCreateDatasetImportJobMutation()
+  // The import is processed in background, the job is polled until it ends
+  const { data: importJob } = useRetrieveDatasetImportJobQuery(importJobID ?? -1, {
+    skip: !importJobID,
+    pollingInterval: 2000
+  })
 
   // Memo
   const canImportDatasets = useMemo(() => datasetsToImport && datasetsToImport.length > 0, [ datasetsToImport ]);
+  const isImportInProgress = useMemo(() => {
+    if (isJobCreationInProgress) return true;
+    if (!importJobID) return false;
+    return !importJob || importJob.status === 'Pending' || importJob.status === 'Running';
+  }, [ isJobCreationInProgress, importJobID, importJob ]);
 
   // Service
   const toast = useToast();
@@ -31,15 +43,26 @@ export const ImportDatasetsButton: React.FC = () => {
     if (datasetsToImportError) toast.presentError(datasetsToImportError);
   }, [ datasetsToImportError ]);
 
+  useEffect(() => {
+    if (!importJob || importJob.id !== importJobID) return;
+    if (importJob.status === 'Pending' || importJob.status === 'Running') return;
+    setImportJobID(undefined);
+    refetchDatasetsToImport();
+    refetchDatasets();
+    setIsImportModalOpen(false);
+    const errors = importJob.datasets.filter(d => d.error).map(d => `${ d.name }: ${ d.error }`);
+    if (importJob.errors) errors.push(JSON.stringify(importJob.errors));
+    // Spectrogram tiles not found on disk are reported even if the import succeeded
+    errors.push(...importJob.datasets.filter(d => d.missing_tiles_count > 0)
+      .map(d => `${ d.name }: ${ d.missing_tiles_count } missing spectrogram tiles`));
+    if (errors.length > 0) toast.presentError(errors.join('\n'));
+  }, [ importJob ]);
+
   // Methods
 
   async function importDatasets(importList: Array<ImportDataset>) {
     doImportDatasets(importList).unwrap()
-      .then(() => {
-        refetchDatasetsToImport();
-        refetchDatasets();
-        setIsImportModalOpen(false);
-      })
+      .then(job => setImportJobID(job.id))
       .catch(error => toast.presentError(error));
   }
 
@@ -24,7 +24,7 @@ export const API_URL = {
     list: /\/api\/dataset\/?/g,
     detail: /\/api\/dataset\/-?\d\/?/g,
     list_to_import: /\/api\/dataset\/list_to_import\/?/g,
-    import: /\/api\/dataset\/datawork_import\/?/g,
+    import: /\/api\/dataset-import-job\/?/g,
   },
   fileRanges: {
     list: /\/api\/annotation-file-range\/?/g,